@@ -1,8 +1,10 @@
 from .handle import get_client_handle_obj, get_api_client
+from .async_handle import get_async_client_handle_obj
 from .resource import get_resource_api
 
 __all__ = [
     "get_client_handle_obj",
     "get_api_client",
+    "get_async_client_handle_obj",
     "get_resource_api",
 ]
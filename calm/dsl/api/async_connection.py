@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+async_connection: Provides an asyncio interface over the calm HTTP client
+
+Example:
+
+pc_ip = "<pc_ip>"
+pc_port = 9440
+connection = get_async_connection_obj(pc_ip, pc_port,
+                                      auth=("<pc_username>", "<pc_passwd>"),
+                                      max_concurrency=50)
+connection.connect()
+res, err = await connection._call("api/nutanix/v3/projects/<uuid>",
+                                  method=REQUEST.METHOD.GET)
+
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from .connection import Connection, REQUEST
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+
+class AsyncConnection:
+    def __init__(self, connection, max_concurrency=None):
+        """asyncio client wrapping a (blocking) Connection object.
+
+        Every request is executed by the wrapped connection inside a worker
+        thread, so retries, auth and error handling stay identical to the
+        synchronous client. The number of requests in flight at any time is
+        bounded by max_concurrency.
+
+        Args:
+            connection (Connection): connection used to make the http calls
+            max_concurrency (int): maximum number of concurrent requests
+                                   (default: connection pool size)
+        Returns:
+        Raises:
+        """
+        self.connection = connection
+        self.max_concurrency = int(max_concurrency or connection._pool_maxsize)
+        self._executor = None
+        self._loop = None
+        self._semaphore = None
+
+    @property
+    def host(self):
+        return self.connection.host
+
+    @property
+    def port(self):
+        return self.connection.port
+
+    def connect(self):
+        """Connect to api server, create http session pool and worker threads.
+
+        Args:
+        Returns:
+            api server session
+        Raises:
+        """
+
+        if self.connection.session is None:
+            self.connection.connect()
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix="calm-dsl-async",
+            )
+        LOG.debug(
+            "{} created with concurrency {}".format(
+                self.__class__.__name__, self.max_concurrency
+            )
+        )
+        return self.connection.session
+
+    def close(self):
+        """
+        Close the session and shutdown the worker threads.
+
+        Args:
+            None
+        Returns:
+            None
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.connection.close()
+
+    def _get_semaphore(self):
+        """returns the concurrency limiting semaphore for the running loop"""
+
+        loop = asyncio.get_event_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def run(self, func, *args, **kwargs):
+        """Runs blocking callable in a worker thread, honouring concurrency limit
+
+        Args:
+            func (callable): blocking function to be executed
+        Returns:
+            return value of func
+        """
+
+        if self._executor is None:
+            self.connect()
+
+        async with self._get_semaphore():
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+
+    async def _call(self, endpoint, method=REQUEST.METHOD.POST, **kwargs):
+        """Coroutine for making http request to calm
+
+        Args:
+            endpoint (str): calm server endpoint
+            method (str): calm server http method
+            kwargs: Refer Connection._call for other supported arguments
+        Returns:
+            (tuple (requests.Response, dict)): Response
+        """
+
+        return await self.run(self.connection._call, endpoint, method=method, **kwargs)
+
+
+def get_async_connection_obj(
+    host,
+    port,
+    auth_type=REQUEST.AUTH_TYPE.BASIC,
+    scheme=REQUEST.SCHEME.HTTPS,
+    auth=None,
+    max_concurrency=None,
+):
+    """Returns object of AsyncConnection class"""
+
+    pool_size = max(int(max_concurrency or 0), 20)
+    connection = Connection(
+        host,
+        port,
+        auth_type,
+        scheme,
+        auth,
+        pool_maxsize=pool_size,
+        pool_connections=pool_size,
+    )
+    return AsyncConnection(connection, max_concurrency=max_concurrency)
@@ -0,0 +1,99 @@
+from calm.dsl.config import get_context
+
+from .connection import REQUEST
+from .async_connection import get_async_connection_obj
+from .async_resource import AsyncResourceAPI
+from .handle import ResourceAPIDescriptor
+from .blueprint import BlueprintAPI
+from .endpoint import EndpointAPI
+from .runbook import RunbookAPI
+from .library_tasks import TaskLibraryApi
+from .application import ApplicationAPI
+from .project import ProjectAPI
+from .environment import EnvironmentAPI
+from .setting import AccountsAPI
+from .marketplace import MarketPlaceAPI
+from .app_icons import AppIconAPI
+from .user import UserAPI
+from .user_group import UserGroupAPI
+from .role import RoleAPI
+from .directory_service import DirectoryServiceAPI
+from .access_control_policy import AccessControlPolicyAPI
+from .app_protection_policy import AppProtectionPolicyAPI
+from .vm_recovery_point import VmRecoveryPointAPI
+from .nutanix_task import TaskAPI
+from .job import JobAPI
+from .resource_type import ResourceTypeAPI
+
+
+class AsyncClientHandle:
+    """asyncio counterpart of ClientHandle
+
+    Example:
+        client = get_async_client_handle_obj(pc_ip, pc_port, auth=auth)
+        results = await asyncio.gather(
+            *[client.application.read(uuid) for uuid in app_uuids]
+        )
+    """
+
+    # Note - add entity api classes here
+    project = ResourceAPIDescriptor(ProjectAPI)
+    environment = ResourceAPIDescriptor(EnvironmentAPI)
+    blueprint = ResourceAPIDescriptor(BlueprintAPI)
+    endpoint = ResourceAPIDescriptor(EndpointAPI)
+    runbook = ResourceAPIDescriptor(RunbookAPI)
+    task = ResourceAPIDescriptor(TaskLibraryApi)
+    application = ResourceAPIDescriptor(ApplicationAPI)
+    account = ResourceAPIDescriptor(AccountsAPI)
+    market_place = ResourceAPIDescriptor(MarketPlaceAPI)
+    app_icon = ResourceAPIDescriptor(AppIconAPI)
+    user = ResourceAPIDescriptor(UserAPI)
+    group = ResourceAPIDescriptor(UserGroupAPI)
+    role = ResourceAPIDescriptor(RoleAPI)
+    directory_service = ResourceAPIDescriptor(DirectoryServiceAPI)
+    acp = ResourceAPIDescriptor(AccessControlPolicyAPI)
+    app_protection_policy = ResourceAPIDescriptor(AppProtectionPolicyAPI)
+    vm_recovery_point = ResourceAPIDescriptor(VmRecoveryPointAPI)
+    nutanix_task = ResourceAPIDescriptor(TaskAPI)
+    job = ResourceAPIDescriptor(JobAPI)
+    resource_types = ResourceAPIDescriptor(ResourceTypeAPI)
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def _connect(self):
+
+        self.connection.connect()
+
+    def _get_api(self, api_cls):
+        return AsyncResourceAPI(self.connection, api_cls(self.connection.connection))
+
+    def close(self):
+        self.connection.close()
+
+
+def get_async_client_handle_obj(
+    host=None,
+    port=None,
+    auth_type=REQUEST.AUTH_TYPE.BASIC,
+    scheme=REQUEST.SCHEME.HTTPS,
+    auth=None,
+    max_concurrency=None,
+):
+    """returns object of AsyncClientHandle class
+
+    If host is not given, server details of the current context are used.
+    """
+
+    if not host:
+        server_config = get_context().get_server_config()
+        host = server_config.get("pc_ip")
+        port = server_config.get("pc_port")
+        auth = (server_config.get("pc_username"), server_config.get("pc_password"))
+
+    connection = get_async_connection_obj(
+        host, port, auth_type, scheme, auth, max_concurrency=max_concurrency
+    )
+    handle = AsyncClientHandle(connection)
+    handle._connect()
+    return handle
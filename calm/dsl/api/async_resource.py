@@ -0,0 +1,77 @@
+import asyncio
+
+
+class AsyncResourceAPI:
+    """asyncio counterpart of ResourceAPI
+
+    Wraps an (entity specific) ResourceAPI object, so any overridden
+    behaviour of the entity api class (endpoints, timeouts etc.) is retained.
+    """
+
+    def __init__(self, connection, resource_api):
+        self.connection = connection
+        self.resource_api = resource_api
+        self.PREFIX = resource_api.PREFIX
+        self.LIST = resource_api.LIST
+        self.ITEM = resource_api.ITEM
+
+    async def create(self, payload):
+        return await self.connection.run(self.resource_api.create, payload)
+
+    async def read(self, id=None):
+        return await self.connection.run(self.resource_api.read, id)
+
+    async def update(self, uuid, payload):
+        return await self.connection.run(self.resource_api.update, uuid, payload)
+
+    async def delete(self, uuid):
+        return await self.connection.run(self.resource_api.delete, uuid)
+
+    async def list(self, params={}, ignore_error=False):
+        return await self.connection.run(
+            self.resource_api.list, params, ignore_error=ignore_error
+        )
+
+    async def list_all(self, api_limit=250, base_params=None, ignore_error=False):
+        """returns the list of entities, remaining pages are fetched concurrently"""
+
+        params = self.resource_api._list_all_params(api_limit, base_params)
+        length = params["length"]
+
+        def _handle_response(response, err):
+            if not err:
+                return response.json(), None
+            if ignore_error:
+                return None, err
+            raise Exception("[{}] - {}".format(err["code"], err["error"]))
+
+        response, err = _handle_response(
+            *(await self.list(params, ignore_error=ignore_error))
+        )
+        if err:
+            return [], err
+
+        final_list = list(response["entities"])
+        total_matches = response["metadata"]["total_matches"]
+
+        page_params = []
+        for offset in range(length, total_matches, length):
+            _params = params.copy()
+            _params["offset"] = offset
+            page_params.append(_params)
+
+        pages = await asyncio.gather(
+            *[self.list(_params, ignore_error=ignore_error) for _params in page_params]
+        )
+
+        # gather preserves the order of awaitables, so pages are in offset order
+        for page in pages:
+            response, err = _handle_response(*page)
+            if err:
+                return [], err
+            final_list.extend(response["entities"])
+
+        if ignore_error:
+            return final_list, None
+
+        return final_list
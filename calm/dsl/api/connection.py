@@ -13,6 +13,9 @@ client = get_connection(pc_ip, pc_port,
 
 import traceback
 import json
+import gzip
+import threading
+import time
 import urllib3
 import sys
 
@@ -20,9 +23,22 @@ from requests import Session as Session
 from requests_toolbelt import MultipartEncoder
 from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectTimeout
-from requests.packages.urllib3.util.retry import Retry
 
+from .rate_limiter import (
+    get_rate_limiter,
+    RateLimitedHTTPAdapter,
+    RateLimitedRetry,
+)
+from .instrumentation import (
+    CallRecord,
+    has_call_listeners,
+    notify_call_listeners,
+)
+from .response_cache import ResponseCache
+from .session_cache import SessionCookieAuth
+from .single_flight import SingleFlight
 from calm.dsl.log import get_logging_handle
+from calm.dsl.tools import json_codec
 
 urllib3.disable_warnings()
 LOG = get_logging_handle(__name__)
@@ -58,6 +74,13 @@ class REQUEST:
         POST = "post"
         PUT = "put"
 
+    # Request bodies (in bytes) above this size are sent gzip compressed.
+    # Not every server accepts compressed bodies, so it is disabled (0) by default
+    COMPRESSION_THRESHOLD = 0
+
+    # Maximum requests per second made to a host
+    MAX_REQUEST_RATE = 50
+
 
 def build_url(host, port, endpoint="", scheme=REQUEST.SCHEME.HTTPS):
     """Build url.
@@ -92,6 +115,11 @@ class Connection:
         response_processor=None,
         session_headers=None,
         retries_enabled=True,
+        response_cache=None,
+        coalesce_requests=True,
+        compression_threshold=REQUEST.COMPRESSION_THRESHOLD,
+        max_request_rate=REQUEST.MAX_REQUEST_RATE,
+        session_cache=None,
         **kwargs,
     ):
         """Generic client to connect to server.
@@ -111,6 +139,16 @@ class Connection:
             auth_type (str): auth type that needs to be used by the client
             auth (tuple): authentication
             retries_enabled (bool): Flag to perform retries (default: false)
+            response_cache (ResponseCache): cache for GET responses (default: None)
+            coalesce_requests (bool): share response of identical concurrent
+                                      GET requests (default: True)
+            compression_threshold (int): request bodies above this size (bytes)
+                                         are gzip compressed, 0 disables it
+            max_request_rate (float): maximum requests per second to the host,
+                                      shared by all connections to the host.
+                                      0 disables rate limiting
+            session_cache (SessionCookieCache): store to reuse authenticated
+                                                sessions across processes
         Returns:
         Raises:
         """
@@ -127,6 +165,22 @@ class Connection:
         self.auth_type = auth_type
         self.response_processor = response_processor
         self.retries_enabled = retries_enabled
+        self.response_cache = response_cache
+        self.single_flight = SingleFlight() if coalesce_requests else None
+        self.compression_threshold = int(compression_threshold or 0)
+        self._compression_lock = threading.Lock()
+        self.compression_stats = {
+            "compressed_requests": 0,
+            "request_bytes_saved": 0,
+            "compressed_responses": 0,
+            "response_bytes_saved": 0,
+        }
+        self.rate_limiter = None
+        if max_request_rate:
+            self.rate_limiter = get_rate_limiter(host, port, max_request_rate)
+        self.session_cache = session_cache
+        self._session_cookies = None
+        self._session_cookies_lock = threading.Lock()
 
     def connect(self):
         """Connect to api server, create http session pool.
@@ -137,9 +191,11 @@ class Connection:
         Raises:
         """
 
+        adapter_kwargs = {}
         if self.retries_enabled:
-            retry_strategy = Retry(
+            adapter_kwargs["max_retries"] = RateLimitedRetry(
                 total=3,
+                backoff_factor=0.5,
                 status_forcelist=[429, 500, 502, 503, 504],
                 method_whitelist=[
                     "GET",
@@ -147,12 +203,16 @@ class Connection:
                     "DELETE",
                     "POST",
                 ],
+                rate_limiter=self.rate_limiter,
             )
-            http_adapter = HTTPAdapter(
+
+        if self.rate_limiter is not None:
+            http_adapter = RateLimitedHTTPAdapter(
+                self.rate_limiter,
                 pool_block=bool(self._pool_block),
                 pool_connections=int(self._pool_connections),
                 pool_maxsize=int(self._pool_maxsize),
-                max_retries=retry_strategy,
+                **adapter_kwargs,
             )
 
         else:
@@ -160,12 +220,21 @@ class Connection:
                 pool_block=bool(self._pool_block),
                 pool_connections=int(self._pool_connections),
                 pool_maxsize=int(self._pool_maxsize),
+                **adapter_kwargs,
             )
 
         self.session = Session()
         if self.auth and self.auth_type == REQUEST.AUTH_TYPE.BASIC:
-            self.session.auth = self.auth
-        self.session.headers.update({"Content-Type": "application/json"})
+            if self.session_cache is not None:
+                cookies = self.session_cache.load(self.host, self.port, self.auth)
+                self.session_cache.load_cookies(self.session.cookies, cookies)
+                self._session_cookies = self._get_session_cookies()
+                self.session.auth = SessionCookieAuth(self.auth, self.session.cookies)
+            else:
+                self.session.auth = self.auth
+        self.session.headers.update(
+            {"Content-Type": "application/json", "Accept-Encoding": "gzip, deflate"}
+        )
 
         self.session.mount("http://", http_adapter)
         self.session.mount("https://", http_adapter)
@@ -184,6 +253,74 @@ class Connection:
         """
         self.session.close()
 
+    @property
+    def coalesced_calls(self):
+        """returns number of http calls saved by coalescing identical requests"""
+
+        return self.single_flight.saved_calls if self.single_flight else 0
+
+    def _get_session_cookies(self):
+        return self.session_cache.dump_cookies(self.session.cookies)
+
+    def _store_session_cookies(self):
+        """stores session cookies in session cache, if changed"""
+
+        cookies = self._get_session_cookies()
+        with self._session_cookies_lock:
+            if cookies == self._session_cookies:
+                return
+            self._session_cookies = cookies
+
+        LOG.debug("Storing session cookies in session cache")
+        self.session_cache.save(self.host, self.port, self.auth, cookies)
+
+    def _record_compression(self, stat, bytes_saved):
+        with self._compression_lock:
+            self.compression_stats["compressed_{}s".format(stat)] += 1
+            self.compression_stats["{}_bytes_saved".format(stat)] += bytes_saved
+
+    def _encode_body(self, request_json, headers):
+        """returns (body, headers, bytes_saved) for the request data. Bodies
+        larger than compression threshold are gzip compressed"""
+
+        body = json_codec.dumps_bytes(request_json)
+        if not self.compression_threshold or len(body) < self.compression_threshold:
+            return body, headers, 0
+
+        compressed_body = gzip.compress(body, compresslevel=6)
+        bytes_saved = len(body) - len(compressed_body)
+        if bytes_saved <= 0:
+            return body, headers, 0
+
+        LOG.debug(
+            "Compressed request body from {} to {} bytes".format(
+                len(body), len(compressed_body)
+            )
+        )
+        headers = dict(headers)
+        headers["Content-Encoding"] = "gzip"
+        return compressed_body, headers, bytes_saved
+
+    def _record_response_compression(self, res):
+        """records bytes saved by compressed response"""
+
+        if res.headers.get("Content-Encoding", "").lower() not in ["gzip", "deflate"]:
+            return
+
+        try:
+            wire_bytes = res.raw.tell()
+        except Exception:
+            return
+
+        bytes_saved = len(res.content) - wire_bytes
+        if wire_bytes and bytes_saved > 0:
+            LOG.debug(
+                "Received compressed response of {} bytes ({} bytes saved)".format(
+                    wire_bytes, bytes_saved
+                )
+            )
+            self._record_compression("response", bytes_saved)
+
     def _call(
         self,
         endpoint,
@@ -197,6 +334,78 @@ class Connection:
         timeout=(5, 30),  # (connection timeout, read timeout)
         ignore_error=False,
         warning_msg="",
+        use_cache=False,
+    ):
+        """Private method for making http request to calm.
+        Identical GET requests made concurrently share a single http call.
+
+        Args: Refer _make_call
+        Returns:
+            (tuple (requests.Response, dict)): Response
+        """
+
+        def make_call():
+            return self._make_call(
+                endpoint,
+                method=method,
+                cookies=cookies,
+                request_json=request_json,
+                request_params=request_params,
+                verify=verify,
+                headers=headers,
+                files=files,
+                timeout=timeout,
+                ignore_error=ignore_error,
+                warning_msg=warning_msg,
+                use_cache=use_cache,
+            )
+
+        start_time = time.perf_counter()
+        if (
+            self.single_flight is None
+            or method != REQUEST.METHOD.GET
+            or cookies
+            or headers
+        ):
+            res, err = make_call()
+            shared_response = False
+
+        else:
+            key = "{}:{}:{}".format(
+                ResponseCache.get_key(endpoint, request_params or request_json),
+                ignore_error,
+                use_cache,
+            )
+            res, err = self.single_flight.do(key, make_call)
+            shared_response = True
+
+        if has_call_listeners():
+            notify_call_listeners(
+                CallRecord.from_response(
+                    endpoint, method, res, err, time.perf_counter() - start_time
+                )
+            )
+
+        # Every caller gets its own response object, as callers modify parsed body
+        if shared_response:
+            res = json_codec.copy_response(res)
+
+        return res, err
+
+    def _make_call(
+        self,
+        endpoint,
+        method=REQUEST.METHOD.POST,
+        cookies=None,
+        request_json=None,
+        request_params=None,
+        verify=True,
+        headers=None,
+        files=None,
+        timeout=(5, 30),  # (connection timeout, read timeout)
+        ignore_error=False,
+        warning_msg="",
+        use_cache=False,
     ):
         """Private method for making http request to calm
 
@@ -206,6 +415,8 @@ class Connection:
             cookies (dict): cookies that need to be forwarded.
             request_json (dict): request data
             request_params (dict): request params
+            use_cache (bool): serve GET from response cache (if enabled). Only
+                lookups of config entities opt in, as state must be fresh
         Returns:
             (tuple (requests.Response, dict)): Response
         """
@@ -221,65 +432,143 @@ class Connection:
         )
         res = None
         err = None
+        url = build_url(self.host, self.port, endpoint=endpoint, scheme=self.scheme)
+
+        # Serve reads from response cache, if enabled
+        cache_key = None
+        cache_entry = None
+        if (
+            self.response_cache is not None
+            and method == REQUEST.METHOD.GET
+            and use_cache
+            and not cookies
+            and not url.endswith("/download")
+        ):
+            cache_key = ResponseCache.get_key(url, request_params or request_json)
+            cache_entry, is_fresh = self.response_cache.get(cache_key)
+            if is_fresh:
+                LOG.debug("Serving cached response for {}".format(cache_key))
+                res = json_codec.copy_response(cache_entry.response)
+                res.from_cache = True
+                return res, None
+
+            if cache_entry:
+                headers = dict(headers or {})
+                headers.update(cache_entry.get_validation_headers())
+
         try:
             res = None
-            url = build_url(self.host, self.port, endpoint=endpoint, scheme=self.scheme)
             LOG.debug("URL is: {}".format(url))
-            base_headers = self.session.headers
+            base_headers = dict(self.session.headers)
             if headers:
                 base_headers.update(headers)
 
-            if method == REQUEST.METHOD.POST:
-                if files is not None:
-                    request_json.update(files)
-                    m = MultipartEncoder(fields=request_json)
-                    res = self.session.post(
+            body = None
+            body_headers = base_headers
+            request_bytes_saved = 0
+            if method != REQUEST.METHOD.GET and files is None:
+                body, body_headers, request_bytes_saved = self._encode_body(
+                    request_json, base_headers
+                )
+
+            # Servers not accepting compressed bodies may fail them with 5xx, so
+            # retrying them with the same body is futile. Only throttled ones
+            # are retried
+            retry_status_codes = [429] if request_bytes_saved else None
+            with RateLimitedRetry.limit_status_retries(retry_status_codes):
+                if method == REQUEST.METHOD.POST:
+                    if files is not None:
+                        request_json.update(files)
+                        m = MultipartEncoder(fields=request_json)
+                        res = self.session.post(
+                            url,
+                            data=m,
+                            verify=verify,
+                            headers={"Content-Type": m.content_type},
+                            timeout=timeout,
+                        )
+                    else:
+                        res = self.session.post(
+                            url,
+                            params=request_params,
+                            data=body,
+                            verify=verify,
+                            headers=body_headers,
+                            cookies=cookies,
+                            timeout=timeout,
+                        )
+                elif method == REQUEST.METHOD.PUT:
+                    res = self.session.put(
                         url,
-                        data=m,
+                        params=request_params,
+                        data=body,
                         verify=verify,
-                        headers={"Content-Type": m.content_type},
+                        headers=body_headers,
+                        cookies=cookies,
                         timeout=timeout,
                     )
-                else:
-                    res = self.session.post(
+                elif method == REQUEST.METHOD.GET:
+                    res = self.session.get(
                         url,
-                        params=request_params,
-                        data=json.dumps(request_json),
+                        params=request_params or request_json,
                         verify=verify,
                         headers=base_headers,
                         cookies=cookies,
                         timeout=timeout,
                     )
-            elif method == REQUEST.METHOD.PUT:
-                res = self.session.put(
-                    url,
-                    params=request_params,
-                    data=json.dumps(request_json),
-                    verify=verify,
-                    headers=base_headers,
-                    cookies=cookies,
-                    timeout=timeout,
-                )
-            elif method == REQUEST.METHOD.GET:
-                res = self.session.get(
-                    url,
-                    params=request_params or request_json,
-                    verify=verify,
-                    headers=base_headers,
-                    cookies=cookies,
-                    timeout=timeout,
+                elif method == REQUEST.METHOD.DELETE:
+                    res = self.session.delete(
+                        url,
+                        params=request_params,
+                        data=body,
+                        verify=verify,
+                        headers=body_headers,
+                        cookies=cookies,
+                        timeout=timeout,
+                    )
+
+            # Server doesn't accept compressed bodies (415, or 400 from servers
+            # parsing them as json), so resend it uncompressed. Such requests are
+            # rejected without being processed, unlike ones failing with 5xx
+            if request_bytes_saved and res.status_code in [400, 415]:
+                LOG.debug(
+                    "Server doesn't support compressed requests. Disabling request compression"
                 )
-            elif method == REQUEST.METHOD.DELETE:
-                res = self.session.delete(
+                self.compression_threshold = 0
+                res = self.session.request(
+                    method.upper(),
                     url,
                     params=request_params,
-                    data=json.dumps(request_json),
+                    data=json_codec.dumps_bytes(request_json),
                     verify=verify,
                     headers=base_headers,
                     cookies=cookies,
                     timeout=timeout,
                 )
+
+            elif request_bytes_saved:
+                self._record_compression("request", request_bytes_saved)
+
+            self._record_response_compression(res)
+            if self.session_cache is not None and res.ok:
+                self._store_session_cookies()
+            json_codec.use_codec_json(res)
+            if (
+                self.response_cache is not None
+                and method != REQUEST.METHOD.GET
+                and not url.endswith("/list")
+            ):
+                self.response_cache.invalidate(url)
+
             res.raise_for_status()
+            if cache_key:
+                if cache_entry and res.status_code == 304:
+                    LOG.debug("Cached response for {} is still valid".format(url))
+                    self.response_cache.revalidated(cache_key)
+                    res = json_codec.copy_response(cache_entry.response)
+                elif res.ok:
+                    self.response_cache.put(cache_key, res)
+
             if not url.endswith("/download"):
                 if not res.ok:
                     LOG.debug("Server Response: {}".format(res.json()))
@@ -322,6 +611,14 @@ class Connection:
 
 _CONNECTION = None
 
+# Connections shared by client handles, keyed by (host, port, auth_type, scheme, auth)
+_CONNECTION_POOL = {}
+_CONNECTION_POOL_LOCK = threading.Lock()
+
+
+def _get_connection_key(host, port, auth_type, scheme, auth):
+    return (host, port, auth_type, scheme, tuple(auth) if auth else None)
+
 
 def get_connection_obj(
     host,
@@ -330,9 +627,18 @@ def get_connection_obj(
     scheme=REQUEST.SCHEME.HTTPS,
     auth=None,
 ):
-    """Returns object of Connection class"""
+    """Returns object of Connection class.
+    Connection objects are pooled, so calls with same server and auth
+    details share a single connection (and its http session)"""
+
+    key = _get_connection_key(host, port, auth_type, scheme, auth)
+    with _CONNECTION_POOL_LOCK:
+        connection = _CONNECTION_POOL.get(key)
+        if connection is None:
+            connection = Connection(host, port, auth_type, scheme, auth)
+            _CONNECTION_POOL[key] = connection
 
-    return Connection(host, port, auth_type, scheme, auth)
+    return connection
 
 
 def get_connection_handle(
@@ -368,6 +674,25 @@ def update_connection_handle(
     auth_type=REQUEST.AUTH_TYPE.BASIC,
     scheme=REQUEST.SCHEME.HTTPS,
     auth=None,
+    response_cache=None,
+    compression_threshold=REQUEST.COMPRESSION_THRESHOLD,
+    max_request_rate=REQUEST.MAX_REQUEST_RATE,
+    session_cache=None,
 ):
     global _CONNECTION
-    _CONNECTION = Connection(host, port, auth_type, scheme=scheme, auth=auth)
+    _CONNECTION = Connection(
+        host,
+        port,
+        auth_type,
+        scheme=scheme,
+        auth=auth,
+        response_cache=response_cache,
+        compression_threshold=compression_threshold,
+        max_request_rate=max_request_rate,
+        session_cache=session_cache,
+    )
+
+    # Client handles for the same server and auth details use this connection
+    key = _get_connection_key(host, port, auth_type, scheme, auth)
+    with _CONNECTION_POOL_LOCK:
+        _CONNECTION_POOL[key] = _CONNECTION
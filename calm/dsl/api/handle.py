@@ -1,3 +1,5 @@
+import os
+
 from calm.dsl.config import get_context
 
 from .connection import (
@@ -6,6 +8,8 @@ from .connection import (
     update_connection_handle,
     REQUEST,
 )
+from .response_cache import ResponseCache
+from .session_cache import SessionCookieCache, SESSION_CACHE_FILE
 from .blueprint import BlueprintAPI
 from .endpoint import EndpointAPI
 from .runbook import RunbookAPI
@@ -30,38 +34,63 @@ from .job import JobAPI
 from .resource_type import ResourceTypeAPI
 
 
+class ResourceAPIDescriptor:
+    """Creates the api object of handle on first access and stores it on the
+    handle, so that later lookups don't go through the descriptor"""
+
+    def __init__(self, api_cls):
+        self.api_cls = api_cls
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, handle, owner):
+        if handle is None:
+            return self
+
+        api_obj = handle._get_api(self.api_cls)
+        handle.__dict__[self.name] = api_obj
+        return api_obj
+
+
 class ClientHandle:
+
+    # Note - add entity api classes here
+    project = ResourceAPIDescriptor(ProjectAPI)
+    environment = ResourceAPIDescriptor(EnvironmentAPI)
+    blueprint = ResourceAPIDescriptor(BlueprintAPI)
+    endpoint = ResourceAPIDescriptor(EndpointAPI)
+    runbook = ResourceAPIDescriptor(RunbookAPI)
+    task = ResourceAPIDescriptor(TaskLibraryApi)
+    application = ResourceAPIDescriptor(ApplicationAPI)
+    account = ResourceAPIDescriptor(AccountsAPI)
+    market_place = ResourceAPIDescriptor(MarketPlaceAPI)
+    app_icon = ResourceAPIDescriptor(AppIconAPI)
+    version = ResourceAPIDescriptor(VersionAPI)
+    showback = ResourceAPIDescriptor(ShowbackAPI)
+    user = ResourceAPIDescriptor(UserAPI)
+    group = ResourceAPIDescriptor(UserGroupAPI)
+    role = ResourceAPIDescriptor(RoleAPI)
+    directory_service = ResourceAPIDescriptor(DirectoryServiceAPI)
+    acp = ResourceAPIDescriptor(AccessControlPolicyAPI)
+    app_protection_policy = ResourceAPIDescriptor(AppProtectionPolicyAPI)
+    vm_recovery_point = ResourceAPIDescriptor(VmRecoveryPointAPI)
+    nutanix_task = ResourceAPIDescriptor(TaskAPI)
+    job = ResourceAPIDescriptor(JobAPI)
+    resource_types = ResourceAPIDescriptor(ResourceTypeAPI)
+
     def __init__(self, connection):
         self.connection = connection
 
     def _connect(self):
 
-        self.connection.connect()
-
-        # Note - add entity api classes here
-        self.project = ProjectAPI(self.connection)
-        self.environment = EnvironmentAPI(self.connection)
-        self.blueprint = BlueprintAPI(self.connection)
-        self.endpoint = EndpointAPI(self.connection)
-        self.runbook = RunbookAPI(self.connection)
-        self.task = TaskLibraryApi(self.connection)
-        self.application = ApplicationAPI(self.connection)
-        self.account = AccountsAPI(self.connection)
-        self.market_place = MarketPlaceAPI(self.connection)
-        self.app_icon = AppIconAPI(self.connection)
-        self.version = VersionAPI(self.connection)
-        self.showback = ShowbackAPI(self.connection)
-        self.user = UserAPI(self.connection)
-        self.group = UserGroupAPI(self.connection)
-        self.role = RoleAPI(self.connection)
-        self.directory_service = DirectoryServiceAPI(self.connection)
-        self.acp = AccessControlPolicyAPI(self.connection)
-        self.environment = EnvironmentAPI(self.connection)
-        self.app_protection_policy = AppProtectionPolicyAPI(self.connection)
-        self.vm_recovery_point = VmRecoveryPointAPI(self.connection)
-        self.nutanix_task = TaskAPI(self.connection)
-        self.job = JobAPI(self.connection)
-        self.resource_types = ResourceTypeAPI(self.connection)
+        # Connections are shared by handles, so session is created only once
+        if self.connection.session is None:
+            self.connection.connect()
+
+    def _get_api(self, api_cls):
+        return api_cls(self.connection)
 
 
 def get_client_handle_obj(
@@ -88,12 +117,26 @@ def update_api_client(
     auth_type=REQUEST.AUTH_TYPE.BASIC,
     scheme=REQUEST.SCHEME.HTTPS,
     auth=None,
+    response_cache=None,
+    compression_threshold=REQUEST.COMPRESSION_THRESHOLD,
+    max_request_rate=REQUEST.MAX_REQUEST_RATE,
+    session_cache=None,
 ):
     """updates global api client object (_API_CLIENT_HANDLE)"""
 
     global _API_CLIENT_HANDLE
 
-    update_connection_handle(host, port, auth_type, scheme=scheme, auth=auth)
+    update_connection_handle(
+        host,
+        port,
+        auth_type,
+        scheme=scheme,
+        auth=auth,
+        response_cache=response_cache,
+        compression_threshold=compression_threshold,
+        max_request_rate=max_request_rate,
+        session_cache=session_cache,
+    )
     connection = get_connection_handle(host, port, auth_type, scheme, auth)
     _API_CLIENT_HANDLE = ClientHandle(connection)
     _API_CLIENT_HANDLE._connect()
@@ -115,6 +158,42 @@ def get_api_client():
         username = server_config.get("pc_username")
         password = server_config.get("pc_password")
 
-        update_api_client(host=pc_ip, port=pc_port, auth=(username, password))
+        # Response cache for GET calls is enabled only if ttl is configured
+        connection_config = context.get_connection_config()
+        response_cache = None
+        response_cache_ttl = int(connection_config.get("response_cache_ttl") or 0)
+        if response_cache_ttl > 0:
+            response_cache = ResponseCache(
+                ttl=response_cache_ttl,
+                max_entries=int(connection_config.get("response_cache_size") or 256),
+            )
+
+        compression_threshold = connection_config.get("request_compression_threshold")
+        if compression_threshold in [None, ""]:
+            compression_threshold = REQUEST.COMPRESSION_THRESHOLD
+
+        max_request_rate = connection_config.get("max_request_rate")
+        if max_request_rate in [None, ""]:
+            max_request_rate = REQUEST.MAX_REQUEST_RATE
+
+        # Authenticated sessions are reused across processes only if ttl is configured
+        session_cache = None
+        session_cache_ttl = int(connection_config.get("session_cache_ttl") or 0)
+        if session_cache_ttl > 0:
+            db_location = context.get_init_config()["DB"]["location"]
+            session_cache = SessionCookieCache(
+                os.path.join(os.path.dirname(db_location), SESSION_CACHE_FILE),
+                ttl=session_cache_ttl,
+            )
+
+        update_api_client(
+            host=pc_ip,
+            port=pc_port,
+            auth=(username, password),
+            response_cache=response_cache,
+            compression_threshold=int(compression_threshold),
+            max_request_rate=float(max_request_rate),
+            session_cache=session_cache,
+        )
 
     return _API_CLIENT_HANDLE
@@ -0,0 +1,187 @@
+"""
+instrumentation: Hooks to observe the http calls made through Connection
+
+Listeners registered using add_call_listener are called with a CallRecord
+for every Connection._call. CallStatsAggregator is a listener that keeps
+per-endpoint summary of calls.
+
+Example:
+
+stats = CallStatsAggregator()
+add_call_listener(stats)
+...
+print(stats.get_summary())
+
+"""
+
+import re
+import threading
+from collections import OrderedDict
+
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+UUID_REGEX = re.compile(
+    r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+)
+
+_CALL_LISTENERS = []
+_CALL_LISTENERS_LOCK = threading.Lock()
+
+
+def get_endpoint_template(endpoint):
+    """returns endpoint with entity uuids/ids replaced by placeholders
+    i.e. api/nutanix/v3/apps/<uuid> -> api/nutanix/v3/apps/{uuid}"""
+
+    endpoint = endpoint.split("?", 1)[0]
+    parts = []
+    for part in endpoint.split("/"):
+        if UUID_REGEX.match(part):
+            part = "{uuid}"
+        elif part.isdigit():
+            part = "{id}"
+        parts.append(part)
+    return "/".join(parts)
+
+
+def get_body_size(body):
+    if body is None:
+        return 0
+    if isinstance(body, (str, bytes)):
+        return len(body)
+
+    # Streamed bodies i.e. MultipartEncoder
+    return getattr(body, "len", 0)
+
+
+class CallRecord:
+    """Details of a single Connection._call"""
+
+    def __init__(
+        self,
+        endpoint,
+        method,
+        status,
+        latency,
+        bytes_out=0,
+        bytes_in=0,
+        retries=0,
+        from_cache=False,
+    ):
+        self.endpoint = endpoint
+        self.method = method
+        self.status = status
+        self.latency = latency
+        self.bytes_out = bytes_out
+        self.bytes_in = bytes_in
+        self.retries = retries
+        self.from_cache = from_cache
+
+    @classmethod
+    def from_response(cls, endpoint, method, res, err, latency):
+        """creates record from the (response, error) returned by _call"""
+
+        status = err["code"] if err else getattr(res, "status_code", None)
+        if res is None:
+            return cls(get_endpoint_template(endpoint), method.upper(), status, latency)
+
+        bytes_in = len(res.content or b"")
+        retries = len(res.history)
+        if res.raw is not None:
+
+            # Bytes received on wire (compressed body)
+            try:
+                bytes_in = res.raw.tell() or bytes_in
+            except Exception:
+                pass
+
+            if getattr(res.raw, "retries", None) is not None:
+                retries += len(res.raw.retries.history)
+
+        return cls(
+            get_endpoint_template(endpoint),
+            method.upper(),
+            status,
+            latency,
+            bytes_out=get_body_size(getattr(res.request, "body", None)),
+            bytes_in=bytes_in,
+            retries=retries,
+            from_cache=getattr(res, "from_cache", False),
+        )
+
+
+def add_call_listener(listener):
+    """registers callable to be called with CallRecord of every call"""
+
+    with _CALL_LISTENERS_LOCK:
+        if listener not in _CALL_LISTENERS:
+            _CALL_LISTENERS.append(listener)
+
+
+def remove_call_listener(listener):
+    with _CALL_LISTENERS_LOCK:
+        if listener in _CALL_LISTENERS:
+            _CALL_LISTENERS.remove(listener)
+
+
+def has_call_listeners():
+    return bool(_CALL_LISTENERS)
+
+
+def notify_call_listeners(record):
+    for listener in list(_CALL_LISTENERS):
+        try:
+            listener(record)
+        except Exception as exc:
+            LOG.debug("Call listener {} failed: {}".format(listener, exc))
+
+
+class CallStatsAggregator:
+    """Call listener keeping per (method, endpoint template) summary"""
+
+    def __init__(self):
+        self._stats = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        key = (record.method, record.endpoint)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = {
+                    "method": record.method,
+                    "endpoint": record.endpoint,
+                    "calls": 0,
+                    "errors": 0,
+                    "cached": 0,
+                    "retries": 0,
+                    "total_time": 0.0,
+                    "max_time": 0.0,
+                    "bytes_out": 0,
+                    "bytes_in": 0,
+                }
+                self._stats[key] = stats
+
+            stats["calls"] += 1
+            if not record.status or record.status >= 400:
+                stats["errors"] += 1
+            if record.from_cache:
+                stats["cached"] += 1
+            stats["retries"] += record.retries
+            stats["total_time"] += record.latency
+            stats["max_time"] = max(stats["max_time"], record.latency)
+            stats["bytes_out"] += record.bytes_out
+            stats["bytes_in"] += record.bytes_in
+
+    def get_summary(self):
+        """returns per endpoint stats, endpoints taking most time first"""
+
+        with self._lock:
+            summary = [dict(stats) for stats in self._stats.values()]
+
+        return sorted(summary, key=lambda stats: stats["total_time"], reverse=True)
+
+    def clear(self):
+        with self._lock:
+            self._stats.clear()
@@ -0,0 +1,239 @@
+"""
+rate_limiter: Adaptive client side rate limiting of requests made to a host
+
+Requests take a token from a token bucket, refilled at the current request
+rate. The rate is adjusted using AIMD i.e. it increases additively on every
+successful response and is halved when server throttles (429/503). Server
+provided Retry-After delays pause all requests to the host.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
+
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+THROTTLE_STATUS_CODES = [429, 503]
+
+
+def parse_retry_after(value):
+    """returns delay (seconds) from Retry-After header value, None if invalid"""
+
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at is None:
+        return None
+    return max(retry_at.timestamp() - time.time(), 0)
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        max_rate=50,
+        min_rate=1,
+        increase_step=1,
+        decrease_factor=0.5,
+        cooldown=1,
+        max_retry_after=120,
+    ):
+        """Token bucket rate limiter with AIMD rate adjustment.
+
+        Args:
+            max_rate (float): maximum (and initial) requests per second
+            min_rate (float): requests per second below which rate is not reduced
+            increase_step (float): rate increase per second worth of
+                                   successful requests
+            decrease_factor (float): factor applied to rate on throttling
+            cooldown (float): seconds for which further throttling responses
+                              don't reduce the rate again (responses of
+                              requests that were in flight together)
+            max_retry_after (float): upper bound on Retry-After delay honoured
+        """
+        self.max_rate = float(max_rate)
+        self.min_rate = float(min(min_rate, max_rate))
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.max_retry_after = max_retry_after
+
+        self.rate = self.max_rate
+        self._tokens = max(self.rate, 1)
+        self._last_refill = time.monotonic()
+        self._last_decrease = 0
+        self._paused_until = 0
+        self._lock = threading.Lock()
+        self.throttled_count = 0
+
+    def _refill(self, now):
+        self._tokens = min(
+            self._tokens + (now - self._last_refill) * self.rate, max(self.rate, 1)
+        )
+        self._last_refill = now
+
+    def acquire(self):
+        """blocks until a request can be made"""
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                else:
+                    delay = (1 - self._tokens) / self.rate
+
+            time.sleep(delay)
+
+    def on_success(self):
+        """increases rate additively (by increase_step per second of requests)"""
+
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(
+                    self.rate + self.increase_step / self.rate, self.max_rate
+                )
+
+    def on_throttle(self, retry_after=None):
+        """reduces rate multiplicatively and honours server provided delay
+
+        Args:
+            retry_after (str): value of Retry-After header of response
+        """
+
+        delay = parse_retry_after(retry_after)
+        with self._lock:
+            self.throttled_count += 1
+            now = time.monotonic()
+            if now - self._last_decrease >= self.cooldown:
+                self._last_decrease = now
+                self.rate = max(self.rate * self.decrease_factor, self.min_rate)
+                self._tokens = min(self._tokens, 1)
+                LOG.debug(
+                    "Server is throttling requests, reduced request rate to {:.2f}/s".format(
+                        self.rate
+                    )
+                )
+
+            if delay:
+                delay = min(delay, self.max_retry_after)
+                self._paused_until = max(self._paused_until, now + delay)
+                LOG.debug("Pausing requests for {:.2f} seconds".format(delay))
+
+
+class RateLimitedRetry(Retry):
+    """Retry which reports throttled responses to the rate limiter, and takes
+    a token from it before each retry"""
+
+    # Status codes retried for requests of the thread (None retries all codes
+    # of status_forcelist), set through limit_status_retries
+    _local = threading.local()
+
+    def __init__(self, *args, rate_limiter=None, **kwargs):
+        self.rate_limiter = rate_limiter
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    @contextmanager
+    def limit_status_retries(cls, status_codes):
+        """retries only responses having status_codes, for requests made by
+        the calling thread within the block
+
+        Args:
+            status_codes (list): status codes to be retried, None for all
+        """
+
+        previous = getattr(cls._local, "status_codes", None)
+        cls._local.status_codes = status_codes
+        try:
+            yield
+        finally:
+            cls._local.status_codes = previous
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        status_codes = getattr(self._local, "status_codes", None)
+        if status_codes is not None and status_code not in status_codes:
+            return False
+
+        return super().is_retry(method, status_code, has_retry_after)
+
+    def new(self, **kw):
+        retry = super().new(**kw)
+        retry.rate_limiter = self.rate_limiter
+        return retry
+
+    def increment(self, method=None, url=None, response=None, *args, **kwargs):
+        if (
+            self.rate_limiter is not None
+            and response is not None
+            and response.status in THROTTLE_STATUS_CODES
+        ):
+            self.rate_limiter.on_throttle(response.getheader("Retry-After"))
+
+        return super().increment(method, url, response, *args, **kwargs)
+
+    def sleep(self, response=None):
+        super().sleep(response)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+
+class RateLimitedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter making requests at the rate allowed by the rate limiter"""
+
+    def __init__(self, rate_limiter, *args, **kwargs):
+        self.rate_limiter = rate_limiter
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, *args, **kwargs):
+        self.rate_limiter.acquire()
+        res = super().send(request, *args, **kwargs)
+
+        # Throttled responses retried by urllib3 are reported by RateLimitedRetry
+        if res.status_code in THROTTLE_STATUS_CODES:
+            self.rate_limiter.on_throttle(res.headers.get("Retry-After"))
+        elif res.status_code < 400:
+            self.rate_limiter.on_success()
+
+        return res
+
+
+_RATE_LIMITERS = {}
+_RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(host, port, max_rate):
+    """returns rate limiter of the host, shared by all its connections"""
+
+    key = (host, port)
+    with _RATE_LIMITERS_LOCK:
+        rate_limiter = _RATE_LIMITERS.get(key)
+        if rate_limiter is None:
+            rate_limiter = RateLimiter(max_rate=max_rate)
+            _RATE_LIMITERS[key] = rate_limiter
+
+        elif rate_limiter.max_rate != max_rate:
+            rate_limiter.max_rate = float(max_rate)
+            rate_limiter.rate = min(rate_limiter.rate, rate_limiter.max_rate)
+
+    return rate_limiter
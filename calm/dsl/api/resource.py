@@ -1,4 +1,10 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 from .connection import REQUEST
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
 
 
 class ResourceAPI:
@@ -6,6 +12,14 @@ class ResourceAPI:
     ROOT = "api/nutanix/v3"
     CALM_ROOT = "api/calm/v3.0"
 
+    # list_all fetches pages after the first one concurrently using these many
+    # threads. Entity apis having unstable ordering across pages can opt out.
+    LIST_ALL_CONCURRENT = True
+    LIST_ALL_MAX_WORKERS = 8
+
+    # Number of names resolved by a single filter query in get_names_uuid_map
+    NAME_FILTER_BATCH_SIZE = 50
+
     def __init__(self, connection, resource_type, calm_api=False):
         self.connection = connection
         self.PREFIX = (self.CALM_ROOT if calm_api else self.ROOT) + "/" + resource_type
@@ -17,9 +31,13 @@ class ResourceAPI:
             self.PREFIX, verify=False, request_json=payload, method=REQUEST.METHOD.POST
         )
 
-    def read(self, id=None):
+    def read(self, id=None, use_cache=False):
+        # Reads are served from response cache only if caller opts in, as
+        # entity state (i.e. in watch/poll loops) must be fresh
         url = self.ITEM.format(id) if id else self.PREFIX
-        return self.connection._call(url, verify=False, method=REQUEST.METHOD.GET)
+        return self.connection._call(
+            url, verify=False, method=REQUEST.METHOD.GET, use_cache=use_cache
+        )
 
     def update(self, uuid, payload):
         return self.connection._call(
@@ -60,21 +78,107 @@ class ResourceAPI:
         for entity in response["entities"]:
             entity_name = entity["status"]["name"]
             entity_uuid = entity["metadata"]["uuid"]
+            self._add_to_name_uuid_map(name_uuid_map, entity_name, entity_uuid)
+
+        return name_uuid_map
+
+    @staticmethod
+    def _add_to_name_uuid_map(name_uuid_map, entity_name, entity_uuid):
+        """adds uuid to the map. Uuids of entities with same name are kept as list"""
+
+        if entity_name in name_uuid_map:
+            uuid = name_uuid_map[entity_name]
 
-            if entity_name in name_uuid_map:
-                uuid = name_uuid_map[entity_name]
+            if type(uuid) is str:
+                uuids = uuid.split()
+                uuids.append(entity_uuid)
+                name_uuid_map[entity_name] = uuids
 
-                if type(uuid) is str:
-                    uuids = uuid.split()
-                    uuids.append(entity_uuid)
-                    name_uuid_map[entity_name] = uuids
+            elif type(uuid) is list:
+                uuid.append(entity_uuid)
+                name_uuid_map[entity_name] = uuid
 
-                elif type(uuid) is list:
-                    uuid.append(entity_uuid)
-                    name_uuid_map[entity_name] = uuid
+        else:
+            name_uuid_map[entity_name] = entity_uuid
+
+    @staticmethod
+    def is_filterable_name(name):
+        """returns False if name has FIQL reserved characters, as such names
+        can't be used in filters (i.e. ',' is OR)"""
+
+        return not any(c in name for c in ",;()")
+
+    def get_entity_name(self, entity):
+        """returns name by which get_names_uuid_map resolves the entity, None
+        if entity should not be resolved"""
+
+        return entity["status"]["name"]
+
+    def get_names_uuid_map(self, names, filter_query="", api_limit=250):
+        """returns name-uuid map of entities having given names
+
+        Names are resolved in batches using filter 'name==a,name==b,...', so
+        the number of list calls doesn't grow with number of names. Names
+        having FIQL reserved characters can't be filtered, so entities are
+        listed without name filter and matched locally. As in
+        get_name_uuid_map, uuids of entities with same name are returned as
+        list. Names not found are absent in the map.
+
+        Args:
+            names (list): names of entities
+            filter_query (str): additional filter applied to entities
+                                i.e. 'state!=DELETED'
+            api_limit (int): page size of list calls
+        Returns:
+            (dict): name-uuid map
+        """
+
+        # Remove duplicates, retaining order
+        names = list(OrderedDict.fromkeys(names))
+        if not names:
+            return {}
 
-            else:
-                name_uuid_map[entity_name] = entity_uuid
+        filter_names = [name for name in names if self.is_filterable_name(name)]
+        batch_size = self.NAME_FILTER_BATCH_SIZE
+        filters = [
+            "({})".format(
+                ",".join(
+                    [
+                        "name=={}".format(name)
+                        for name in filter_names[i : i + batch_size]
+                    ]
+                )
+            )
+            for i in range(0, len(filter_names), batch_size)
+        ]
+        if filter_query:
+            filters = ["{};{}".format(_f, filter_query) for _f in filters]
+
+        # Single listing (without name filter) covers all other names
+        if len(filter_names) < len(names):
+            filters = [filter_query]
+
+        def list_filtered(_filter):
+            base_params = {"filter": _filter} if _filter else None
+            return self.list_all(api_limit=api_limit, base_params=base_params)
+
+        if len(filters) == 1:
+            entity_lists = [list_filtered(filters[0])]
+        else:
+            max_workers = min(self.LIST_ALL_MAX_WORKERS, len(filters))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                entity_lists = list(executor.map(list_filtered, filters))
+
+        # Server matches names as patterns, so only exact matches are retained
+        names = set(names)
+        name_uuid_map = {}
+        for entities in entity_lists:
+            for entity in entities:
+                entity_name = self.get_entity_name(entity)
+                if entity_name in names:
+                    self._add_to_name_uuid_map(
+                        name_uuid_map, entity_name, entity["metadata"]["uuid"]
+                    )
 
         return name_uuid_map
 
@@ -98,46 +202,154 @@ class ResourceAPI:
 
         return uuid_name_map
 
-    # TODO: Fix return type of list_all helper
-    def list_all(self, api_limit=250, base_params=None, ignore_error=False):
-        """returns the list of entities"""
+    def get_total_matches(self, filter_query=""):
+        """returns number of entities matching the filter, using a single entity page"""
 
-        final_list = []
-        offset = 0
-        if base_params is None:
-            base_params = {}
-        params = base_params.copy()
-        length = params.get("length", api_limit)
-        params["length"] = length
-        params["offset"] = offset
+        params = {"length": 1, "offset": 0}
+        if filter_query:
+            params["filter"] = filter_query
+
+        response, err = self._list_page(params)
+        return response["metadata"]["total_matches"]
+
+    def list_uuids(self, filter_query="", api_limit=250):
+        """returns set of uuids of entities matching the filter. Pages are
+        streamed, so only the uuids are held in memory"""
+
+        base_params = {"filter": filter_query} if filter_query else None
+        return set(
+            entity["metadata"]["uuid"]
+            for entity in self.iter_all(api_limit=api_limit, base_params=base_params)
+        )
+
+    @staticmethod
+    def _list_all_params(api_limit=250, base_params=None):
+        """returns list params for the first page of paginated list calls"""
+
+        params = (base_params or {}).copy()
+        params["length"] = params.get("length", api_limit)
+        params["offset"] = 0
         if params.get("sort_attribute", None) is None:
             params["sort_attribute"] = "_created_timestamp_usecs_"
         if params.get("sort_order", None) is None:
             params["sort_order"] = "ASCENDING"
-        while True:
-            params["offset"] = offset
-            response, err = self.list(params, ignore_error=ignore_error)
-            if not err:
-                response = response.json()
-            else:
-                if ignore_error:
-                    return [], err
-                else:
-                    raise Exception("[{}] - {}".format(err["code"], err["error"]))
+        return params
+
+    def _list_page(self, params, ignore_error=False):
+        """returns (response_json, err) for a single page of list call"""
+
+        response, err = self.list(params, ignore_error=ignore_error)
+        if not err:
+            return response.json(), None
+
+        if ignore_error:
+            return None, err
+        raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
-            final_list.extend(response["entities"])
+    # TODO: Fix return type of list_all helper
+    def list_all(
+        self, api_limit=250, base_params=None, ignore_error=False, concurrent=None
+    ):
+        """returns the list of entities
+
+        Total matches are read from the first page. Remaining pages are then
+        fetched concurrently and re-assembled in offset order. Use
+        concurrent=False (or LIST_ALL_CONCURRENT class attribute) for
+        endpoints whose ordering is not stable across pages.
+        """
+
+        final_list = []
+        offset = 0
+        if concurrent is None:
+            concurrent = self.LIST_ALL_CONCURRENT
+        params = self._list_all_params(api_limit, base_params)
+        length = params["length"]
+
+        response, err = self._list_page(params, ignore_error=ignore_error)
+        if err:
+            return [], err
+        final_list.extend(response["entities"])
+        total_matches = response["metadata"]["total_matches"]
 
-            total_matches = response["metadata"]["total_matches"]
-            if total_matches <= (length + offset):
-                break
+        if concurrent and total_matches > 2 * length:
+            page_params = []
+            for offset in range(length, total_matches, length):
+                _params = params.copy()
+                _params["offset"] = offset
+                page_params.append(_params)
+
+            max_workers = min(self.LIST_ALL_MAX_WORKERS, len(page_params))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # map() yields the results in the order of page_params
+                pages = executor.map(
+                    lambda _params: self._list_page(_params, ignore_error), page_params
+                )
+                for response, err in pages:
+                    if err:
+                        return [], err
+                    final_list.extend(response["entities"])
 
-            offset += length
+        else:
+            while total_matches > (length + offset):
+                offset += length
+                params["offset"] = offset
+                response, err = self._list_page(params, ignore_error=ignore_error)
+                if err:
+                    return [], err
+
+                final_list.extend(response["entities"])
+                total_matches = response["metadata"]["total_matches"]
 
         if ignore_error:
             return final_list, None
 
         return final_list
 
+    def iter_all(
+        self, api_limit=250, base_params=None, ignore_error=False, prefetch=True
+    ):
+        """yields the entities page by page
+
+        Only the page being consumed (and the prefetched next page) is held in
+        memory, so callers walking the entities once should prefer it over
+        list_all. If ignore_error is set, iteration stops at a failed page.
+        """
+
+        params = self._list_all_params(api_limit, base_params)
+        length = params["length"]
+
+        def fetch_page(offset):
+            _params = params.copy()
+            _params["offset"] = offset
+            response, err = self._list_page(_params, ignore_error=ignore_error)
+            if err:
+                LOG.warning(
+                    "Failed to list entities at {}: [{}] - {}".format(
+                        self.LIST, err["code"], err["error"]
+                    )
+                )
+            return response
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            offset = 0
+            response = fetch_page(offset)
+            while response:
+                total_matches = response["metadata"]["total_matches"]
+                offset += length
+
+                # fetch next page in background while current one is consumed
+                next_page = None
+                if prefetch and total_matches > offset:
+                    next_page = executor.submit(fetch_page, offset)
+
+                for entity in response["entities"]:
+                    yield entity
+
+                if total_matches <= offset:
+                    break
+
+                response = next_page.result() if next_page else fetch_page(offset)
+
 
 def get_resource_api(resource_type, connection, calm_api=False):
     return ResourceAPI(connection, resource_type, calm_api=calm_api)
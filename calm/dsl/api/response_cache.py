@@ -0,0 +1,139 @@
+"""
+response_cache: LRU/TTL cache for GET responses made through Connection
+
+Entries are keyed by url (and query params). Expired entries carrying an
+ETag/Last-Modified validator are revalidated through a conditional request,
+and any write to a resource invalidates the cached reads of that resource.
+"""
+
+import json
+import time
+import threading
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+
+class CachedResponse:
+    """Cache entry holding a response and its validators"""
+
+    def __init__(self, response):
+        self.response = response
+        self.created_at = time.monotonic()
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+
+    def is_fresh(self, ttl):
+        return (time.monotonic() - self.created_at) < ttl
+
+    def get_validation_headers(self):
+        """returns headers for conditional request to revalidate the entry"""
+
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def refresh(self):
+        self.created_at = time.monotonic()
+
+
+class ResponseCache:
+    def __init__(self, ttl=30, max_entries=256):
+        """Read-through cache for GET responses.
+
+        Args:
+            ttl (int): seconds for which an entry is served without revalidation
+            max_entries (int): maximum number of entries (least recently used
+                               entries are evicted first)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    @staticmethod
+    def get_key(url, params=None):
+        if not params:
+            return url
+        return "{}?{}".format(url, json.dumps(params, sort_keys=True))
+
+    @staticmethod
+    def get_resource_path(url):
+        return urlparse(url).path.rstrip("/")
+
+    def get(self, key):
+        """returns (entry, is_fresh) for the key, entry is None on miss"""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+
+            self._entries.move_to_end(key)
+            if entry.is_fresh(self.ttl):
+                self.hits += 1
+                return entry, True
+
+            # Entries without validators can't be revalidated
+            if not entry.get_validation_headers():
+                del self._entries[key]
+                self.misses += 1
+                return None, False
+
+            return entry, False
+
+    def put(self, key, response):
+        with self._lock:
+            self._entries[key] = CachedResponse(response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def revalidated(self, key):
+        """marks the entry as validated by server (304 response)"""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refresh()
+                self.revalidations += 1
+            return entry
+
+    def invalidate(self, url):
+        """drops the cached reads of the resource (and its sub-resources)
+        addressed by url. Reads of parent resources are dropped too, as
+        actions on sub-resources (e.g. app actions) modify the parent."""
+
+        path = self.get_resource_path(url)
+        with self._lock:
+            for key in list(self._entries.keys()):
+                cached_path = self.get_resource_path(key.split("?", 1)[0])
+                if (
+                    cached_path == path
+                    or cached_path.startswith(path + "/")
+                    or path.startswith(cached_path + "/")
+                ):
+                    LOG.debug("Invalidating cached response of {}".format(key))
+                    del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "entries": len(self._entries),
+        }
@@ -0,0 +1,184 @@
+"""
+session_cache: Reuse of authenticated server sessions across dsl processes
+
+Session cookies set by the server are stored encrypted (using the server
+credentials as pass phrase) in a file next to the local database. Later
+processes send these cookies instead of basic auth, so server doesn't have
+to authenticate the user again (slow for directory service users).
+"""
+
+import os
+import json
+import time
+import base64
+import hashlib
+import threading
+
+from requests.auth import AuthBase, HTTPBasicAuth
+from requests.cookies import create_cookie
+
+from calm.dsl.crypto import Crypto
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+SESSION_CACHE_FILE = "session_cache.json"
+
+
+class SessionCookieAuth(AuthBase):
+    """Sends session cookies (if present) instead of basic auth. Requests
+    rejected with 401 are resent with basic auth, that starts a new session"""
+
+    def __init__(self, auth, cookies):
+        self.auth = auth
+        self.cookies = cookies
+
+    def _use_cookies(self, request):
+
+        # Streamed bodies (multipart uploads) can't be resent after a 401
+        if request.body is not None and not isinstance(request.body, (str, bytes)):
+            return False
+
+        return len(self.cookies) > 0
+
+    def __call__(self, request):
+        if not self._use_cookies(request):
+            return HTTPBasicAuth(*self.auth)(request)
+
+        request.register_hook("response", self.handle_401)
+        return request
+
+    def handle_401(self, res, **kwargs):
+        if res.status_code != 401:
+            return res
+
+        LOG.debug("Cached session is no longer valid, authenticating again")
+        self.cookies.clear()
+
+        # Consume content and release the connection for reuse
+        res.content
+        res.close()
+
+        request = res.request.copy()
+        request.headers.pop("Cookie", None)
+        HTTPBasicAuth(*self.auth)(request)
+
+        new_res = res.connection.send(request, **kwargs)
+        new_res.history.append(res)
+        new_res.request = request
+        return new_res
+
+
+class SessionCookieCache:
+    def __init__(self, location, ttl):
+        """Encrypted file store of session cookies.
+
+        Args:
+            location (str): file in which cookies are stored
+            ttl (int): seconds for which stored cookies are reused
+        """
+        self.location = location
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(host, port, auth):
+        return hashlib.sha256(
+            "{}:{}:{}".format(host, port, auth[0]).encode("utf-8")
+        ).hexdigest()
+
+    @staticmethod
+    def get_pass_phrase(host, port, auth):
+        return "{}:{}@{}:{}".format(auth[0], auth[1], host, port).encode("utf-8")
+
+    def _read(self):
+        if not os.path.exists(self.location):
+            return {}
+
+        try:
+            with open(self.location, "r") as fd:
+                return json.load(fd)
+        except (OSError, ValueError):
+            LOG.debug("Ignoring unreadable session cache {}".format(self.location))
+            return {}
+
+    def _write(self, data):
+        tmp_location = "{}.{}.tmp".format(self.location, os.getpid())
+        fd = os.open(tmp_location, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_location, self.location)
+
+    def load(self, host, port, auth):
+        """returns list of cookies (dict) stored for the server and user"""
+
+        entry = self._read().get(self.get_key(host, port, auth))
+        if not entry:
+            return []
+
+        if time.time() - entry["saved_at"] > self.ttl:
+            LOG.debug("Cached session has expired")
+            return []
+
+        enc_msg = tuple(
+            base64.b64decode(entry[field])
+            for field in ["kdf_salt", "ciphertext", "iv", "auth_tag"]
+        )
+        try:
+            cookies = Crypto.decrypt_AES_GCM(
+                enc_msg, self.get_pass_phrase(host, port, auth)
+            )
+        except ValueError:
+            # Credentials have changed since the session was cached
+            LOG.debug("Failed to decrypt cached session")
+            return []
+
+        return json.loads(cookies)
+
+    def save(self, host, port, auth, cookies):
+        """stores cookies (list of dict) for the server and user"""
+
+        kdf_salt, ciphertext, iv, auth_tag = Crypto.encrypt_AES_GCM(
+            json.dumps(cookies), self.get_pass_phrase(host, port, auth)
+        )
+        entry = {
+            "kdf_salt": base64.b64encode(kdf_salt).decode("utf-8"),
+            "ciphertext": base64.b64encode(ciphertext).decode("utf-8"),
+            "iv": base64.b64encode(iv).decode("utf-8"),
+            "auth_tag": base64.b64encode(auth_tag).decode("utf-8"),
+            "saved_at": time.time(),
+        }
+
+        with self._lock:
+            data = self._read()
+            data[self.get_key(host, port, auth)] = entry
+            try:
+                self._write(data)
+            except OSError as exc:
+                LOG.debug("Failed to store session cache: {}".format(exc))
+
+    @staticmethod
+    def dump_cookies(cookie_jar):
+        """returns cookies of jar as list of dicts"""
+
+        return [
+            {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+                "expires": cookie.expires,
+                "secure": cookie.secure,
+            }
+            for cookie in cookie_jar
+        ]
+
+    @staticmethod
+    def load_cookies(cookie_jar, cookies):
+        """adds cookies (list of dicts) to the jar"""
+
+        now = time.time()
+        for cookie in cookies:
+            if cookie["expires"] and cookie["expires"] < now:
+                continue
+            cookie_jar.set_cookie(create_cookie(**cookie))
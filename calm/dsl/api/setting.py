@@ -29,12 +29,8 @@ class AccountsAPI(ResourceAPI):
     def get_uuid_type_map(self, params=dict()):
         """returns map containing {account_uuid: account_type} details"""
 
-        res_entities, err = self.list_all(base_params=params, ignore_error=True)
-        if err:
-            raise Exception(err)
-
         uuid_type_map = {}
-        for entity in res_entities:
+        for entity in self.iter_all(base_params=params):
             a_uuid = entity["metadata"]["uuid"]
             a_type = entity["status"]["resources"]["type"]
             uuid_type_map[a_uuid] = a_type
@@ -0,0 +1,60 @@
+"""
+single_flight: Coalesces identical in-flight calls
+
+When several threads issue the same idempotent call at the same time, only
+the first one (leader) makes the call. Others wait for it and share its
+result.
+"""
+
+import threading
+
+
+class _InFlightCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.succeeded = False
+        self.result = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.saved_calls = 0
+
+    def do(self, key, func):
+        """returns result of func, sharing it with concurrent calls for same key
+
+        Args:
+            key (str): identity of the call
+            func (callable): function making the call
+        Returns:
+            return value of func
+        """
+
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _InFlightCall()
+                self._calls[key] = call
+
+        if not is_leader:
+            call.done.wait()
+            if call.succeeded:
+                with self._lock:
+                    self.saved_calls += 1
+                return call.result
+
+            # Leader call raised, so make the call separately
+            return func()
+
+        try:
+            call.result = func()
+            call.succeeded = True
+            return call.result
+
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
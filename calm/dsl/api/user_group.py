@@ -5,6 +5,54 @@ class UserGroupAPI(ResourceAPI):
     def __init__(self, connection):
         super().__init__(connection, resource_type="user_groups")
 
+    @staticmethod
+    def get_distinguished_name(entity):
+        """returns distinguished name of COMPLETE user group of a directory
+        service, else None"""
+
+        state = entity["status"]["state"]
+        if state != "COMPLETE":
+            return None
+
+        e_resources = entity["status"]["resources"]
+
+        directory_service_user_group = (
+            e_resources.get("directory_service_user_group") or dict()
+        )
+        distinguished_name = directory_service_user_group.get("distinguished_name")
+
+        # For user-groups having caps in the name
+        try:
+            distinguished_name = entity["spec"]["resources"][
+                "directory_service_user_group"
+            ]["distinguished_name"]
+        except Exception:
+            pass
+
+        directory_service_ref = (
+            directory_service_user_group.get("directory_service_reference") or dict()
+        )
+        directory_service_name = directory_service_ref.get("name", "")
+
+        if directory_service_name and distinguished_name:
+            return distinguished_name
+
+        return None
+
+    def get_entity_name(self, entity):
+        return self.get_distinguished_name(entity)
+
+    def get_names_uuid_map(self, names, filter_query="", api_limit=250):
+        """returns distinguished name-uuid map of COMPLETE user groups of a
+        directory service. Distinguished names have ',' (FIQL OR), so groups
+        are listed without name filter and matched locally"""
+
+        return super().get_names_uuid_map(
+            [name for name in names if name],
+            filter_query=filter_query,
+            api_limit=api_limit,
+        )
+
     def get_name_uuid_map(self, params=dict()):
 
         res, err = self.list(params)
@@ -14,35 +62,9 @@ class UserGroupAPI(ResourceAPI):
 
         name_uuid_map = {}
         for entity in res["entities"]:
-            state = entity["status"]["state"]
-            if state != "COMPLETE":
-                continue
-
-            e_resources = entity["status"]["resources"]
-
-            directory_service_user_group = (
-                e_resources.get("directory_service_user_group") or dict()
-            )
-            distinguished_name = directory_service_user_group.get("distinguished_name")
-
-            # For user-groups having caps in the name
-            try:
-                distinguished_name = entity["spec"]["resources"][
-                    "directory_service_user_group"
-                ]["distinguished_name"]
-            except Exception:
-                pass
-
-            directory_service_ref = (
-                directory_service_user_group.get("directory_service_reference")
-                or dict()
-            )
-            directory_service_name = directory_service_ref.get("name", "")
-
-            uuid = entity["metadata"]["uuid"]
-
-            if directory_service_name and distinguished_name:
-                name_uuid_map[distinguished_name] = uuid
+            distinguished_name = self.get_distinguished_name(entity)
+            if distinguished_name:
+                name_uuid_map[distinguished_name] = entity["metadata"]["uuid"]
 
         return name_uuid_map
 
@@ -55,34 +77,8 @@ class UserGroupAPI(ResourceAPI):
 
         uuid_name_map = {}
         for entity in res["entities"]:
-            state = entity["status"]["state"]
-            if state != "COMPLETE":
-                continue
-
-            e_resources = entity["status"]["resources"]
-
-            directory_service_user_group = (
-                e_resources.get("directory_service_user_group") or dict()
-            )
-            distinguished_name = directory_service_user_group.get("distinguished_name")
-
-            # For user-groups having caps in the name
-            try:
-                distinguished_name = entity["spec"]["resources"][
-                    "directory_service_user_group"
-                ]["distinguished_name"]
-            except Exception:
-                pass
-
-            directory_service_ref = (
-                directory_service_user_group.get("directory_service_reference")
-                or dict()
-            )
-            directory_service_name = directory_service_ref.get("name", "")
-
-            uuid = entity["metadata"]["uuid"]
-
-            if directory_service_name and distinguished_name:
-                uuid_name_map[uuid] = distinguished_name
+            distinguished_name = self.get_distinguished_name(entity)
+            if distinguished_name:
+                uuid_name_map[entity["metadata"]["uuid"]] = distinguished_name
 
         return uuid_name_map
@@ -80,7 +80,7 @@ def get_ahv_bf_vm_data(
             sys.exit(-1)
 
     client = get_api_client()
-    res, err = client.account.read(account_uuid)
+    res, err = client.account.read(account_uuid, use_cache=True)
     if err:
         raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
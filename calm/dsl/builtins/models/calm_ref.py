@@ -75,6 +75,7 @@ class Ref:
                 name=name,
                 cluster=cluster,
                 account_uuid=account_uuid,
+                read_through=True,
             )
 
             if not subnet_cache_data:
@@ -96,6 +97,7 @@ class Ref:
                 name=name,
                 directory=directory,
                 display_name=display_name,
+                read_through=True,
             )
 
             if not user_cache_data:
@@ -115,6 +117,7 @@ class Ref:
                 name=name,
                 directory=directory,
                 display_name=display_name,
+                read_through=True,
             )
 
             if not user_group_cache_data:
@@ -204,7 +204,9 @@ def snapshot_config_create(
     if policy:
         rule = policy.pop("rule_uuid", None)
         client = get_api_client()
-        res, err = client.app_protection_policy.read(id=policy.get("uuid"))
+        res, err = client.app_protection_policy.read(
+            id=policy.get("uuid"), use_cache=True
+        )
         if err:
             LOG.error("[{}] - {}".format(err["code"], err["error"]))
             sys.exit("Unable to retrieve protection policy details")
@@ -124,7 +124,7 @@ def dynamic_cred(
 
     if variable_dict:
         resource_type_uuid = resource_type.compile()["uuid"]
-        res, err = client.resource_types.read(id=resource_type_uuid)
+        res, err = client.resource_types.read(id=resource_type_uuid, use_cache=True)
         if err:
             LOG.error(err)
             sys.exit(-1)
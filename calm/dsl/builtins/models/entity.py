@@ -9,7 +9,7 @@ import copy
 import keyword
 
 from ruamel.yaml import YAML, resolver, SafeRepresenter
-from calm.dsl.tools import StrictDraft7Validator
+from calm.dsl.tools import StrictDraft7Validator, json_codec
 from calm.dsl.log import get_logging_handle
 from .schema import get_schema_details
 from .utils import get_valid_identifier
@@ -555,16 +555,21 @@ class EntityType(EntityTypeBase):
 
     def json_dumps(cls, pprint=False, sort_keys=False):
 
+        if not pprint:
+            return json_codec.dumps(
+                cls, default=_entity_json_default, sort_keys=sort_keys
+            )
+
         dump = json.dumps(
             cls,
             cls=EntityJSONEncoder,
             sort_keys=sort_keys,
-            indent=4 if pprint else None,
-            separators=(",", ": ") if pprint else (",", ":"),
+            indent=4,
+            separators=(",", ": "),
         )
 
         # Add newline for pretty print
-        return dump + "\n" if pprint else dump
+        return dump + "\n"
 
     def json_loads(cls, data):
         return json.loads(data, cls=EntityJSONDecoder)
@@ -600,7 +605,7 @@ class EntityType(EntityTypeBase):
         return _cls
 
     def get_dict(cls):
-        return json.loads(cls.json_dumps())
+        return json_codec.loads(cls.json_dumps())
 
 
 class Entity(metaclass=EntityType):
@@ -617,6 +622,17 @@ class EntityJSONEncoder(JSONEncoder):
         return cls.generate_payload()
 
 
+def _entity_json_default(cls):
+    """default hook for json_codec, counterpart of EntityJSONEncoder.default"""
+
+    if not hasattr(cls, "__kind__"):
+        raise TypeError(
+            "Object of type {} is not JSON serializable".format(type(cls).__name__)
+        )
+
+    return cls.generate_payload()
+
+
 class EntityJSONDecoder(JSONDecoder):
     def __init__(self, *args, **kwargs):
         super().__init__(object_hook=self.object_hook, *args, **kwargs)
@@ -103,7 +103,8 @@ def get_project(name=None, project_uuid=""):
     else:
         LOG.info("Fetching details of project (uuid='{}')".format(project_uuid))
 
-    res, err = client.project.read(project_uuid)  # for getting additional fields
+    # for getting additional fields
+    res, err = client.project.read(project_uuid, use_cache=True)
     if err:
         raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
@@ -309,13 +309,13 @@ def create_acp(role, project, acp_users, acp_groups, name):
 
     # TODO check these users are not present in project's other acps
     user_references = []
-    user_name_uuid_map = client.user.get_name_uuid_map({"length": 1000})
+    user_name_uuid_map = client.user.get_names_uuid_map(acp_users)
     for u in acp_users:
         user_references.append(
             {"kind": "user", "name": u, "uuid": user_name_uuid_map[u]}
         )
 
-    usergroup_name_uuid_map = client.group.get_name_uuid_map({"length": 1000})
+    usergroup_name_uuid_map = client.group.get_names_uuid_map(acp_groups)
     group_references = []
     for g in acp_groups:
         group_references.append(
@@ -613,13 +613,13 @@ def update_acp(
                     updated_group_reference_list.append(group)
 
             # TODO check these users are not present in project's other acps
-            user_name_uuid_map = client.user.get_name_uuid_map({"length": 1000})
+            user_name_uuid_map = client.user.get_names_uuid_map(add_user_list)
             for user in add_user_list:
                 updated_user_reference_list.append(
                     {"kind": "user", "name": user, "uuid": user_name_uuid_map[user]}
                 )
 
-            usergroup_name_uuid_map = client.group.get_name_uuid_map({"length": 1000})
+            usergroup_name_uuid_map = client.group.get_names_uuid_map(add_group_list)
             for group in add_group_list:
                 updated_group_reference_list.append(
                     {
@@ -623,33 +623,36 @@ def format_blueprint_command(bp_file):
 def get_blueprint_uuid(name, all=False, is_brownfield=False):
     """returns blueprint uuid if present else raises error"""
 
+    return get_blueprint_uuids([name], all=all, is_brownfield=is_brownfield)[name]
+
+
+def get_blueprint_uuids(names, all=False, is_brownfield=False):
+    """returns blueprint name-uuid map if all are present else raises error"""
+
     client = get_api_client()
-    params = {"filter": "name=={}".format(name)}
+    filter_query = ""
     if not all:
-        params["filter"] += ";state!=DELETED"
+        filter_query = "state!=DELETED"
 
     if is_brownfield:
-        params["filter"] += ";type==BROWNFIELD"
+        filter_query += ";type==BROWNFIELD" if filter_query else "type==BROWNFIELD"
 
-    res, err = client.blueprint.list(params=params)
-    if err:
-        raise Exception("[{}] - {}".format(err["code"], err["error"]))
-
-    response = res.json()
-    entities = response.get("entities", None)
-    blueprint = None
-    if entities:
-        if len(entities) != 1:
-            LOG.error("More than one blueprint found - {}".format(entities))
+    bp_name_uuid_map = client.blueprint.get_names_uuid_map(
+        names, filter_query=filter_query
+    )
+    for name in names:
+        bp_uuid = bp_name_uuid_map.get(name)
+        if not bp_uuid:
+            LOG.error("No blueprint found with name {} found".format(name))
+            sys.exit("No blueprint found with name {} found".format(name))
+
+        elif isinstance(bp_uuid, list):
+            LOG.error("More than one blueprint found - {}".format(bp_uuid))
             sys.exit(-1)
 
         LOG.info("{} found ".format(name))
-        blueprint = entities[0]
-    else:
-        LOG.error("No blueprint found with name {} found".format(name))
-        sys.exit("No blueprint found with name {} found".format(name))
 
-    return blueprint["metadata"]["uuid"]
+    return bp_name_uuid_map
 
 
 def get_blueprint(name, all=False, is_brownfield=False):
@@ -1735,9 +1738,10 @@ def poll_launch_status(client, blueprint_uuid, launch_req_id):
 def delete_blueprint(blueprint_names):
 
     client = get_api_client()
+    bp_name_uuid_map = get_blueprint_uuids(blueprint_names)
 
     for blueprint_name in blueprint_names:
-        bp_uuid = get_blueprint_uuid(blueprint_name)
+        bp_uuid = bp_name_uuid_map[blueprint_name]
         _, err = client.blueprint.delete(bp_uuid)
         if err:
             LOG.error("[{}] - {}".format(err["code"], err["error"]))
@@ -4,7 +4,7 @@ import click
 from calm.dsl.store import Cache
 from calm.dsl.constants import CACHE
 
-from .main import show, update, clear
+from .main import show, update, clear, calm_import, calm_export
 from .utils import highlight_text
 from calm.dsl.log import get_logging_handle
 
@@ -47,13 +47,76 @@ def clear_cache():
     help="Cache entity, if not given will update whole cache",
     type=click.Choice(get_cache_table_types()),
 )
-def update_cache(entity):
+@click.option(
+    "--delta/--full",
+    default=False,
+    help="Update only the entities changed since last update (defaults to full update)",
+)
+def update_cache(entity, delta):
     """Update the data for dynamic entities stored in the cache"""
 
     if entity:
-        Cache.sync_table(entity)
+        Cache.sync_table(entity, delta=delta)
         Cache.show_table(entity)
     else:
-        Cache.sync()
+        Cache.sync(delta=delta)
         Cache.show_data()
     LOG.info(highlight_text("Cache updated at {}".format(datetime.datetime.now())))
+
+
+@calm_export.command("cache")
+@click.option(
+    "--file",
+    "-f",
+    "snapshot_file",
+    required=True,
+    type=click.Path(dir_okay=False, writable=True, resolve_path=True),
+    help="Path of cache snapshot file to be created (gzip compressed json)",
+)
+def export_cache(snapshot_file):
+    """Export the cache data to a snapshot file"""
+
+    row_counts = Cache.export_snapshot(snapshot_file)
+    LOG.info(
+        highlight_text(
+            "Cache exported to {} ({} rows)".format(
+                snapshot_file, sum(row_counts.values())
+            )
+        )
+    )
+
+
+@calm_import.command("cache")
+@click.option(
+    "--file",
+    "-f",
+    "snapshot_file",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, resolve_path=True),
+    help="Path of cache snapshot file created by 'calm export cache'",
+)
+@click.option(
+    "--skip-version-check",
+    is_flag=True,
+    default=False,
+    help="Import the snapshot without matching its PC/Calm versions with server",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    default=False,
+    help="Import the snapshot even if it is exported from another server",
+)
+def import_cache(snapshot_file, skip_version_check, force):
+    """Replace the cache data by a snapshot file"""
+
+    row_counts = Cache.import_snapshot(
+        snapshot_file, check_version=not skip_version_check, force=force
+    )
+    LOG.info(
+        highlight_text(
+            "Cache imported from {} ({} rows)".format(
+                snapshot_file, sum(row_counts.values())
+            )
+        )
+    )
@@ -1,5 +1,7 @@
 import click
+from prettytable import PrettyTable
 
+from calm.dsl.api.instrumentation import CallStatsAggregator, add_call_listener
 from calm.dsl.config import get_context
 from calm.dsl.log import CustomLogging
 
@@ -80,3 +82,79 @@ def show_trace_option(logging_mod=None, **kwargs):
         return click.option(*names, callback=_set_show_trace, **kwargs)(f)
 
     return decorator
+
+
+def trace_api_option(**kwargs):
+    """A decorator that add --trace-api option to decorated command.
+    Summary of api calls made by the command is printed at exit"""
+
+    names = ["--trace-api"]
+    kwargs.setdefault("is_flag", True)
+    kwargs.setdefault("default", False)
+    kwargs.setdefault("expose_value", False)
+    kwargs.setdefault("help", "Print summary of api calls made by the command")
+    kwargs.setdefault("is_eager", True)
+
+    def decorator(f):
+        def _set_trace_api(ctx, param, value):
+            if not value:
+                return
+
+            call_stats = CallStatsAggregator()
+            add_call_listener(call_stats)
+            ctx.call_on_close(lambda: _print_api_summary(call_stats))
+
+        return click.option(*names, callback=_set_trace_api, **kwargs)(f)
+
+    return decorator
+
+
+def _print_api_summary(call_stats):
+    """prints per endpoint summary of api calls on stderr"""
+
+    summary = call_stats.get_summary()
+    if not summary:
+        click.echo("No api calls were made", err=True)
+        return
+
+    table = PrettyTable()
+    table.field_names = [
+        "METHOD",
+        "ENDPOINT",
+        "CALLS",
+        "ERRORS",
+        "CACHED",
+        "RETRIES",
+        "TOTAL (s)",
+        "AVG (ms)",
+        "MAX (ms)",
+        "SENT (KB)",
+        "RECEIVED (KB)",
+    ]
+    total_calls = 0
+    total_time = 0
+    for stats in summary:
+        total_calls += stats["calls"]
+        total_time += stats["total_time"]
+        table.add_row(
+            [
+                stats["method"],
+                stats["endpoint"],
+                stats["calls"],
+                stats["errors"],
+                stats["cached"],
+                stats["retries"],
+                "{:.2f}".format(stats["total_time"]),
+                "{:.1f}".format(stats["total_time"] * 1000 / stats["calls"]),
+                "{:.1f}".format(stats["max_time"] * 1000),
+                "{:.1f}".format(stats["bytes_out"] / 1024),
+                "{:.1f}".format(stats["bytes_in"] / 1024),
+            ]
+        )
+
+    table.align["ENDPOINT"] = "l"
+    click.echo(table, err=True)
+    click.echo(
+        "{} api calls, {:.2f}s spent in api calls".format(total_calls, total_time),
+        err=True,
+    )
@@ -16,7 +16,11 @@ from calm.dsl.config import get_context
 from calm.dsl.store import Cache
 
 from .version_validator import validate_version
-from .click_options import simple_verbosity_option, show_trace_option
+from .click_options import (
+    simple_verbosity_option,
+    show_trace_option,
+    trace_api_option,
+)
 from .utils import FeatureFlagGroup, highlight_text
 
 CONTEXT_SETTINGS = dict(help_option_names=["-h", "--help"])
@@ -28,6 +32,7 @@ LOG = get_logging_handle(__name__)
 @click.group(cls=FeatureFlagGroup, context_settings=CONTEXT_SETTINGS)
 @simple_verbosity_option(LOG)
 @show_trace_option(LOG)
+@trace_api_option()
 @click.option(
     "--config",
     "-c",
@@ -42,7 +47,7 @@ LOG = get_logging_handle(__name__)
     "sync",
     is_flag=True,
     default=False,
-    help="Update cache before running command",
+    help="Update cache (entities changed since last update) before running command",
 )
 @click.version_option("0.1")
 @click.pass_context
@@ -76,7 +81,7 @@ def main(ctx, config_file, sync):
         ContextObj = get_context()
         ContextObj.update_config_file_context(config_file=config_file)
     if sync:
-        Cache.sync()
+        Cache.sync(delta=True)
 
 
 @main.group(cls=FeatureFlagGroup)
@@ -458,6 +463,12 @@ def calm_import():
     pass
 
 
+@main.group("export", cls=FeatureFlagGroup)
+def calm_export():
+    """Export entities from Calm DSL"""
+    pass
+
+
 @get.group("library")
 def library_get():
     """Get Library entities"""
@@ -571,7 +571,7 @@ def describe_project(project_name, out):
 def delete_project(project_names, no_cache_update=False):
 
     client = get_api_client()
-    project_name_uuid_map = client.project.get_name_uuid_map()
+    project_name_uuid_map = client.project.get_names_uuid_map(project_names)
     deleted_projects_uuids = []
     for project_name in project_names:
         project_id = project_name_uuid_map.get(project_name, "")
@@ -878,13 +878,13 @@ def update_project_using_cli_switches(
         else:
             acp_remove_group_list.append(group["name"])
 
-    user_name_uuid_map = client.user.get_name_uuid_map({"length": 1000})
+    user_name_uuid_map = client.user.get_names_uuid_map(add_user_list)
     for user in add_user_list:
         updated_user_reference_list.append(
             {"kind": "user", "name": user, "uuid": user_name_uuid_map[user]}
         )
 
-    usergroup_name_uuid_map = client.group.get_name_uuid_map({"length": 1000})
+    usergroup_name_uuid_map = client.group.get_names_uuid_map(add_group_list)
     for group in add_group_list:
         updated_group_reference_list.append(
             {
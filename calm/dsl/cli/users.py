@@ -93,10 +93,9 @@ def create_user(name, directory_service):
 
     client = get_api_client()
 
-    params = {"length": 1000}
-    user_name_uuid_map = client.user.get_name_uuid_map(params)
+    user_name_uuid_map = client.user.get_names_uuid_map([name])
 
-    if user_name_uuid_map.get("name"):
+    if user_name_uuid_map.get(name):
         LOG.error("User with name {} already exists".format(name))
         sys.exit(-1)
 
@@ -145,8 +144,7 @@ def create_user(name, directory_service):
 def delete_user(user_names):
 
     client = get_api_client()
-    params = {"length": 1000}
-    user_name_uuid_map = client.user.get_name_uuid_map(params)
+    user_name_uuid_map = client.user.get_names_uuid_map(user_names)
 
     deleted_user_uuids = []
     for name in user_names:
@@ -63,6 +63,15 @@ class ConfigFileParser:
         else:
             return {}
 
+    def get_connection_config(self):
+        """returns connection config"""
+
+        if "CONNECTION" in self._CONFIG:
+            return self._CONFIG["CONNECTION"]
+
+        else:
+            return {}
+
 
 class ConfigHandle:
     def __init__(self, config_file=None):
@@ -78,6 +87,7 @@ class ConfigHandle:
         self.project_config = config_obj.get_project_config()
         self.log_config = config_obj.get_log_config()
         self.categories_config = config_obj.get_categories_config()
+        self.connection_config = config_obj.get_connection_config()
 
     def get_server_config(self):
         """returns server configuration"""
@@ -99,6 +109,11 @@ class ConfigHandle:
 
         return self.categories_config
 
+    def get_connection_config(self):
+        """returns connection configuration"""
+
+        return self.connection_config
+
     @classmethod
     def get_init_config(cls):
 
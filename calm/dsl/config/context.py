@@ -26,11 +26,13 @@ class Context:
         self.project_config = config_handle.get_project_config()
         self.log_config = config_handle.get_log_config()
         self.categories_config = config_handle.get_categories_config()
+        self.connection_config = config_handle.get_connection_config()
 
         # Override with env data
         self.server_config.update(EnvConfig.get_server_config())
         self.project_config.update(EnvConfig.get_project_config())
         self.log_config.update(EnvConfig.get_log_config())
+        self.connection_config.update(EnvConfig.get_connection_config())
 
         init_config = config_handle.get_init_config()
         self._CONFIG_FILE = init_config["CONFIG"]["location"]
@@ -117,6 +119,11 @@ class Context:
 
         return self.categories_config
 
+    def get_connection_config(self):
+        """returns connection configuration"""
+
+        return self.connection_config
+
     def get_init_config(self):
         """returns init configuration"""
 
@@ -139,6 +146,7 @@ class Context:
         self.server_config.update(cxt_config_handle.get_server_config())
         self.project_config.update(cxt_config_handle.get_project_config())
         self.log_config.update(cxt_config_handle.get_log_config())
+        self.connection_config.update(cxt_config_handle.get_connection_config())
 
         if cxt_config_handle.get_categories_config():
             self.categories_config = cxt_config_handle.get_categories_config()
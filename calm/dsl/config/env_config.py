@@ -13,6 +13,14 @@ class EnvConfig:
     local_dir_location = os.environ.get("CALM_DSL_LOCAL_DIR_LOCATION") or ""
     db_location = os.environ.get("CALM_DSL_DB_LOCATION")
 
+    response_cache_ttl = os.environ.get("CALM_DSL_RESPONSE_CACHE_TTL") or ""
+    response_cache_size = os.environ.get("CALM_DSL_RESPONSE_CACHE_SIZE") or ""
+    request_compression_threshold = (
+        os.environ.get("CALM_DSL_REQUEST_COMPRESSION_THRESHOLD") or ""
+    )
+    max_request_rate = os.environ.get("CALM_DSL_MAX_REQUEST_RATE") or ""
+    session_cache_ttl = os.environ.get("CALM_DSL_SESSION_CACHE_TTL") or ""
+
     @classmethod
     def get_server_config(cls):
 
@@ -49,6 +57,27 @@ class EnvConfig:
 
         return config
 
+    @classmethod
+    def get_connection_config(cls):
+
+        config = {}
+        if cls.response_cache_ttl:
+            config["response_cache_ttl"] = cls.response_cache_ttl
+
+        if cls.response_cache_size:
+            config["response_cache_size"] = cls.response_cache_size
+
+        if cls.request_compression_threshold:
+            config["request_compression_threshold"] = cls.request_compression_threshold
+
+        if cls.max_request_rate:
+            config["max_request_rate"] = cls.max_request_rate
+
+        if cls.session_cache_ttl:
+            config["session_cache_ttl"] = cls.session_cache_ttl
+
+        return config
+
     @classmethod
     def get_init_config(cls):
 
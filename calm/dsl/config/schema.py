@@ -11,6 +11,13 @@ config_schema_dict = {
     Optional("PROJECT"): {Optional("name"): And(Use(str))},
     Optional("LOG"): {Optional("level"): And(Use(str))},
     Optional("CATEGORIES"): {},
+    Optional("CONNECTION"): {
+        Optional("response_cache_ttl"): And(Use(int)),
+        Optional("response_cache_size"): And(Use(int)),
+        Optional("request_compression_threshold"): And(Use(int)),
+        Optional("max_request_rate"): And(Use(float)),
+        Optional("session_cache_ttl"): And(Use(int)),
+    },
 }
 
 
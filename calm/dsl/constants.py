@@ -19,6 +19,10 @@ class CACHE:
         AHV_NETWORK_FUNCTION_CHAIN = "ahv_network_function_chain"
         ENVIRONMENT = "environment"
 
+    # Entities updated these many seconds before the last sync are listed again
+    # by delta sync, to cover clock difference between client and server
+    DELTA_SYNC_CLOCK_SKEW = 300
+
 
 PROVIDER_ACCOUNT_TYPE_MAP = {
     "AWS_VM": "aws",
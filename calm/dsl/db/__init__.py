@@ -1,3 +1,3 @@
-from .handler import get_db_handle, init_db_handle
+from .handler import get_db_handle, init_db_handle, init_cache_db_handle
 
-__all__ = ["get_db_handle", "init_db_handle"]
+__all__ = ["get_db_handle", "init_db_handle", "init_cache_db_handle"]
@@ -1,18 +1,61 @@
 import atexit
 import os
+import re
 
 from calm.dsl.config import get_context
-from .table_config import dsl_database, SecretTable, DataTable, VersionTable
+from .table_config import dsl_database, dsl_cache_database
+from .table_config import SecretTable, DataTable, VersionTable
+from .table_config import CacheSyncTable
 from .table_config import CacheTableBase
 from calm.dsl.log import get_logging_handle
 
 LOG = get_logging_handle(__name__)
 
+# Pragmas applied on every connection to local database. WAL journal lets
+# readers run alongside a writer, and with it NORMAL sync is still durable
+# against application crashes (only commits of last moments can be lost on
+# power failure). Negative cache_size is in KiB.
+DB_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "cache_size": -16 * 1024,
+    "mmap_size": 64 * 1024 * 1024,
+    "temp_store": "memory",
+}
+
+# Version of db schema, stored as sqlite user_version. Bump it when existing
+# db files need a migration (see Database.migrate)
+DB_SCHEMA_VERSION = 2
+
+
+def get_server_namespace():
+    """returns identity (host, port) of the server in context. Cache of each
+    server is kept in its own db"""
+
+    server_config = get_context().server_config
+    return (server_config.get("pc_ip") or "", str(server_config.get("pc_port") or ""))
+
+
+def get_cache_db_location(db_location, namespace):
+    """returns location of cache db of the server namespace, next to local db"""
+
+    host, port = namespace
+    if host:
+        suffix = re.sub(r"[^A-Za-z0-9.-]", "_", "{}_{}".format(host, port))
+    else:
+        suffix = "default"
+
+    root, ext = os.path.splitext(db_location)
+    return "{}-cache-{}{}".format(root, suffix, ext or ".db")
+
 
 class Database:
-    """DSL database connection"""
+    """DSL database connection. Server specific data (cache) is stored in a
+    separate db for each server"""
 
     db = None
+    cache_db = None
+    cache_namespace = None
     registered_tables = []
 
     @classmethod
@@ -20,30 +63,85 @@ class Database:
         cls.db = db_instance
 
     @staticmethod
-    def instantiate_db():
+    def get_db_location():
         ContextObj = get_context()
         init_obj = ContextObj.get_init_config()
-        db_location = init_obj["DB"]["location"]
-        dsl_database.init(db_location)
+        return init_obj["DB"]["location"]
+
+    @staticmethod
+    def instantiate_db():
+        db_location = Database.get_db_location()
+        dsl_database.init(db_location, pragmas=DB_PRAGMAS)
         return dsl_database
 
+    def instantiate_cache_db(self, namespace):
+        cache_db_location = get_cache_db_location(self.get_db_location(), namespace)
+        LOG.debug("Using cache db {}".format(cache_db_location))
+        dsl_cache_database.init(cache_db_location, pragmas=DB_PRAGMAS)
+        self.cache_db = dsl_cache_database
+        self.cache_namespace = namespace
+
     def __init__(self):
         self.update_db(self.instantiate_db())
+        self.instantiate_cache_db(get_server_namespace())
         self.connect()
         self.secret_table = self.set_and_verify(SecretTable)
         self.data_table = self.set_and_verify(DataTable)
+        self.set_cache_tables()
+        self.migrate()
+
+    def set_cache_tables(self):
+        """verifies tables of cache db"""
+
         self.version_table = self.set_and_verify(VersionTable)
+        self.cache_sync_table = self.set_and_verify(CacheSyncTable)
 
         for table_type, table in CacheTableBase.tables.items():
             setattr(self, table_type, self.set_and_verify(table))
 
+    def switch_cache_db(self, namespace):
+        """routes cache tables to the db of server namespace"""
+
+        LOG.debug("Switching cache db to server {}:{}".format(*namespace))
+        if not self.cache_db.is_closed():
+            self.cache_db.close()
+
+        self.instantiate_cache_db(namespace)
+        self.cache_db.connect()
+        self.set_cache_tables()
+        self.migrate_db(self.cache_db)
+
+    def reset_cache_db(self):
+        """removes cache db file of current server and recreates its tables.
+        Local db (secrets etc.) is left untouched"""
+
+        namespace = self.cache_namespace
+        if not self.cache_db.is_closed():
+            self.cache_db.close()
+
+        cache_db_location = self.cache_db.database
+        LOG.debug("Removing cache db {}".format(cache_db_location))
+        for location in [
+            cache_db_location,
+            cache_db_location + "-wal",
+            cache_db_location + "-shm",
+        ]:
+            if os.path.exists(location):
+                os.remove(location)
+
+        self.instantiate_cache_db(namespace)
+        self.cache_db.connect()
+        self.set_cache_tables()
+        self.migrate_db(self.cache_db)
+
     def set_and_verify(self, table_cls):
         """Verify whether this class exists in db
         If not, then creates one
         """
 
-        if not self.db.table_exists((table_cls.__name__).lower()):
-            self.db.create_tables([table_cls])
+        table_db = table_cls._meta.database
+        if not table_db.table_exists((table_cls.__name__).lower()):
+            table_db.create_tables([table_cls])
 
         # Register table to class
         if table_cls not in self.registered_tables:
@@ -51,6 +149,48 @@ class Database:
 
         return table_cls
 
+    def migrate(self):
+        """upgrades db files created by older versions of dsl"""
+
+        self.migrate_db(self.db)
+        self.migrate_db(self.cache_db)
+
+    def migrate_db(self, db):
+        """upgrades the db file to DB_SCHEMA_VERSION"""
+
+        db_version = db.pragma("user_version")
+        if db_version >= DB_SCHEMA_VERSION:
+            return
+
+        LOG.debug(
+            "Migrating local DB {} from version {} to {}".format(
+                db.database, db_version, DB_SCHEMA_VERSION
+            )
+        )
+        db_tables = [
+            table_cls
+            for table_cls in self.registered_tables
+            if table_cls._meta.database is db
+        ]
+        with db.atomic():
+
+            # Version 1: Indexes on columns used by cache table lookups
+            if db_version < 1:
+                for table_cls in db_tables:
+                    table_cls._schema.create_indexes(safe=True)
+
+            # Version 2: Cache tables moved to per server cache db
+            if db_version < 2 and db is self.db:
+                for table_cls in self.registered_tables:
+                    if table_cls._meta.database is self.cache_db:
+                        db.execute_sql(
+                            'DROP TABLE IF EXISTS "{}"'.format(
+                                table_cls._meta.table_name
+                            )
+                        )
+
+            db.pragma("user_version", DB_SCHEMA_VERSION)
+
     def is_closed(self):
         """return True if db connection is closed else False"""
 
@@ -64,24 +204,31 @@ class Database:
 
         LOG.debug("Connecting to local DB")
         self.db.connect()
+        self.cache_db.connect()
         atexit.register(self.close)
 
     def close(self):
 
         LOG.debug("Closing connection to local DB")
         self.db.close()
+        self.cache_db.close()
 
 
 _Database = None
 
 
 def get_db_handle():
-    """Returns the db handle"""
+    """Returns the db handle, with cache tables routed to server in context"""
 
     global _Database
     if not _Database:
         _Database = Database()
 
+    else:
+        namespace = get_server_namespace()
+        if namespace != _Database.cache_namespace:
+            _Database.switch_cache_db(namespace)
+
     return _Database
 
 
@@ -102,12 +249,23 @@ def init_db_handle():
     except:  # noqa
         pass
 
-    # Removing existing db at init location if exists
+    # Removing existing db and cache db of server at init location if exists
     ContextObj = get_context()
     init_obj = ContextObj.get_init_config()
     db_location = init_obj["DB"]["location"]
-    if os.path.exists(db_location):
-        os.remove(db_location)
+    cache_db_location = get_cache_db_location(db_location, get_server_namespace())
+    for _location in [db_location, cache_db_location]:
+        for location in [_location, _location + "-wal", _location + "-shm"]:
+            if os.path.exists(location):
+                os.remove(location)
 
     # Initialize new database object
     _Database = Database()
+
+
+def init_cache_db_handle():
+    """Recreates cache db of the server in context, keeping the local db"""
+
+    db = get_db_handle()
+    db.reset_cache_db()
+    return db
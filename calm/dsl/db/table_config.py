@@ -15,6 +15,9 @@ import click
 import arrow
 import json
 import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from prettytable import PrettyTable
 
 from calm.dsl.api import get_resource_api, get_api_client
@@ -26,12 +29,20 @@ LOG = get_logging_handle(__name__)
 # Proxy database
 dsl_database = SqliteDatabase(None)
 
+# Proxy database of server specific data (cache), initialized per server
+dsl_cache_database = SqliteDatabase(None)
+
 
 class BaseModel(Model):
     class Meta:
         database = dsl_database
 
 
+class CacheBaseModel(BaseModel):
+    class Meta:
+        database = dsl_cache_database
+
+
 class SecretTable(BaseModel):
     name = CharField(primary_key=True)
     uuid = CharField()
@@ -59,9 +70,44 @@ class DataTable(BaseModel):
         return (self.kdf_salt, self.ciphertext, self.iv, self.auth_tag)
 
 
-class CacheTableBase(BaseModel):
+class CacheSyncTable(CacheBaseModel):
+    """Stores the time of last successful sync of each cache table"""
+
+    cache_type = CharField(primary_key=True)
+    last_sync_time = DateTimeField()
+
+    def get_detail_dict(self):
+        return {"cache_type": self.cache_type, "last_sync_time": self.last_sync_time}
+
+    @classmethod
+    def get_last_sync_time(cls, cache_type):
+        """returns utc time of last sync of cache table, None if never synced"""
+
+        try:
+            return cls.get(cls.cache_type == cache_type).last_sync_time
+        except DoesNotExist:
+            return None
+
+    @classmethod
+    def set_last_sync_time(cls, cache_type, last_sync_time):
+        cls.replace(cache_type=cache_type, last_sync_time=last_sync_time).execute()
+
+
+class CacheTableBase(CacheBaseModel):
     tables = {}
 
+    # Max number of uuids used in a single "IN" query and rows inserted by a
+    # single query (sqlite allows 999 variables in a query)
+    DELETE_BATCH_SIZE = 500
+    INSERT_BATCH_SIZE = 100
+
+    # Tables skipping some of the listed entities (get_entity_rows returning
+    # no rows) can't detect deleted entities by comparing entity counts
+    stores_all_entities = True
+
+    # Number of entities listed per page while syncing the table
+    SYNC_PAGE_SIZE = 250
+
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
 
@@ -100,9 +146,8 @@ class CacheTableBase(BaseModel):
     @classmethod
     def clear(cls):
         """removes entire data from table"""
-        raise NotImplementedError(
-            "clear helper not implemented for {} table".format(cls.get_cache_type())
-        )
+
+        cls.delete().execute()
 
     @classmethod
     def show_data(cls):
@@ -110,12 +155,297 @@ class CacheTableBase(BaseModel):
             "show_data helper not implemented for {} table".format(cls.get_cache_type())
         )
 
+    @classmethod
+    def fetch_rows(cls):
+        """yields rows (dict of column values) of all entities of table, fetched from server"""
+
+        if cls.get_sync_api() is None:
+            raise NotImplementedError(
+                "fetch_rows helper not implemented for {} table".format(
+                    cls.get_cache_type()
+                )
+            )
+
+        context = cls.get_sync_context()
+        for entity in cls.iter_entities():
+            yield from cls.get_entity_rows(entity, context)
+
+    @classmethod
+    def iter_entities(cls, filter_query=None):
+        """yields entities of table listed from server page by page (of
+        SYNC_PAGE_SIZE entities), so only the page being processed is held in
+        memory. Uses sync filter of table, if filter_query is not given"""
+
+        if filter_query is None:
+            filter_query = cls.get_sync_filter()
+
+        base_params = {"filter": filter_query} if filter_query else None
+        return cls.get_sync_api().iter_all(
+            api_limit=cls.SYNC_PAGE_SIZE, base_params=base_params
+        )
+
+    @classmethod
+    def get_ntnx_pc_account_uuids(cls):
+        """returns uuids of verified nutanix_pc accounts"""
+
+        client = get_api_client()
+        accounts = client.account.iter_all(
+            api_limit=cls.SYNC_PAGE_SIZE,
+            base_params={"filter": "state==VERIFIED;type==nutanix_pc"},
+        )
+        return [entity["metadata"]["uuid"] for entity in accounts]
+
     @classmethod
     def sync(cls):
+        """sync the table from server"""
+
+        cls.refresh()
+
+    @classmethod
+    def get_sync_api(cls):
+        """returns ResourceAPI object listing the entities stored in table.
+        Tables not having one are always synced fully"""
+
+        return None
+
+    @classmethod
+    def get_sync_filter(cls):
+        """returns filter applied to entities listed for the table"""
+
+        return ""
+
+    @classmethod
+    def get_sync_context(cls):
+        """returns data shared by get_entity_rows calls of a sync"""
+
+        return {}
+
+    @classmethod
+    def get_entity_rows(cls, entity, context):
+        """returns list of rows (dict of column values) for the entity listed from server"""
+
         raise NotImplementedError(
-            "sync helper not implemented for {} table".format(cls.get_cache_type())
+            "get_entity_rows helper not implemented for {} table".format(
+                cls.get_cache_type()
+            )
         )
 
+    @classmethod
+    def refresh(cls, delta=False):
+        """syncs the table and records the sync time.
+
+        Args:
+            delta (bool): sync only entities changed since last sync. Falls
+                back to full sync if table/server doesn't support it
+        """
+
+        cls.write_changes(cls.fetch_changes(cls.get_sync_state(delta)))
+
+    @classmethod
+    def get_sync_state(cls, delta=False):
+        """returns table data needed by fetch_changes. It is read before
+        fetching, so that fetch_changes doesn't query the db"""
+
+        sync_state = {"delta": delta, "last_sync_time": None, "local_uuids": set()}
+        if delta:
+            sync_state["last_sync_time"] = CacheSyncTable.get_last_sync_time(
+                cls.get_cache_type()
+            )
+            sync_state["local_uuids"] = set(row.uuid for row in cls.select(cls.uuid))
+
+        return sync_state
+
+    @classmethod
+    def fetch_changes(cls, sync_state):
+        """fetches the changes to be written to table from server. Neither it
+        nor iterating the returned rows makes db queries, so changes of
+        multiple tables can be fetched concurrently (versions needed by it are
+        served by Version.use_sync_versions).
+
+        Args:
+            sync_state (dict): table data returned by get_sync_state
+        Returns:
+            (dict): rows to be created, uuids of entities whose rows are
+                replaced/deleted, and whether table is replaced entirely (full).
+                Rows of full sync are a generator listing entities page by
+                page, so they are never held in memory at once
+        """
+
+        sync_time = datetime.datetime.utcnow()
+        changes = None
+        if sync_state["delta"]:
+            changes = cls.fetch_delta_changes(sync_state)
+
+        if changes is None:
+            changes = {"full": True, "rows": cls.fetch_rows(), "deleted_uuids": set()}
+
+        changes["sync_time"] = sync_time
+        return changes
+
+    @classmethod
+    def write_changes(cls, changes):
+        """writes the changes returned by fetch_changes to table in a single
+        transaction. Returns number of rows inserted"""
+
+        with dsl_cache_database.atomic():
+            cls.delete_changed_rows(changes)
+            row_count = cls.insert_rows(changes["rows"])
+            CacheSyncTable.set_last_sync_time(
+                cls.get_cache_type(), changes["sync_time"]
+            )
+
+        return row_count
+
+    @classmethod
+    def delete_changed_rows(cls, changes):
+        """deletes the rows replaced by changes returned by fetch_changes"""
+
+        if changes["full"]:
+            cls.clear()
+        else:
+            cls.delete_rows(changes["deleted_uuids"])
+
+    @classmethod
+    def insert_rows(cls, rows):
+        """inserts rows (iterable of dicts having column values) in batches.
+        Returns number of rows inserted"""
+
+        row_count = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == cls.INSERT_BATCH_SIZE:
+                cls.insert_many(batch).execute()
+                row_count += len(batch)
+                batch = []
+
+        if batch:
+            cls.insert_many(batch).execute()
+            row_count += len(batch)
+
+        return row_count
+
+    @classmethod
+    def fetch_delta_changes(cls, sync_state):
+        """returns changes of entities updated/deleted since last sync. Returns
+        None if table can't be synced incrementally"""
+
+        sync_api = cls.get_sync_api()
+        last_sync_time = sync_state["last_sync_time"]
+        if sync_api is None or last_sync_time is None:
+            return None
+
+        since = last_sync_time - datetime.timedelta(seconds=CACHE.DELTA_SYNC_CLOCK_SKEW)
+        base_filter = cls.get_sync_filter()
+        filter_query = "last_update_time=ge={}".format(
+            since.strftime("%Y-%m-%dT%H:%M:%SZ")
+        )
+        if base_filter:
+            filter_query = "{};{}".format(base_filter, filter_query)
+
+        entities, err = sync_api.list_all(
+            api_limit=cls.SYNC_PAGE_SIZE,
+            base_params={"filter": filter_query},
+            ignore_error=True,
+        )
+        if err:
+            LOG.debug(
+                "Failed to list updated entities for {} table, syncing it fully".format(
+                    cls.get_cache_type()
+                )
+            )
+            return None
+
+        rows = []
+        updated_uuids = set()
+        if entities:
+            context = cls.get_sync_context()
+            for entity in entities:
+                updated_uuids.add(entity["metadata"]["uuid"])
+                rows.extend(cls.get_entity_rows(entity, context))
+
+        LOG.debug(
+            "{} entities updated since {} in {} table".format(
+                len(updated_uuids), since, cls.get_cache_type()
+            )
+        )
+        deleted_uuids = cls.get_deleted_uuids(
+            sync_api, base_filter, sync_state["local_uuids"] | updated_uuids
+        )
+        return {
+            "full": False,
+            "rows": rows,
+            "deleted_uuids": updated_uuids | deleted_uuids,
+        }
+
+    @classmethod
+    def get_deleted_uuids(cls, sync_api, base_filter, local_uuids):
+        """returns uuids of table entities deleted from server
+
+        Args:
+            local_uuids (set): uuids of entities in table after applying the
+                updated entities
+        """
+
+        # Table having every listed entity hasn't lost any, if counts are same
+        if cls.stores_all_entities and sync_api.get_total_matches(base_filter) == len(
+            local_uuids
+        ):
+            return set()
+
+        return local_uuids - sync_api.list_uuids(
+            base_filter, api_limit=cls.SYNC_PAGE_SIZE
+        )
+
+    @classmethod
+    def delete_rows(cls, uuids):
+        """removes rows of entities from table"""
+
+        uuids = list(uuids)
+        for i in range(0, len(uuids), cls.DELETE_BATCH_SIZE):
+            cls.delete().where(
+                cls.uuid.in_(uuids[i : i + cls.DELETE_BATCH_SIZE])
+            ).execute()
+
+    @classmethod
+    def get_name_filter(cls, name):
+        """returns filter listing entities having the name. Names having FIQL
+        reserved characters can't be filtered, so all entities are listed"""
+
+        if any(c in name for c in ",;()"):
+            return ""
+
+        return "name=={}".format(name)
+
+    @classmethod
+    def fetch_entity_rows(cls, name, **kwargs):
+        """fetches rows of entities having the name from server. Returns None
+        if table can't fetch entities by name"""
+
+        sync_api = cls.get_sync_api()
+        if sync_api is None:
+            return None
+
+        filter_query = ";".join(
+            [_f for _f in [cls.get_sync_filter(), cls.get_name_filter(name)] if _f]
+        )
+
+        rows = []
+        context = cls.get_sync_context()
+        for entity in cls.iter_entities(filter_query):
+            rows.extend(cls.get_entity_rows(entity, context))
+
+        # Server matches names as patterns
+        return [row for row in rows if row["name"] == name]
+
+    @classmethod
+    def write_rows(cls, rows):
+        """replaces rows of entities in table in a single transaction"""
+
+        with dsl_cache_database.atomic():
+            cls.delete_rows(set(row["uuid"] for row in rows))
+            return cls.insert_rows(rows)
+
     @classmethod
     def create_entry(cls, name, uuid, **kwargs):
         raise NotImplementedError(
@@ -169,11 +499,87 @@ class CacheTableBase(BaseModel):
         )
 
 
+class AhvAccountSubnets:
+    """Subnets of nutanix_pc accounts fetched from server. Subnets of an account
+    are fetched once for all tables needing them (subnet and project tables
+    during a sync, project fetch_one calls) and reused for TTL seconds"""
+
+    TTL = 60
+    MAX_WORKERS = 8
+
+    # account_uuid -> (fetch start time, Future of subnet entities)
+    _fetches = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, account_uuids):
+        """returns map of account uuid to list of its subnet entities (None if
+        they can't be fetched). Accounts are fetched concurrently, and
+        accounts being fetched by other threads are waited for"""
+
+        now = time.time()
+        futures = {}
+        pending = []
+        with cls._lock:
+            for account_uuid in account_uuids:
+                fetch = cls._fetches.get(account_uuid)
+                if fetch and (now - fetch[0]) < cls.TTL:
+                    futures[account_uuid] = fetch[1]
+                    continue
+
+                future = Future()
+                cls._fetches[account_uuid] = (now, future)
+                futures[account_uuid] = future
+                pending.append(account_uuid)
+
+        if pending:
+            max_workers = min(cls.MAX_WORKERS, len(pending))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for account_uuid in pending:
+                    executor.submit(cls._fetch, account_uuid, futures[account_uuid])
+
+        return {
+            account_uuid: future.result() for account_uuid, future in futures.items()
+        }
+
+    @classmethod
+    def _fetch(cls, account_uuid, future):
+        LOG.debug(
+            "Fetching subnets for nutanix_pc account_uuid {}".format(account_uuid)
+        )
+        try:
+            AhvVmProvider = CacheTableBase.get_provider_plugin("AHV_VM")
+            AhvObj = AhvVmProvider.get_api_obj()
+            entities = AhvObj.subnets(account_uuid=account_uuid)["entities"]
+        except Exception as exp:
+            LOG.debug(exp)
+            LOG.warning(
+                "Unable to fetch subnets for Nutanix_PC Account(uuid={})".format(
+                    account_uuid
+                )
+            )
+            entities = None
+
+            # Failed fetches are not reused
+            with cls._lock:
+                if cls._fetches.get(account_uuid, (None, None))[1] is future:
+                    cls._fetches.pop(account_uuid)
+
+        future.set_result(entities)
+
+    @classmethod
+    def clear(cls):
+        """drops fetched subnets, so that next calls fetch them again"""
+
+        with cls._lock:
+            cls._fetches.clear()
+
+
 class AhvSubnetsCache(CacheTableBase):
     __cache_type__ = CACHE.ENTITY.AHV_SUBNET
     feature_min_version = "2.7.0"
     name = CharField()
-    uuid = CharField()
+    uuid = CharField(index=True)
     cluster = CharField()
     account_uuid = CharField(default="")
     cluster_uuid = CharField(
@@ -191,12 +597,6 @@ class AhvSubnetsCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -230,50 +630,76 @@ class AhvSubnetsCache(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def sync(cls):
-        """sync the table from server"""
+    def get_entity_rows(cls, entity, context):
+        cluster_ref = entity["status"].get("cluster_reference", {})
+        if not cluster_ref:
+            return []
 
-        # clear old data
-        cls.clear()
+        return [
+            dict(
+                name=entity["status"]["name"],
+                uuid=entity["metadata"]["uuid"],
+                cluster=cluster_ref.get("name", ""),
+                account_uuid=context["account_uuid"],
+                cluster_uuid=cluster_ref.get("uuid", ""),
+            )
+        ]
 
-        client = get_api_client()
-        payload = {"length": 250, "filter": "state==VERIFIED;type==nutanix_pc"}
-        account_name_uuid_map = client.account.get_name_uuid_map(payload)
+    @classmethod
+    def fetch_account_rows(cls, account_uuid, filter_query=""):
+        """returns rows of subnets of the account. None if they can't be fetched"""
 
         AhvVmProvider = cls.get_provider_plugin("AHV_VM")
         AhvObj = AhvVmProvider.get_api_obj()
 
-        for _, e_uuid in account_name_uuid_map.items():
-            try:
-                res = AhvObj.subnets(account_uuid=e_uuid)
-            except Exception:
-                LOG.warning(
-                    "Unable to fetch subnets for Nutanix_PC Account(uuid={})".format(
-                        e_uuid
-                    )
+        try:
+            res = AhvObj.subnets(account_uuid=account_uuid, filter_query=filter_query)
+        except Exception:
+            LOG.warning(
+                "Unable to fetch subnets for Nutanix_PC Account(uuid={})".format(
+                    account_uuid
                 )
-                continue
+            )
+            return None
 
-            for entity in res.get("entities", []):
-                name = entity["status"]["name"]
-                uuid = entity["metadata"]["uuid"]
-                cluster_ref = entity["status"].get("cluster_reference", {})
-                if not cluster_ref:
-                    continue
-                cluster_name = cluster_ref.get("name", "")
-                cluster_uuid = cluster_ref.get("uuid", "")
-
-                cls.create_entry(
-                    name=name,
-                    uuid=uuid,
-                    cluster=cluster_name,
-                    account_uuid=e_uuid,
-                    cluster_uuid=cluster_uuid,
-                )
+        rows = []
+        context = {"account_uuid": account_uuid}
+        for entity in res.get("entities", []):
+            rows.extend(cls.get_entity_rows(entity, context))
+        return rows
+
+    @classmethod
+    def fetch_rows(cls):
+        """yields rows of the table entities, fetched from server"""
+
+        account_subnets = AhvAccountSubnets.get(cls.get_ntnx_pc_account_uuids())
+        for e_uuid, entities in account_subnets.items():
+            context = {"account_uuid": e_uuid}
+            for entity in entities or []:
+                yield from cls.get_entity_rows(entity, context)
 
         # For older version < 2.9.0
         # Add working for older versions too
 
+    @classmethod
+    def fetch_entity_rows(cls, name, **kwargs):
+        """fetches rows of subnets having the name from server"""
+
+        account_uuid = kwargs.get("account_uuid", "")
+        account_uuids = (
+            [account_uuid] if account_uuid else cls.get_ntnx_pc_account_uuids()
+        )
+
+        rows = []
+        for e_uuid in account_uuids:
+            rows.extend(
+                cls.fetch_account_rows(e_uuid, filter_query=cls.get_name_filter(name))
+                or []
+            )
+
+        # Server matches names as patterns
+        return [row for row in rows if row["name"] == name]
+
     @classmethod
     def create_entry(cls, name, uuid, **kwargs):
         account_uuid = kwargs.get("account_uuid", "")
@@ -332,8 +758,9 @@ class AhvSubnetsCache(CacheTableBase):
             return dict()
 
     class Meta:
-        database = dsl_database
+        database = dsl_cache_database
         primary_key = CompositeKey("name", "uuid", "account_uuid")
+        indexes = ((("name", "account_uuid", "cluster"), False),)
 
 
 class AhvImagesCache(CacheTableBase):
@@ -341,7 +768,7 @@ class AhvImagesCache(CacheTableBase):
     feature_min_version = "2.7.0"
     name = CharField()
     image_type = CharField()
-    uuid = CharField()
+    uuid = CharField(index=True)
     account_uuid = CharField()
     last_update_time = DateTimeField(default=datetime.datetime.now())
 
@@ -354,12 +781,6 @@ class AhvImagesCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -393,21 +814,32 @@ class AhvImagesCache(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def sync(cls):
-        """sync the table data from server"""
-        # clear old data
-        cls.clear()
-
-        client = get_api_client()
-        payload = {"length": 250, "filter": "state==VERIFIED;type==nutanix_pc"}
-        account_name_uuid_map = client.account.get_name_uuid_map(payload)
+    def fetch_rows(cls):
+        """yields rows of the table entities, fetched from server"""
 
         AhvVmProvider = cls.get_provider_plugin("AHV_VM")
         AhvObj = AhvVmProvider.get_api_obj()
+        images_api = get_resource_api(AhvObj.IMAGES, AhvObj.connection)
 
-        for _, e_uuid in account_name_uuid_map.items():
+        for e_uuid in cls.get_ntnx_pc_account_uuids():
+            # Rows of account are yielded only after all its pages are listed
+            rows = []
             try:
-                res = AhvObj.images(account_uuid=e_uuid)
+                for entity in images_api.iter_all(
+                    api_limit=cls.SYNC_PAGE_SIZE,
+                    base_params={"filter": "account_uuid=={}".format(e_uuid)},
+                ):
+                    # TODO add proper validation for karbon images
+                    rows.append(
+                        dict(
+                            name=entity["status"]["name"],
+                            uuid=entity["metadata"]["uuid"],
+                            image_type=entity["status"]["resources"].get(
+                                "image_type", ""
+                            ),
+                            account_uuid=e_uuid,
+                        )
+                    )
             except Exception:
                 LOG.warning(
                     "Unable to fetch images for Nutanix_PC Account(uuid={})".format(
@@ -416,14 +848,8 @@ class AhvImagesCache(CacheTableBase):
                 )
                 continue
 
-            for entity in res.get("entities", []):
-                name = entity["status"]["name"]
-                uuid = entity["metadata"]["uuid"]
-                # TODO add proper validation for karbon images
-                image_type = entity["status"]["resources"].get("image_type", "")
-                cls.create_entry(
-                    name=name, uuid=uuid, image_type=image_type, account_uuid=e_uuid
-                )
+            for row in rows:
+                yield row
 
     @classmethod
     def create_entry(cls, name, uuid, **kwargs):
@@ -478,15 +904,16 @@ class AhvImagesCache(CacheTableBase):
             return dict()
 
     class Meta:
-        database = dsl_database
+        database = dsl_cache_database
         primary_key = CompositeKey("name", "uuid", "account_uuid")
+        indexes = ((("name", "account_uuid", "image_type"), False),)
 
 
 class AccountCache(CacheTableBase):
     __cache_type__ = CACHE.ENTITY.ACCOUNT
     feature_min_version = "2.7.0"
     name = CharField()
-    uuid = CharField()
+    uuid = CharField(index=True)
     provider_type = CharField()
     state = CharField()
     is_host = BooleanField(default=False)  # Used for Ntnx accounts only
@@ -504,12 +931,6 @@ class AccountCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -557,55 +978,46 @@ class AccountCache(CacheTableBase):
         )
 
     @classmethod
-    def sync(cls):
-        """sync the table from server"""
-
-        # clear old data
-        cls.clear()
-
+    def get_sync_api(cls):
         client = get_api_client()
-        payload = {
-            "length": 250,
-            "filter": "(state==ACTIVE,state==VERIFIED)",
-        }
-        res, err = client.account.list(payload)
-        if err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
+        return client.account
 
-        res = res.json()
-        for entity in res.get("entities", []):
-            provider_type = entity["status"]["resources"]["type"]
-            data = {}
-            query_obj = {
-                "name": entity["status"]["name"],
-                "uuid": entity["metadata"]["uuid"],
-                "provider_type": entity["status"]["resources"]["type"],
-                "state": entity["status"]["resources"]["state"],
-            }
+    @classmethod
+    def get_sync_filter(cls):
+        return "(state==ACTIVE,state==VERIFIED)"
 
-            if provider_type == "nutanix_pc":
-                query_obj["is_host"] = entity["status"]["resources"]["data"]["host_pc"]
+    @classmethod
+    def get_entity_rows(cls, entity, context):
+        provider_type = entity["status"]["resources"]["type"]
+        data = {}
+        query_obj = {
+            "name": entity["status"]["name"],
+            "uuid": entity["metadata"]["uuid"],
+            "provider_type": entity["status"]["resources"]["type"],
+            "state": entity["status"]["resources"]["state"],
+        }
 
-                # store cluster accounts for PC account (Note it will store cluster name not account name)
-                for pe_acc in (
-                    entity["status"]["resources"]
-                    .get("data", {})
-                    .get("cluster_account_reference_list", [])
-                ):
-                    group = data.setdefault("clusters", {})
-                    group[pe_acc["uuid"]] = (
-                        pe_acc.get("resources", {})
-                        .get("data", {})
-                        .get("cluster_name", "")
-                    )
+        if provider_type == "nutanix_pc":
+            query_obj["is_host"] = entity["status"]["resources"]["data"]["host_pc"]
+
+            # store cluster accounts for PC account (Note it will store cluster name not account name)
+            for pe_acc in (
+                entity["status"]["resources"]
+                .get("data", {})
+                .get("cluster_account_reference_list", [])
+            ):
+                group = data.setdefault("clusters", {})
+                group[pe_acc["uuid"]] = (
+                    pe_acc.get("resources", {}).get("data", {}).get("cluster_name", "")
+                )
 
-            elif provider_type == "nutanix":
-                data["pc_account_uuid"] = entity["status"]["resources"]["data"][
-                    "pc_account_uuid"
-                ]
+        elif provider_type == "nutanix":
+            data["pc_account_uuid"] = entity["status"]["resources"]["data"][
+                "pc_account_uuid"
+            ]
 
-            query_obj["data"] = json.dumps(data)
-            cls.create_entry(**query_obj)
+        query_obj["data"] = json.dumps(data)
+        return [query_obj]
 
     @classmethod
     def get_entity_data(cls, name, **kwargs):
@@ -633,15 +1045,16 @@ class AccountCache(CacheTableBase):
             return dict()
 
     class Meta:
-        database = dsl_database
+        database = dsl_cache_database
         primary_key = CompositeKey("name", "uuid")
+        indexes = ((("name", "provider_type"), False),)
 
 
 class ProjectCache(CacheTableBase):
     __cache_type__ = CACHE.ENTITY.PROJECT
     feature_min_version = "2.7.0"
     name = CharField()
-    uuid = CharField()
+    uuid = CharField(index=True)
     accounts_data = CharField()
     whitelisted_subnets = CharField()
     last_update_time = DateTimeField(default=datetime.datetime.now())
@@ -655,12 +1068,6 @@ class ProjectCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -685,95 +1092,88 @@ class ProjectCache(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def sync(cls):
-        """sync the table data from server"""
-        # clear old data
-        cls.clear()
+    def get_sync_api(cls):
+        client = get_api_client()
+        return client.project
+
+    @classmethod
+    def get_sync_context(cls):
+        """returns account types and subnets of nutanix_pc accounts used by project rows"""
 
-        # update by latest data
         client = get_api_client()
 
-        payload = {"length": 200, "offset": 0, "filter": "state!=DELETED;type!=nutanix"}
+        payload = {
+            "length": cls.SYNC_PAGE_SIZE,
+            "filter": "state!=DELETED;type!=nutanix",
+        }
         account_uuid_type_map = client.account.get_uuid_type_map(payload)
 
         # store subnets for nutanix_pc accounts in some map, else we had to subnets api
         # for each project (Speed very low in case of ~1000 projects)
-        ntnx_pc_account_subnet_map = dict()
-        for _acct_uuid in account_uuid_type_map.keys():
-            if account_uuid_type_map[_acct_uuid] == "nutanix_pc":
-                ntnx_pc_account_subnet_map[_acct_uuid] = list()
-
-        # Get the subnets for each nutanix_pc account
-        AhvVmProvider = cls.get_provider_plugin("AHV_VM")
-        AhvObj = AhvVmProvider.get_api_obj()
-        for acct_uuid in ntnx_pc_account_subnet_map.keys():
-            LOG.debug(
-                "Fetching subnets for nutanix_pc account_uuid {}".format(acct_uuid)
-            )
-            try:
-                res = AhvObj.subnets(account_uuid=acct_uuid)
-            except Exception as exp:
-                LOG.exception(exp)
-                LOG.warning(
-                    "Unable to fetch subnets for Nutanix_PC Account(uuid={})".format(
-                        acct_uuid
-                    )
-                )
-                continue
+        ntnx_pc_account_uuids = [
+            _acct_uuid
+            for _acct_uuid, _acct_type in account_uuid_type_map.items()
+            if _acct_type == "nutanix_pc"
+        ]
+        ntnx_pc_account_subnet_map = {
+            _acct_uuid: [row["metadata"]["uuid"] for row in (entities or [])]
+            for _acct_uuid, entities in AhvAccountSubnets.get(
+                ntnx_pc_account_uuids
+            ).items()
+        }
 
-            for row in res["entities"]:
-                ntnx_pc_account_subnet_map[acct_uuid].append(row["metadata"]["uuid"])
+        return {
+            "account_uuid_type_map": account_uuid_type_map,
+            "ntnx_pc_account_subnet_map": ntnx_pc_account_subnet_map,
+        }
 
-        # Getting projects data
-        res_entities, err = client.project.list_all(ignore_error=True)
-        if err:
-            LOG.exception(err)
+    @classmethod
+    def get_entity_rows(cls, entity, context):
+        account_uuid_type_map = context["account_uuid_type_map"]
+        ntnx_pc_account_subnet_map = context["ntnx_pc_account_subnet_map"]
 
-        for entity in res_entities:
-            # populating a map to lookup the account to which a subnet belongs
-            whitelisted_subnets = dict()
+        # populating a map to lookup the account to which a subnet belongs
+        whitelisted_subnets = dict()
 
-            name = entity["status"]["name"]
-            uuid = entity["metadata"]["uuid"]
+        name = entity["status"]["name"]
+        uuid = entity["metadata"]["uuid"]
 
-            account_list = entity["status"]["resources"].get(
-                "account_reference_list", []
-            )
+        account_list = entity["status"]["resources"].get("account_reference_list", [])
 
-            project_subnets_ref_list = entity["spec"].get("resources", {}).get(
-                "external_network_list", []
-            ) + entity["spec"].get("resources", {}).get("subnet_reference_list", [])
-            project_subnet_uuids = [item["uuid"] for item in project_subnets_ref_list]
+        project_subnets_ref_list = entity["spec"].get("resources", {}).get(
+            "external_network_list", []
+        ) + entity["spec"].get("resources", {}).get("subnet_reference_list", [])
+        project_subnet_uuids = [item["uuid"] for item in project_subnets_ref_list]
 
-            account_map = {}
-            for account in account_list:
-                account_uuid = account["uuid"]
-                # As projects may have deleted accounts registered
-                if account_uuid not in account_uuid_type_map:
-                    continue
+        account_map = {}
+        for account in account_list:
+            account_uuid = account["uuid"]
+            # As projects may have deleted accounts registered
+            if account_uuid not in account_uuid_type_map:
+                continue
 
-                account_type = account_uuid_type_map[account_uuid]
+            account_type = account_uuid_type_map[account_uuid]
 
-                if not account_map.get(account_type):
-                    account_map[account_type] = []
+            if not account_map.get(account_type):
+                account_map[account_type] = []
 
-                account_map[account_type].append(account_uuid)
+            account_map[account_type].append(account_uuid)
 
-                # for PC accounts add subnets to subnet_to_account_map. Will use it to populate whitelisted_subnets
-                if account_type == "nutanix_pc":
-                    whitelisted_subnets[account_uuid] = list(
-                        set(project_subnet_uuids)
-                        & set(ntnx_pc_account_subnet_map[account_uuid])
-                    )
+            # for PC accounts add subnets to subnet_to_account_map. Will use it to populate whitelisted_subnets
+            if account_type == "nutanix_pc":
+                whitelisted_subnets[account_uuid] = list(
+                    set(project_subnet_uuids)
+                    & set(ntnx_pc_account_subnet_map[account_uuid])
+                )
 
-            accounts_data = json.dumps(account_map)
-            whitelisted_subnets = json.dumps(whitelisted_subnets)
-            cls.create_entry(
-                name=name,
-                uuid=uuid,
-                accounts_data=accounts_data,
-                whitelisted_subnets=whitelisted_subnets,
-            )
+        return [
+            {
+                "name": name,
+                "uuid": uuid,
+                "accounts_data": json.dumps(account_map),
+                "whitelisted_subnets": json.dumps(whitelisted_subnets),
+            }
+        ]
 
     @classmethod
     def create_entry(cls, name, uuid, **kwargs):
@@ -833,6 +1233,7 @@ class ProjectCache(CacheTableBase):
         # populating a map to lookup the account to which a subnet belongs
         whitelisted_subnets = dict()
         account_map = dict()
+        ntnx_pc_account_uuids = []
         for _acc in account_list:
             account_uuid = _acc["uuid"]
 
@@ -846,30 +1247,20 @@ class ProjectCache(CacheTableBase):
                 account_map[account_type].append(account_uuid)
 
             if account_type == "nutanix_pc":
-                AhvVmProvider = cls.get_provider_plugin("AHV_VM")
-                AhvObj = AhvVmProvider.get_api_obj()
+                ntnx_pc_account_uuids.append(account_uuid)
 
-                filter_query = "_entity_id_=={}".format("|".join(project_subnet_uuids))
-                LOG.debug(
-                    "fetching following subnets {} for nutanix_pc account_uuid {}".format(
-                        project_subnet_uuids, account_uuid
-                    )
-                )
-                try:
-                    res = AhvObj.subnets(
-                        account_uuid=account_uuid, filter_query=filter_query
-                    )
-                except Exception:
-                    LOG.warning(
-                        "Unable to fetch subnets for Nutanix_PC Account(uuid={})".format(
-                            account_uuid
-                        )
-                    )
-                    continue
+        # Subnets of accounts are shared with other tables/projects fetched recently
+        for account_uuid, entities in AhvAccountSubnets.get(
+            ntnx_pc_account_uuids
+        ).items():
+            if entities is None:
+                continue
 
-                whitelisted_subnets[account_uuid] = [
-                    row["metadata"]["uuid"] for row in res["entities"]
-                ]
+            whitelisted_subnets[account_uuid] = [
+                row["metadata"]["uuid"]
+                for row in entities
+                if row["metadata"]["uuid"] in project_subnet_uuids
+            ]
 
         accounts_data = json.dumps(account_map)
         whitelisted_subnets = json.dumps(whitelisted_subnets)
@@ -909,15 +1300,16 @@ class ProjectCache(CacheTableBase):
         q.execute()
 
     class Meta:
-        database = dsl_database
+        database = dsl_cache_database
         primary_key = CompositeKey("name", "uuid")
 
 
 class EnvironmentCache(CacheTableBase):
     __cache_type__ = "environment"
     feature_min_version = "2.7.0"
+    stores_all_entities = False  # Environments without project are skipped
     name = CharField()
-    uuid = CharField()
+    uuid = CharField(index=True)
     project_uuid = CharField()
     accounts_data = CharField()
     last_update_time = DateTimeField(default=datetime.datetime.now())
@@ -931,12 +1323,6 @@ class EnvironmentCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -962,53 +1348,48 @@ class EnvironmentCache(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def sync(cls):
-        """sync the table data from server"""
-        # clear old data
-        cls.clear()
-
-        # update by latest data
+    def get_sync_api(cls):
         client = get_api_client()
+        return client.environment
 
-        env_list = client.environment.list_all()
-        for entity in env_list:
-            name = entity["status"]["name"]
-            uuid = entity["metadata"]["uuid"]
-            project_uuid = (
-                entity["metadata"].get("project_reference", {}).get("uuid", "")
-            )
+    @classmethod
+    def get_entity_rows(cls, entity, context):
+        name = entity["status"]["name"]
+        uuid = entity["metadata"]["uuid"]
+        project_uuid = entity["metadata"].get("project_reference", {}).get("uuid", "")
 
-            # ignore environments that are not associated to a project
-            if not project_uuid:
-                continue
+        # ignore environments that are not associated to a project
+        if not project_uuid:
+            return []
 
-            infra_inclusion_list = entity["status"]["resources"].get(
-                "infra_inclusion_list", []
+        infra_inclusion_list = entity["status"]["resources"].get(
+            "infra_inclusion_list", []
+        )
+        account_map = {}
+        for infra in infra_inclusion_list:
+            account_type = infra["type"]
+            account_data = dict(
+                uuid=infra["account_reference"]["uuid"],
+                name=infra["account_reference"]["name"],
             )
-            account_map = {}
-            for infra in infra_inclusion_list:
-                account_type = infra["type"]
-                account_data = dict(
-                    uuid=infra["account_reference"]["uuid"],
-                    name=infra["account_reference"]["name"],
-                )
 
-                if account_type == "nutanix_pc":
-                    subnet_refs = infra.get("subnet_references", [])
-                    account_data["subnet_uuids"] = [row["uuid"] for row in subnet_refs]
+            if account_type == "nutanix_pc":
+                subnet_refs = infra.get("subnet_references", [])
+                account_data["subnet_uuids"] = [row["uuid"] for row in subnet_refs]
 
-                if not account_map.get(account_type):
-                    account_map[account_type] = []
+            if not account_map.get(account_type):
+                account_map[account_type] = []
 
-                account_map[account_type].append(account_data)
+            account_map[account_type].append(account_data)
 
-            accounts_data = json.dumps(account_map)
-            cls.create_entry(
-                name=name,
-                uuid=uuid,
-                accounts_data=accounts_data,
-                project_uuid=project_uuid,
-            )
+        return [
+            {
+                "name": name,
+                "uuid": uuid,
+                "accounts_data": json.dumps(account_map),
+                "project_uuid": project_uuid,
+            }
+        ]
 
     @classmethod
     def create_entry(cls, name, uuid, **kwargs):
@@ -1111,15 +1492,17 @@ class EnvironmentCache(CacheTableBase):
         q.execute()
 
     class Meta:
-        database = dsl_database
+        database = dsl_cache_database
         primary_key = CompositeKey("name", "uuid")
+        indexes = ((("name", "project_uuid"), False),)
 
 
 class UsersCache(CacheTableBase):
     __cache_type__ = CACHE.ENTITY.USER
     feature_min_version = "2.7.0"
+    stores_all_entities = False  # Users without directory service are skipped
     name = CharField()
-    uuid = CharField()
+    uuid = CharField(index=True)
     display_name = CharField()
     directory = CharField()
     last_update_time = DateTimeField(default=datetime.datetime.now())
@@ -1133,12 +1516,6 @@ class UsersCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -1186,38 +1563,34 @@ class UsersCache(CacheTableBase):
         )
 
     @classmethod
-    def sync(cls):
-        """sync the table from server"""
+    def get_sync_api(cls):
+        client = get_api_client()
+        return get_resource_api("users", client.connection)
 
-        # clear old data
-        cls.clear()
+    @classmethod
+    def get_entity_rows(cls, entity, context):
+        name = entity["status"]["name"]
+        uuid = entity["metadata"]["uuid"]
+        display_name = entity["status"]["resources"].get("display_name") or ""
+        directory_service_user = (
+            entity["status"]["resources"].get("directory_service_user") or dict()
+        )
+        directory_service_ref = (
+            directory_service_user.get("directory_service_reference") or dict()
+        )
+        directory_service_name = directory_service_ref.get("name", "LOCAL")
 
-        client = get_api_client()
-        Obj = get_resource_api("users", client.connection)
-        res, err = Obj.list({"length": 1000})
-        if err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
-
-        res = res.json()
-        for entity in res["entities"]:
-            name = entity["status"]["name"]
-            uuid = entity["metadata"]["uuid"]
-            display_name = entity["status"]["resources"].get("display_name") or ""
-            directory_service_user = (
-                entity["status"]["resources"].get("directory_service_user") or dict()
-            )
-            directory_service_ref = (
-                directory_service_user.get("directory_service_reference") or dict()
-            )
-            directory_service_name = directory_service_ref.get("name", "LOCAL")
-
-            if directory_service_name:
-                cls.create_entry(
-                    name=name,
-                    uuid=uuid,
-                    display_name=display_name,
-                    directory=directory_service_name,
-                )
+        if not directory_service_name:
+            return []
+
+        return [
+            {
+                "name": name,
+                "uuid": uuid,
+                "display_name": display_name,
+                "directory": directory_service_name,
+            }
+        ]
 
     @classmethod
     def get_entity_data(cls, name, **kwargs):
@@ -1305,15 +1678,16 @@ class UsersCache(CacheTableBase):
         q.execute()
 
     class Meta:
-        database = dsl_database
+        database = dsl_cache_database
         primary_key = CompositeKey("name", "uuid")
+        indexes = ((("name", "directory"), False),)
 
 
 class RolesCache(CacheTableBase):
     __cache_type__ = CACHE.ENTITY.ROLE
     feature_min_version = "2.7.0"
     name = CharField()
-    uuid = CharField()
+    uuid = CharField(index=True)
     last_update_time = DateTimeField(default=datetime.datetime.now())
 
     def get_detail_dict(self, *args, **kwargs):
@@ -1323,12 +1697,6 @@ class RolesCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -1358,23 +1726,13 @@ class RolesCache(CacheTableBase):
         super().create(name=name, uuid=uuid)
 
     @classmethod
-    def sync(cls):
-        """sync the table from server"""
-
-        # clear old data
-        cls.clear()
-
+    def get_sync_api(cls):
         client = get_api_client()
-        Obj = get_resource_api("roles", client.connection)
-        res, err = Obj.list({"length": 1000})
-        if err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
+        return get_resource_api("roles", client.connection)
 
-        res = res.json()
-        for entity in res["entities"]:
-            name = entity["status"]["name"]
-            uuid = entity["metadata"]["uuid"]
-            cls.create_entry(name=name, uuid=uuid)
+    @classmethod
+    def get_entity_rows(cls, entity, context):
+        return [{"name": entity["status"]["name"], "uuid": entity["metadata"]["uuid"]}]
 
     @classmethod
     def get_entity_data(cls, name, **kwargs):
@@ -1426,7 +1784,7 @@ class RolesCache(CacheTableBase):
         obj.delete_instance()
 
     class Meta:
-        database = dsl_database
+        database = dsl_cache_database
         primary_key = CompositeKey("name", "uuid")
 
 
@@ -1434,7 +1792,7 @@ class DirectoryServiceCache(CacheTableBase):
     __cache_type__ = CACHE.ENTITY.DIRECTORY_SERVICE
     feature_min_version = "2.7.0"
     name = CharField()
-    uuid = CharField()
+    uuid = CharField(index=True)
     last_update_time = DateTimeField(default=datetime.datetime.now())
 
     def get_detail_dict(self, *args, **kwargs):
@@ -1444,12 +1802,6 @@ class DirectoryServiceCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -1479,23 +1831,13 @@ class DirectoryServiceCache(CacheTableBase):
         super().create(name=name, uuid=uuid)
 
     @classmethod
-    def sync(cls):
-        """sync the table from server"""
-
-        # clear old data
-        cls.clear()
-
+    def get_sync_api(cls):
         client = get_api_client()
-        Obj = get_resource_api("directory_services", client.connection)
-        res, err = Obj.list({"length": 1000})
-        if err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
+        return get_resource_api("directory_services", client.connection)
 
-        res = res.json()
-        for entity in res["entities"]:
-            name = entity["status"]["name"]
-            uuid = entity["metadata"]["uuid"]
-            cls.create_entry(name=name, uuid=uuid)
+    @classmethod
+    def get_entity_rows(cls, entity, context):
+        return [{"name": entity["status"]["name"], "uuid": entity["metadata"]["uuid"]}]
 
     @classmethod
     def get_entity_data(cls, name, **kwargs):
@@ -1518,15 +1860,16 @@ class DirectoryServiceCache(CacheTableBase):
             return dict()
 
     class Meta:
-        database = dsl_database
+        database = dsl_cache_database
         primary_key = CompositeKey("name", "uuid")
 
 
 class UserGroupCache(CacheTableBase):
     __cache_type__ = CACHE.ENTITY.USER_GROUP
     feature_min_version = "2.7.0"
+    stores_all_entities = False  # Incomplete/non-directory groups are skipped
     name = CharField()
-    uuid = CharField()
+    uuid = CharField(index=True)
     display_name = CharField()
     directory = CharField()
     last_update_time = DateTimeField(default=datetime.datetime.now())
@@ -1540,12 +1883,6 @@ class UserGroupCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -1593,47 +1930,42 @@ class UserGroupCache(CacheTableBase):
         )
 
     @classmethod
-    def sync(cls):
-        """sync the table from server"""
-
-        # clear old data
-        cls.clear()
-
+    def get_sync_api(cls):
         client = get_api_client()
-        Obj = get_resource_api("user_groups", client.connection)
-        res, err = Obj.list({"length": 1000})
-        if err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
+        return get_resource_api("user_groups", client.connection)
 
-        res = res.json()
-        for entity in res["entities"]:
-            state = entity["status"]["state"]
-            if state != "COMPLETE":
-                continue
+    @classmethod
+    def get_entity_rows(cls, entity, context):
+        state = entity["status"]["state"]
+        if state != "COMPLETE":
+            return []
 
-            e_resources = entity["status"]["resources"]
+        e_resources = entity["status"]["resources"]
 
-            directory_service_user_group = (
-                e_resources.get("directory_service_user_group") or dict()
-            )
-            distinguished_name = directory_service_user_group.get("distinguished_name")
+        directory_service_user_group = (
+            e_resources.get("directory_service_user_group") or dict()
+        )
+        distinguished_name = directory_service_user_group.get("distinguished_name")
 
-            directory_service_ref = (
-                directory_service_user_group.get("directory_service_reference")
-                or dict()
-            )
-            directory_service_name = directory_service_ref.get("name", "")
+        directory_service_ref = (
+            directory_service_user_group.get("directory_service_reference") or dict()
+        )
+        directory_service_name = directory_service_ref.get("name", "")
 
-            display_name = e_resources.get("display_name", "")
-            uuid = entity["metadata"]["uuid"]
+        display_name = e_resources.get("display_name", "")
+        uuid = entity["metadata"]["uuid"]
 
-            if directory_service_name and distinguished_name:
-                cls.create_entry(
-                    name=distinguished_name,
-                    uuid=uuid,
-                    display_name=display_name,
-                    directory=directory_service_name,
-                )
+        if not (directory_service_name and distinguished_name):
+            return []
+
+        return [
+            {
+                "name": distinguished_name,
+                "uuid": uuid,
+                "display_name": display_name,
+                "directory": directory_service_name,
+            }
+        ]
 
     @classmethod
     def get_entity_data(cls, name, **kwargs):
@@ -1726,15 +2058,16 @@ class UserGroupCache(CacheTableBase):
         q.execute()
 
     class Meta:
-        database = dsl_database
+        database = dsl_cache_database
         primary_key = CompositeKey("name", "uuid")
+        indexes = ((("name", "directory"), False),)
 
 
 class AhvNetworkFunctionChain(CacheTableBase):
     __cache_type__ = CACHE.ENTITY.AHV_NETWORK_FUNCTION_CHAIN
     feature_min_version = "2.7.0"
     name = CharField()
-    uuid = CharField()
+    uuid = CharField(index=True)
     last_update_time = DateTimeField(default=datetime.datetime.now())
 
     def get_detail_dict(self, *args, **kwargs):
@@ -1744,12 +2077,6 @@ class AhvNetworkFunctionChain(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -1775,22 +2102,13 @@ class AhvNetworkFunctionChain(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def sync(cls):
-        # clear old data
-        cls.clear()
-
-        # update by latest data
+    def get_sync_api(cls):
         client = get_api_client()
-        Obj = get_resource_api("network_function_chains", client.connection)
-        res, err = Obj.list({"length": 1000})
-        if err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
+        return get_resource_api("network_function_chains", client.connection)
 
-        res = res.json()
-        for entity in res["entities"]:
-            name = entity["status"]["name"]
-            uuid = entity["metadata"]["uuid"]
-            cls.create_entry(name=name, uuid=uuid)
+    @classmethod
+    def get_entity_rows(cls, entity, context):
+        return [{"name": entity["status"]["name"], "uuid": entity["metadata"]["uuid"]}]
 
     @classmethod
     def create_entry(cls, name, uuid, **kwargs):
@@ -1806,15 +2124,16 @@ class AhvNetworkFunctionChain(CacheTableBase):
             return dict()
 
     class Meta:
-        database = dsl_database
+        database = dsl_cache_database
         primary_key = CompositeKey("name", "uuid")
 
 
 class AppProtectionPolicyCache(CacheTableBase):
     __cache_type__ = "app_protection_policy"
     feature_min_version = "3.3.0"
+    stores_all_entities = False  # Policies without rules have no rows
     name = CharField()
-    uuid = CharField()
+    uuid = CharField(index=True)
     rule_name = CharField()
     rule_uuid = CharField()
     rule_expiry = IntegerField()
@@ -1834,12 +2153,6 @@ class AppProtectionPolicyCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -1879,49 +2192,48 @@ class AppProtectionPolicyCache(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def sync(cls):
-        # clear old data
-        cls.clear()
-
-        # update by latest data
+    def get_sync_api(cls):
         client = get_api_client()
-        Obj = get_resource_api(
+        return get_resource_api(
             "app_protection_policies", client.connection, calm_api=True
         )
-        entities = Obj.list_all()
-
-        for entity in entities:
-            name = entity["status"]["name"]
-            uuid = entity["metadata"]["uuid"]
-            project_reference = entity["metadata"].get("project_reference", {})
-            for rule in entity["status"]["resources"]["app_protection_rule_list"]:
-                expiry = 0
-                rule_type = ""
-                if rule.get("remote_snapshot_retention_policy", {}):
-                    rule_type = "Remote"
-                    expiry = (
-                        rule["remote_snapshot_retention_policy"]
-                        .get("snapshot_expiry_policy", {})
-                        .get("multiple", 0)
-                    )
-                elif rule.get("local_snapshot_retention_policy", {}):
-                    rule_type = "Local"
-                    expiry = (
-                        rule["local_snapshot_retention_policy"]
-                        .get("snapshot_expiry_policy", {})
-                        .get("multiple", 0)
-                    )
-                rule_name = rule["name"]
-                rule_uuid = rule["uuid"]
-                cls.create_entry(
-                    name=name,
-                    uuid=uuid,
-                    rule_name=rule_name,
-                    rule_uuid=rule_uuid,
-                    project_name=project_reference.get("name", ""),
-                    rule_expiry=expiry,
-                    rule_type=rule_type,
+
+    @classmethod
+    def get_entity_rows(cls, entity, context):
+        name = entity["status"]["name"]
+        uuid = entity["metadata"]["uuid"]
+        project_reference = entity["metadata"].get("project_reference", {})
+
+        rows = []
+        for rule in entity["status"]["resources"]["app_protection_rule_list"]:
+            expiry = 0
+            rule_type = ""
+            if rule.get("remote_snapshot_retention_policy", {}):
+                rule_type = "Remote"
+                expiry = (
+                    rule["remote_snapshot_retention_policy"]
+                    .get("snapshot_expiry_policy", {})
+                    .get("multiple", 0)
                 )
+            elif rule.get("local_snapshot_retention_policy", {}):
+                rule_type = "Local"
+                expiry = (
+                    rule["local_snapshot_retention_policy"]
+                    .get("snapshot_expiry_policy", {})
+                    .get("multiple", 0)
+                )
+            rows.append(
+                {
+                    "name": name,
+                    "uuid": uuid,
+                    "rule_name": rule["name"],
+                    "rule_uuid": rule["uuid"],
+                    "project_name": project_reference.get("name", ""),
+                    "rule_expiry": expiry,
+                    "rule_type": rule_type,
+                }
+            )
+        return rows
 
     @classmethod
     def create_entry(cls, name, uuid, **kwargs):
@@ -1965,11 +2277,12 @@ class AppProtectionPolicyCache(CacheTableBase):
             return None
 
     class Meta:
-        database = dsl_database
+        database = dsl_cache_database
         primary_key = CompositeKey("name", "uuid", "rule_uuid")
+        indexes = ((("name", "project_name"), False),)
 
 
-class VersionTable(BaseModel):
+class VersionTable(CacheBaseModel):
     name = CharField()
     version = CharField()
     last_update_time = DateTimeField(default=datetime.datetime.now())
@@ -67,7 +67,7 @@ class AhvVmProvider(Provider):
         client = get_api_client()
         Obj = cls.get_api_obj()
 
-        res, err = client.project.read(project_id)
+        res, err = client.project.read(project_id, use_cache=True)
         if err:
             raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
@@ -997,7 +997,7 @@ def create_spec(client):
             click.echo("{} selected".format(highlight_text(project_name)))
             break
 
-    res, err = client.project.read(project_id)
+    res, err = client.project.read(project_id, use_cache=True)
     if err:
         raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
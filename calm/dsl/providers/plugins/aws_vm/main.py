@@ -109,7 +109,7 @@ class AWSV0(AWSBase):
 
     def regions(self, account_id):
         Obj = get_resource_api("accounts", self.connection)
-        res, err = Obj.read(account_id)  # TODO remove it from here
+        res, err = Obj.read(account_id, use_cache=True)  # TODO remove it from here
         if err:
             raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
@@ -309,7 +309,7 @@ class AWSV1(AWSBase):
 
     def regions(self, account_id):
         Obj = get_resource_api("accounts", self.connection, calm_api=self.calm_api)
-        res, err = Obj.read(account_id)  # TODO remove it from here
+        res, err = Obj.read(account_id, use_cache=True)  # TODO remove it from here
         if err:
             raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
@@ -541,7 +541,7 @@ def create_spec(client):
             click.echo("{} selected".format(highlight_text(project_list[ind - 1])))
             break
 
-    res, err = client.project.read(project_id)
+    res, err = client.project.read(project_id, use_cache=True)
     if err:
         raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
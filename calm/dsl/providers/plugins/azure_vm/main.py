@@ -326,7 +326,7 @@ def create_spec(client):
             click.echo("{} selected".format(highlight_text(project_list[ind - 1])))
             break
 
-    res, err = client.project.read(project_id)
+    res, err = client.project.read(project_id, use_cache=True)
     if err:
         raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
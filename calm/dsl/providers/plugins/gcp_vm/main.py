@@ -108,7 +108,7 @@ class GCP:
 
     def configured_public_images(self, account_id):
         Obj = get_resource_api("accounts", self.connection)
-        res, err = Obj.read(account_id)
+        res, err = Obj.read(account_id, use_cache=True)
         if err:
             raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
@@ -249,7 +249,7 @@ def create_spec(client):
             click.echo("{} selected".format(highlight_text(project_list[ind - 1])))
             break
 
-    res, err = client.project.read(project_id)
+    res, err = client.project.read(project_id, use_cache=True)
     if err:
         raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
@@ -1,57 +1,221 @@
+import copy
 import click
+import datetime
+import gzip
+import json
+import itertools
+import queue
 import sys
+import time
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 import traceback
-from peewee import OperationalError, IntegrityError
+from concurrent.futures import ThreadPoolExecutor
+from peewee import OperationalError, IntegrityError, DateTimeField
 from distutils.version import LooseVersion as LV
 
 from .version import Version
-from calm.dsl.config import get_context
-from calm.dsl.db import get_db_handle, init_db_handle
+from calm.dsl.db import get_db_handle, init_cache_db_handle
+from calm.dsl.db.table_config import AhvAccountSubnets
 from calm.dsl.log import get_logging_handle
-from calm.dsl.api import get_client_handle_obj
+from calm.dsl.api import get_api_client
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 LOG = get_logging_handle(__name__)
 
-CALM_VERSION = Version.get_version("Calm")
+
+@contextmanager
+def cache_sync_lock(lock_file):
+    """holds exclusive lock on the file, so that only one process syncs the
+    cache at a time. Locking is skipped on platforms not having fcntl"""
+
+    if fcntl is None:
+        yield
+        return
+
+    with open(lock_file, "a") as fd:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            LOG.info("Waiting for cache update by another process to finish")
+            fcntl.flock(fd, fcntl.LOCK_EX)
+
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class LookupCache:
+    """Per process LRU of cache table lookup results"""
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_key(lookup, entity_type, value, kwargs):
+        """returns key for the lookup, None if lookup params are not hashable"""
+
+        key = (lookup, entity_type, value, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get(self, key):
+        """returns (found, data) for the key"""
+
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return False, None
+
+            self.hits += 1
+            self._data.move_to_end(key)
+            data = self._data[key]
+
+        # Callers may modify returned data
+        return True, copy.deepcopy(data)
+
+    def put(self, key, data):
+        data = copy.deepcopy(data)
+        with self._lock:
+            self._data[key] = data
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def invalidate(self, entity_type=None):
+        """removes lookups of entity_type (all lookups if not given)"""
+
+        with self._lock:
+            if entity_type is None:
+                self._data.clear()
+                return
+
+            for key in [key for key in self._data if key[1] == entity_type]:
+                del self._data[key]
+
+    def get_stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
 
 
 class Cache:
     """Cache class Implementation"""
 
+    # Number of cache tables fetched from server concurrently during sync
+    SYNC_MAX_WORKERS = 8
+
+    # Max number of fetched row batches waiting to be written during sync
+    SYNC_QUEUE_SIZE = 16
+
+    # Results of get_entity_data/get_entity_data_using_uuid calls, invalidated
+    # on changes to the cache tables done by this process
+    _lookup_cache = LookupCache(max_size=1024)
+
+    # Seconds for which entities not found by read-through lookups aren't
+    # fetched from server again
+    READ_THROUGH_MISS_TTL = 60
+    _read_through_misses = {}
+    _read_through_lock = threading.Lock()
+
+    # Version of cache snapshot file format. Bump it on incompatible changes
+    SNAPSHOT_FORMAT_VERSION = 1
+
+    # Version gated map of cache tables i.e. (version sync count, calm version, map)
+    _cache_table_index = None
+    _cache_table_index_lock = threading.Lock()
+
+    # Server namespace of cache db, data above belongs to
+    _cache_namespace = None
+
+    @classmethod
+    def check_namespace(cls):
+        """drops lookups of previous server, if cache db is switched to other
+        server (i.e. config of context changes)"""
+
+        namespace = get_db_handle().cache_namespace
+        if namespace == cls._cache_namespace:
+            return
+
+        cls._lookup_cache.invalidate()
+        with cls._read_through_lock:
+            cls._read_through_misses.clear()
+        cls._cache_table_index = None
+        cls._cache_namespace = namespace
+
+    @classmethod
+    def get_cache_table_index(cls, sync_version=False):
+        """returns prebuilt map of cache type to table for the calm version.
+
+        The map is built once per process and calm version, and rebuilt after
+        Version.sync. It is shared across callers, so it must not be modified.
+        """
+
+        cls.check_namespace()
+        with cls._cache_table_index_lock:
+            index = cls._cache_table_index
+            if index and not sync_version and index[0] == Version.get_sync_count():
+                return index[2]
+
+            sync_count = Version.get_sync_count()
+
+            # Get calm version from api only if necessary
+            calm_version = None if sync_version else Version.get_version("Calm")
+            if not calm_version:
+                client = get_api_client()
+                res, err = client.version.get_calm_version()
+                if err:
+                    LOG.error("Failed to get version")
+                    sys.exit(err["error"])
+                calm_version = res.content.decode("utf-8")
+
+            if index and index[1] == calm_version:
+                cls._cache_table_index = (sync_count, calm_version, index[2])
+                return index[2]
+
+            db = get_db_handle()
+            cache_tables = {}
+            for table in db.registered_tables:
+                if hasattr(table, "__cache_type__") and (
+                    LV(calm_version) >= LV(table.feature_min_version)
+                ):
+                    cache_tables[table.__cache_type__] = table
+
+            cls._cache_table_index = (sync_count, calm_version, cache_tables)
+            return cache_tables
+
     @classmethod
     def get_cache_tables(cls, sync_version=False):
         """returns tables used for cache purpose"""
 
-        db = get_db_handle()
-        db_tables = db.registered_tables
-
-        # Get calm version from api only if necessary
-        calm_version = CALM_VERSION
-        if sync_version or (not calm_version):
-            context = get_context()
-            server_config = context.get_server_config()
-            client = get_client_handle_obj(
-                server_config["pc_ip"],
-                server_config["pc_port"],
-                auth=(server_config["pc_username"], server_config["pc_password"]),
-            )
-            res, err = client.version.get_calm_version()
-            if err:
-                LOG.error("Failed to get version")
-                sys.exit(err["error"])
-            calm_version = res.content.decode("utf-8")
-
-        cache_tables = {}
-        for table in db_tables:
-            if hasattr(table, "__cache_type__") and (
-                LV(calm_version) >= LV(table.feature_min_version)
-            ):
-                cache_tables[table.__cache_type__] = table
-        return cache_tables
+        return dict(cls.get_cache_table_index(sync_version=sync_version))
 
     @classmethod
-    def get_entity_data(cls, entity_type, name, **kwargs):
-        """returns entity data corresponding to supplied entry using entity name"""
+    def get_entity_data(cls, entity_type, name, read_through=False, **kwargs):
+        """returns entity data corresponding to supplied entry using entity name.
+
+        If read_through is set, entity missing in cache is fetched from server
+        and stored in cache (for tables supporting it).
+        """
+
+        cls.check_namespace()
+        lookup_key = cls._lookup_cache.get_key("name", entity_type, name, kwargs)
+        if lookup_key:
+            found, res = cls._lookup_cache.get(lookup_key)
+            if found:
+                return res
 
         db_cls = cls.get_entity_db_table_object(entity_type)
 
@@ -65,6 +229,12 @@ class Cache:
             )
             sys.exit(-1)
 
+        if not res and read_through:
+            res = cls.fetch_entity_data(entity_type, name, **kwargs)
+
+        if res and lookup_key:
+            cls._lookup_cache.put(lookup_key, res)
+
         if not res:
             kwargs["name"] = name
             LOG.debug(
@@ -79,6 +249,13 @@ class Cache:
     def get_entity_data_using_uuid(cls, entity_type, uuid, *args, **kwargs):
         """returns entity data corresponding to supplied entry using entity uuid"""
 
+        cls.check_namespace()
+        lookup_key = cls._lookup_cache.get_key("uuid", entity_type, uuid, kwargs)
+        if lookup_key:
+            found, res = cls._lookup_cache.get(lookup_key)
+            if found:
+                return res
+
         db_cls = cls.get_entity_db_table_object(entity_type)
 
         try:
@@ -91,6 +268,9 @@ class Cache:
             )
             sys.exit(-1)
 
+        if res and lookup_key:
+            cls._lookup_cache.put(lookup_key, res)
+
         if not res:
             kwargs["uuid"] = uuid
             LOG.debug(
@@ -101,6 +281,48 @@ class Cache:
 
         return res
 
+    @classmethod
+    def fetch_entity_data(cls, entity_type, name, **kwargs):
+        """fetches entity missing in cache from server using filtered list,
+        stores it in cache and returns its data"""
+
+        miss_key = cls._lookup_cache.get_key("name", entity_type, name, kwargs)
+        with cls._read_through_lock:
+            if cls._read_through_misses.get(miss_key, 0) > time.time():
+                return {}
+
+        db_cls = cls.get_entity_db_table_object(entity_type)
+        try:
+            rows = db_cls.fetch_entity_rows(name, **kwargs)
+        except Exception as exp:
+            LOG.debug(
+                "Failed to fetch {} {} from server: {}".format(entity_type, name, exp)
+            )
+            rows = None
+
+        res = {}
+        if rows:
+            LOG.debug(
+                "Adding {} {} fetched from server to cache".format(entity_type, name)
+            )
+            db_cls.write_rows(rows)
+            cls._lookup_cache.invalidate(entity_type)
+            res = db_cls.get_entity_data(name=name, **kwargs)
+
+        if not res and miss_key:
+            with cls._read_through_lock:
+                cls._read_through_misses[miss_key] = (
+                    time.time() + cls.READ_THROUGH_MISS_TTL
+                )
+
+        return res
+
+    @classmethod
+    def get_lookup_stats(cls):
+        """returns hits/misses of the per process lookup cache"""
+
+        return cls._lookup_cache.get_stats()
+
     @classmethod
     def get_entity_db_table_object(cls, entity_type):
         """returns database entity table object corresponding to entity"""
@@ -109,8 +331,7 @@ class Cache:
             LOG.error("No entity type for cache supplied")
             sys.exit(-1)
 
-        cache_tables = cls.get_cache_tables()
-        db_cls = cache_tables.get(entity_type, None)
+        db_cls = cls.get_cache_table_index().get(entity_type, None)
         if not db_cls:
             LOG.error("Unknown entity type ({}) supplied".format(entity_type))
             sys.exit(-1)
@@ -122,52 +343,178 @@ class Cache:
         """adds one entity to entity db object"""
 
         db_obj = cls.get_entity_db_table_object(entity_type)
-        db_obj.add_one(uuid, **kwargs)
+        try:
+            db_obj.add_one(uuid, **kwargs)
+        finally:
+            cls._lookup_cache.invalidate(entity_type)
 
     @classmethod
     def delete_one(cls, entity_type, uuid, **kwargs):
         """adds one entity to entity db object"""
 
         db_obj = cls.get_entity_db_table_object(entity_type)
-        db_obj.delete_one(uuid, **kwargs)
+        try:
+            db_obj.delete_one(uuid, **kwargs)
+        finally:
+            cls._lookup_cache.invalidate(entity_type)
 
     @classmethod
     def update_one(cls, entity_type, uuid, **kwargs):
         """adds one entity to entity db object"""
 
         db_obj = cls.get_entity_db_table_object(entity_type)
-        db_obj.update_one(uuid, **kwargs)
+        try:
+            db_obj.update_one(uuid, **kwargs)
+        finally:
+            cls._lookup_cache.invalidate(entity_type)
 
     @classmethod
-    def sync(cls):
-        """Sync cache by latest data"""
+    def _sync_tables(cls, tables, delta=False, sync_version=False):
+        """syncs the cache tables. Changes of tables are fetched from server
+        concurrently, and streamed in batches of rows to the calling thread,
+        which writes them in a single transaction. So readers see either old
+        or new data of all tables, and a failed sync leaves the cache
+        unchanged. Syncs of processes sharing the cache db are serialized
+        using a lock file.
+
+        If sync_version is set, stored versions are fetched and replaced along
+        with the tables.
+        """
+
+        db = get_db_handle()
+        with cache_sync_lock(db.cache_db.database + ".lock"):
+            sync_states = {table: table.get_sync_state(delta) for table in tables}
+
+            # Subnets of accounts are fetched once for all tables of the sync
+            AhvAccountSubnets.clear()
+
+            # Fetched rows are passed through a bounded queue, so only a few
+            # batches are held in memory, whatever the size of tables
+            row_queue = queue.Queue(maxsize=cls.SYNC_QUEUE_SIZE)
+            cancelled = threading.Event()
+
+            def put(item):
+                while not cancelled.is_set():
+                    try:
+                        row_queue.put(item, timeout=0.1)
+                        return True
+                    except queue.Full:
+                        pass
+                return False
+
+            def fetch_changes(table):
+                start_time = time.time()
+                try:
+                    changes = table.fetch_changes(sync_states[table])
+                    rows = iter(changes.pop("rows"))
+                    if not put((table, "changes", changes)):
+                        return
+
+                    while True:
+                        batch = list(itertools.islice(rows, table.INSERT_BATCH_SIZE))
+                        if not batch:
+                            break
+                        if not put((table, "rows", batch)):
+                            return
+
+                    put((table, "done", time.time() - start_time))
+
+                except BaseException as exp:
+                    put((table, "error", exp))
+
+            # Versions are needed by table fetches, so they are resolved first by
+            # this thread. Fetches running in workers make no db queries
+            if sync_version:
+                versions = Version.fetch_versions()
+            else:
+                versions = Version.get_versions()
+
+            max_workers = max(min(cls.SYNC_MAX_WORKERS, len(tables)), 1)
+            with Version.use_sync_versions(versions), ThreadPoolExecutor(
+                max_workers=max_workers
+            ) as executor:
+                try:
+                    for table in tables:
+                        executor.submit(fetch_changes, table)
+
+                    with db.cache_db.atomic():
+                        if sync_version:
+                            Version.write_versions(versions)
+
+                        row_counts = {}
+                        sync_changes = {}
+                        synced_count = 0
+                        while synced_count < len(tables):
+                            table, item_type, value = row_queue.get()
+                            if item_type == "error":
+                                raise value
+
+                            elif item_type == "changes":
+                                table.delete_changed_rows(value)
+                                sync_changes[table] = value
+                                row_counts[table] = 0
+
+                            elif item_type == "rows":
+                                row_counts[table] += table.insert_rows(value)
+
+                            else:
+                                synced_count += 1
+                                db.cache_sync_table.set_last_sync_time(
+                                    table.get_cache_type(),
+                                    sync_changes[table]["sync_time"],
+                                )
+                                click.echo(
+                                    "  [{}/{}] {}: {} rows {} in {:.2f}s".format(
+                                        synced_count,
+                                        len(tables),
+                                        table.get_cache_type(),
+                                        row_counts[table],
+                                        "fetched"
+                                        if sync_changes[table]["full"]
+                                        else "updated",
+                                        value,
+                                    ),
+                                    err=True,
+                                )
+
+                finally:
+                    # Unblocks the fetches still running, if the sync failed
+                    cancelled.set()
 
-        def sync_tables(tables):
             for table in tables:
-                table.sync()
-                click.echo(".", nl=False, err=True)
+                cls._lookup_cache.invalidate(table.get_cache_type())
+
+    @classmethod
+    def sync(cls, delta=False):
+        """Sync cache by latest data
+
+        Args:
+            delta (bool): sync only the entities changed since last sync
+        """
+
+        def sync_tables(tables):
+            cls._sync_tables(tables, delta=delta, sync_version=True)
 
         cache_table_map = cls.get_cache_tables(sync_version=True)
         tables = list(cache_table_map.values())
 
-        # Inserting version table at start
-        tables.insert(0, Version)
-
+        start_time = time.time()
         try:
-            LOG.info("Updating cache", nl=False)
+            LOG.info("Updating cache")
             sync_tables(tables)
 
         except (OperationalError, IntegrityError):
-            click.echo(" [Fail]")
-            # init db handle once (recreating db if some schema changes are there)
-            LOG.info("Removing existing db and updating cache again")
-            init_db_handle()
-            LOG.info("Updating cache", nl=False)
+            click.echo("[Fail]", err=True)
+            # recreate cache db once (if some schema changes are there)
+            LOG.info("Removing existing cache db and updating cache again")
+            init_cache_db_handle()
+            cls._lookup_cache.invalidate()
+            LOG.info("Updating cache")
             sync_tables(tables)
-        click.echo(" [Done]", err=True)
+        LOG.info("Cache updated in {:.2f}s".format(time.time() - start_time))
 
     @classmethod
-    def sync_table(cls, cache_type):
+    def sync_table(cls, cache_type, delta=False):
         """sync the cache table provided in cache_type list"""
 
         if not cache_type:
@@ -176,20 +523,234 @@ class Cache:
         cache_type = [cache_type] if not isinstance(cache_type, list) else cache_type
         cache_table_map = cls.get_cache_tables()
 
+        tables = []
         for _ct in cache_type:
             if _ct not in cache_table_map:
                 LOG.warning("Invalid cache_type ('{}') provided".format(cache_type))
                 continue
 
-            cache_table = cache_table_map[_ct]
-            cache_table.sync()
+            tables.append(cache_table_map[_ct])
+
+        cls._sync_tables(tables, delta=delta)
 
     @classmethod
     def clear_entities(cls):
         """Clear data present in the cache tables"""
 
-        # For now clearing means erasing all data. So reinitialising whole database
-        init_db_handle()
+        # For now clearing means erasing all data. So recreating cache db of server
+        init_cache_db_handle()
+        cls._lookup_cache.invalidate()
+        cls._cache_table_index = None
+
+    @classmethod
+    def export_snapshot(cls, file_location):
+        """writes cache tables, versions and sync times to a gzip compressed
+        json snapshot file"""
+
+        db = get_db_handle()
+
+        # Tables are read in a single transaction, so snapshot is consistent
+        # even if a cache sync is running
+        with db.cache_db.atomic():
+            tables = {}
+            for table in db.registered_tables:
+                cache_type = getattr(table, "__cache_type__", None)
+                if not cache_type:
+                    continue
+
+                columns = table._meta.sorted_field_names
+                rows = [
+                    [
+                        str(value) if isinstance(value, datetime.datetime) else value
+                        for value in row
+                    ]
+                    for row in table.select().tuples()
+                ]
+                tables[cache_type] = {"columns": columns, "rows": rows}
+
+            host, port = db.cache_namespace
+            snapshot = {
+                "format_version": cls.SNAPSHOT_FORMAT_VERSION,
+                "created_at": str(datetime.datetime.utcnow()),
+                "server": {"host": host, "port": port},
+                "versions": {
+                    row.name: row.version for row in db.version_table.select()
+                },
+                "sync_times": {
+                    row.cache_type: str(row.last_sync_time)
+                    for row in db.cache_sync_table.select()
+                },
+                "tables": tables,
+            }
+
+        with gzip.open(file_location, "wt", encoding="utf-8") as fd:
+            json.dump(snapshot, fd)
+
+        return {cache_type: len(table["rows"]) for cache_type, table in tables.items()}
+
+    @classmethod
+    def read_snapshot(cls, file_location):
+        """returns snapshot data stored in the file"""
+
+        try:
+            with gzip.open(file_location, "rt", encoding="utf-8") as fd:
+                snapshot = json.load(fd)
+        except (OSError, ValueError) as exp:
+            LOG.error("Invalid cache snapshot file {}: {}".format(file_location, exp))
+            sys.exit(-1)
+
+        if snapshot.get("format_version") != cls.SNAPSHOT_FORMAT_VERSION:
+            LOG.error(
+                "Cache snapshot format version {} is not supported (expected {})".format(
+                    snapshot.get("format_version"), cls.SNAPSHOT_FORMAT_VERSION
+                )
+            )
+            sys.exit(-1)
+
+        return snapshot
+
+    @classmethod
+    def get_snapshot_staleness(cls, snapshot):
+        """returns list of (name, snapshot version, server version) for the
+        versions differing between snapshot and server"""
+
+        client = get_api_client()
+        server_versions = {}
+
+        res, err = client.version.get_calm_version()
+        if err:
+            LOG.error("Failed to get version")
+            sys.exit(err["error"])
+        server_versions["Calm"] = res.content.decode("utf-8")
+
+        res, err = client.version.get_pc_version()
+        if not err:
+            server_versions["PC"] = res.json()["version"]
+
+        snapshot_versions = snapshot.get("versions", {})
+        return [
+            (name, snapshot_versions.get(name), version)
+            for name, version in server_versions.items()
+            if snapshot_versions.get(name) != version
+        ]
+
+    @classmethod
+    def check_snapshot_server(cls, snapshot, force=False):
+        """fails if snapshot is taken from other server than the one in
+        context, as its entities don't exist on this server. Only warns if
+        force is set"""
+
+        server = snapshot.get("server") or {}
+        snapshot_namespace = (server.get("host"), server.get("port"))
+        namespace = tuple(get_db_handle().cache_namespace)
+        if snapshot_namespace == namespace:
+            return
+
+        msg = "Cache snapshot is taken from server {}:{}, not from {}:{}".format(
+            snapshot_namespace[0], snapshot_namespace[1], namespace[0], namespace[1]
+        )
+        if force:
+            LOG.warning(msg)
+            return
+
+        LOG.error(msg)
+        LOG.error(
+            "Please export the snapshot from this server, or pass --force to import it anyway"
+        )
+        sys.exit(-1)
+
+    @classmethod
+    def get_snapshot_rows(cls, table, table_data):
+        """yields rows (dict of column values) of table stored in snapshot.
+        Columns missing in table are skipped"""
+
+        fields = table._meta.fields
+        datetime_columns = [
+            column
+            for column in table_data["columns"]
+            if column in fields and isinstance(fields[column], DateTimeField)
+        ]
+
+        for values in table_data["rows"]:
+            row = {
+                column: value
+                for column, value in zip(table_data["columns"], values)
+                if column in fields
+            }
+            for column in datetime_columns:
+                if row[column]:
+                    row[column] = datetime.datetime.fromisoformat(row[column])
+            yield row
+
+    @classmethod
+    def import_snapshot(cls, file_location, check_version=True, force=False):
+        """replaces cache data by the snapshot in a single transaction
+
+        Args:
+            file_location (str): snapshot file created by export_snapshot
+            check_version (bool): fail if snapshot is taken from a server
+                having other PC/Calm version than current one
+            force (bool): import snapshot taken from other server (with a
+                warning) instead of failing
+        """
+
+        snapshot = cls.read_snapshot(file_location)
+        cls.check_snapshot_server(snapshot, force=force)
+
+        if check_version:
+            stale_versions = cls.get_snapshot_staleness(snapshot)
+            if stale_versions:
+                for name, snapshot_version, server_version in stale_versions:
+                    LOG.error(
+                        "{} version of cache snapshot ({}) doesn't match server ({})".format(
+                            name, snapshot_version, server_version
+                        )
+                    )
+                LOG.error(
+                    "Cache snapshot is stale. Please export it again or run: calm update cache"
+                )
+                sys.exit(-1)
+
+        db = get_db_handle()
+        cache_tables = {
+            table.__cache_type__: table
+            for table in db.registered_tables
+            if hasattr(table, "__cache_type__")
+        }
+
+        row_counts = {}
+        with db.cache_db.atomic():
+            for table in cache_tables.values():
+                table.clear()
+            db.version_table.delete().execute()
+            db.cache_sync_table.delete().execute()
+
+            for cache_type, table_data in snapshot["tables"].items():
+                table = cache_tables.get(cache_type)
+                if not table:
+                    LOG.warning(
+                        "Skipping unknown cache table '{}' of snapshot".format(
+                            cache_type
+                        )
+                    )
+                    continue
+
+                # Rows are converted batch by batch while inserting them
+                row_counts[cache_type] = table.insert_rows(
+                    cls.get_snapshot_rows(table, table_data)
+                )
+
+            for name, version in snapshot.get("versions", {}).items():
+                db.version_table.create(name=name, version=version)
+
+            for cache_type, sync_time in snapshot.get("sync_times", {}).items():
+                db.cache_sync_table.set_last_sync_time(
+                    cache_type, datetime.datetime.fromisoformat(sync_time)
+                )
+
+        cls._lookup_cache.invalidate()
+        cls._cache_table_index = None
+        return row_counts
 
     @classmethod
     def show_data(cls):
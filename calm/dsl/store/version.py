@@ -1,4 +1,5 @@
 import peewee
+from contextlib import contextmanager
 
 from calm.dsl.db import get_db_handle
 from calm.dsl.api import get_api_client
@@ -7,6 +8,21 @@ from calm.dsl.api import get_api_client
 class Version:
     """Version class Implementation"""
 
+    # Number of Version.sync calls in this process. Data derived from stored
+    # versions is rebuilt when it changes
+    _sync_count = 0
+
+    # Versions used by an ongoing cache sync (fetched from server, or read from
+    # db by the syncing thread). Table fetches of the sync, running in worker
+    # threads, read them through get_version instead of querying db
+    _sync_versions = None
+
+    @classmethod
+    def get_sync_count(cls):
+        """returns number of version syncs done in this process"""
+
+        return cls._sync_count
+
     @classmethod
     def create(cls, name="", version=""):
         """Store the uuid of entity in cache"""
@@ -18,6 +34,10 @@ class Version:
     def get_version(cls, name):
         """Returns the version of entity present"""
 
+        sync_versions = cls._sync_versions
+        if sync_versions is not None:
+            return sync_versions.get(name)
+
         db = get_db_handle()
         try:
             entity = db.version_table.get(db.version_table.name == name)
@@ -27,25 +47,57 @@ class Version:
             return None
 
     @classmethod
-    def sync(cls):
+    def get_versions(cls):
+        """returns map of name to version of all stored versions"""
 
         db = get_db_handle()
-        for entity in db.version_table.select():
-            query = db.version_table.delete().where(
-                db.version_table.name == entity.name
-            )
-            query.execute()
+        return {entity.name: entity.version for entity in db.version_table.select()}
+
+    @classmethod
+    def fetch_versions(cls):
+        """returns map of name to version of calm (and PC, if host exists)
+        fetched from server. It makes no db queries"""
 
         client = get_api_client()
+        versions = {}
 
-        # Update calm version
+        # Calm version
         res, err = client.version.get_calm_version()
-        calm_version = res.content.decode("utf-8")
-        cls.create("Calm", calm_version)
+        versions["Calm"] = res.content.decode("utf-8")
 
-        # Update pc_version of PC(if host exist)
+        # pc_version of PC(if host exist)
         res, err = client.version.get_pc_version()
         if not err:
-            res = res.json()
-            pc_version = res["version"]
-            cls.create("PC", pc_version)
+            versions["PC"] = res.json()["version"]
+
+        return versions
+
+    @classmethod
+    @contextmanager
+    def use_sync_versions(cls, versions):
+        """serves versions (returned by fetch_versions/get_versions) from
+        get_version within the block, without querying db"""
+
+        cls._sync_versions = versions
+        try:
+            yield
+        finally:
+            cls._sync_versions = None
+
+    @classmethod
+    def write_versions(cls, versions):
+        """replaces stored versions by versions returned by fetch_versions in
+        a single transaction"""
+
+        db = get_db_handle()
+        with db.cache_db.atomic():
+            db.version_table.delete().execute()
+            for name, version in versions.items():
+                cls.create(name, version)
+
+        cls._sync_count += 1
+
+    @classmethod
+    def sync(cls):
+
+        cls.write_versions(cls.fetch_versions())
@@ -0,0 +1,96 @@
+"""
+json_codec: JSON encoding/decoding of request and response bodies
+
+Uses orjson when it is installed and falls back to stdlib json otherwise.
+Output of both the backends is equivalent json (orjson doesn't escape
+non-ascii characters), so callers must not depend on exact byte layout.
+"""
+
+import copy
+import json
+
+from requests import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def get_backend():
+    return "orjson" if orjson is not None else "json"
+
+
+def dumps_bytes(obj, default=None, sort_keys=False):
+    """returns compact utf-8 encoded json of obj
+
+    Args:
+        obj (object): object to be serialized
+        default (callable): called for objects that can't be serialized
+        sort_keys (bool): sort keys of dicts
+    Returns:
+        (bytes): serialized object
+    """
+
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=default, option=option)
+
+        except orjson.JSONEncodeError:
+            # Objects not supported by orjson (e.g. integers above 64 bits)
+            pass
+
+    return json.dumps(
+        obj, default=default, sort_keys=sort_keys, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def dumps(obj, default=None, sort_keys=False):
+    """returns compact json string of obj. Refer dumps_bytes for args"""
+
+    return dumps_bytes(obj, default=default, sort_keys=sort_keys).decode("utf-8")
+
+
+def loads(data):
+    """returns object deserialized from json str/bytes"""
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _codec_json(res, **kwargs):
+    if kwargs:
+        return Response.json(res, **kwargs)
+
+    try:
+        return loads(res.content)
+    except (ValueError, TypeError):
+        # Non utf-8 bodies, let requests handle the encoding
+        return Response.json(res)
+
+
+def use_codec_json(res):
+    """patches res.json() to parse the body using the codec.
+
+    Each res.json() call returns a newly parsed object, so mutations made by
+    a caller are not visible to later calls. Parsing the body again is
+    cheaper than copying an already parsed one.
+    """
+
+    if isinstance(res, Response):
+        res.json = _codec_json.__get__(res)
+    return res
+
+
+def copy_response(res):
+    """returns shallow copy of response, used when a response is shared by
+    several callers"""
+
+    if not isinstance(res, Response):
+        return res
+
+    return use_codec_json(copy.copy(res))
@@ -0,0 +1,743 @@
+"""
+mock_server: Local stand-in for Prism Central for offline testing and benchmarks
+
+Implements the subset of v3 apis used by ResourceAPI (list/read/create/update/
+delete), blueprint launch and launch polling, runbook run and runlog polling,
+nutanix task polling and calm version. Entities are kept in memory.
+
+Example:
+
+server = MockPCServer(entity_counts={"blueprints": 1000}, latency=0.05)
+server.start()
+client = get_client_handle_obj(server.host, server.port,
+                               scheme=REQUEST.SCHEME.HTTP, auth=("admin", "pwd"))
+entities = client.blueprint.list_all()
+server.stop()
+
+It can also be run as a script:
+python -m calm.dsl.tools.mock_server --port 9440 --latency 0.05 --count blueprints=1000
+"""
+
+import re
+import ssl
+import sys
+import gzip
+import json
+import base64
+import calendar
+import time
+import uuid
+import random
+import argparse
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+API_ROOTS = ["api/nutanix/v3/", "api/calm/v3.0/"]
+
+DEFAULT_ENTITY_COUNTS = {
+    "projects": 5,
+    "environments": 5,
+    "blueprints": 20,
+    "apps": 20,
+    "runbooks": 10,
+    "endpoints": 10,
+    "accounts": 2,
+}
+
+# Entity kinds named differently from the resource type in urls
+ENTITY_KINDS = {
+    "apps": "app",
+    "blueprints": "blueprint",
+    "projects": "project",
+    "environments": "environment",
+    "runbooks": "runbook",
+    "endpoints": "endpoint",
+    "accounts": "account",
+    "access_control_policies": "access_control_policy",
+    "user_groups": "user_group",
+    "directory_services": "directory_service",
+}
+
+CALM_VERSION = "3.6.0"
+
+
+class EntityStore:
+    """In-memory store of entities of all resource types"""
+
+    def __init__(self, entity_counts=None):
+        self._lock = threading.Lock()
+        self._entities = {}
+        self.pending_launches = {}
+        self.runlogs = {}
+        self.tasks = {}
+
+        for resource_type, count in (entity_counts or {}).items():
+            for index in range(count):
+                self.create(
+                    resource_type,
+                    {
+                        "spec": {
+                            "name": "{}-{}".format(resource_type, index),
+                            "resources": {},
+                        },
+                        "metadata": {},
+                    },
+                )
+
+    def _get_entities(self, resource_type):
+        return self._entities.setdefault(resource_type, OrderedDict())
+
+    def create(self, resource_type, payload):
+        metadata = dict(payload.get("metadata", {}))
+        spec = payload.get("spec", {})
+        entity_uuid = metadata.get("uuid") or str(uuid.uuid4())
+        now = int(time.time() * 1000000)
+        name = spec.get("name") or metadata.get("name") or entity_uuid
+
+        metadata.update(
+            {
+                "uuid": entity_uuid,
+                "name": name,
+                "kind": ENTITY_KINDS.get(resource_type, resource_type.rstrip("s")),
+                "spec_version": 0,
+                "creation_time": str(now),
+                "last_update_time": str(now),
+            }
+        )
+        entity = {
+            "api_version": "3.0",
+            "metadata": metadata,
+            "spec": spec,
+            "status": {
+                "name": name,
+                "state": "ACTIVE",
+                "resources": spec.get("resources", {}),
+                "description": spec.get("description", ""),
+            },
+        }
+        with self._lock:
+            self._get_entities(resource_type)[entity_uuid] = entity
+        return entity
+
+    def read(self, resource_type, entity_uuid):
+        with self._lock:
+            return self._get_entities(resource_type).get(entity_uuid)
+
+    def update(self, resource_type, entity_uuid, payload):
+        with self._lock:
+            entity = self._get_entities(resource_type).get(entity_uuid)
+            if entity is None:
+                return None
+
+            spec = payload.get("spec", entity["spec"])
+            entity["spec"] = spec
+            entity["metadata"]["spec_version"] += 1
+            entity["metadata"]["last_update_time"] = str(int(time.time() * 1000000))
+            entity["status"]["resources"] = spec.get("resources", {})
+            if spec.get("name"):
+                entity["metadata"]["name"] = spec["name"]
+                entity["status"]["name"] = spec["name"]
+            return entity
+
+    def delete(self, resource_type, entity_uuid):
+        with self._lock:
+            return self._get_entities(resource_type).pop(entity_uuid, None)
+
+    def list(self, resource_type, filter_query=""):
+        with self._lock:
+            entities = list(self._get_entities(resource_type).values())
+
+        if filter_query:
+            entities = [
+                entity for entity in entities if match_filter(entity, filter_query)
+            ]
+        return entities
+
+    def create_task(self):
+        task_uuid = str(uuid.uuid4())
+        self.tasks[task_uuid] = {
+            "uuid": task_uuid,
+            "status": "SUCCEEDED",
+            "percentage_complete": 100,
+        }
+        return task_uuid
+
+
+def get_entity_attribute(entity, attr):
+    if attr == "name":
+        return entity["status"]["name"]
+    if attr == "state":
+        return entity["status"]["state"]
+    if attr == "uuid":
+        return entity["metadata"]["uuid"]
+    value = entity["status"]["resources"].get(attr, entity["metadata"].get(attr))
+    return "" if value is None else str(value)
+
+
+def to_timestamp(value):
+    """returns epoch seconds of usecs / ISO 8601 (UTC) timestamp"""
+
+    value = value.strip()
+    if value.isdigit():
+        return int(value) / 1000000
+    return calendar.timegm(time.strptime(value, "%Y-%m-%dT%H:%M:%SZ"))
+
+
+COMPARISON_OPERATORS = {
+    "=gt=": lambda actual, value: actual > value,
+    "=ge=": lambda actual, value: actual >= value,
+    "=lt=": lambda actual, value: actual < value,
+    "=le=": lambda actual, value: actual <= value,
+}
+
+
+class BadRequest(Exception):
+    """Request rejected by server with 400"""
+
+
+def match_condition(entity, condition):
+    """matches entity with a single filter condition i.e. 'name==abc'"""
+
+    for operator in list(COMPARISON_OPERATORS.keys()) + ["!=", "=="]:
+        if operator in condition:
+            attr, value = condition.split(operator, 1)
+            break
+    else:
+        raise BadRequest("Invalid filter condition '{}'".format(condition))
+
+    if not attr.strip():
+        raise BadRequest("Invalid filter condition '{}'".format(condition))
+
+    actual = get_entity_attribute(entity, attr.strip())
+
+    # Timestamp comparisons i.e. 'last_update_time=ge=2021-01-01T00:00:00Z'
+    if operator in COMPARISON_OPERATORS:
+        return COMPARISON_OPERATORS[operator](to_timestamp(actual), to_timestamp(value))
+
+    # Values are matched as patterns, similar to the server
+    try:
+        matched = bool(re.fullmatch(value, actual))
+    except re.error:
+        matched = value == actual
+
+    return matched if operator == "==" else not matched
+
+
+def split_filter(filter_query, separator):
+    """splits filter at separator, ignoring separators inside brackets"""
+
+    parts = []
+    depth = 0
+    current = ""
+    for char in filter_query:
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        if char == separator and depth == 0:
+            parts.append(current)
+            current = ""
+        else:
+            current += char
+    parts.append(current)
+    return parts
+
+
+def match_filter(entity, filter_query):
+    """matches entity with FIQL like filter (';' is AND, ',' is OR)"""
+
+    filter_query = filter_query.strip()
+    if not filter_query:
+        return True
+
+    for and_part in split_filter(filter_query, ";"):
+        or_parts = split_filter(and_part.strip(), ",")
+        if not any(match_or_group(entity, part.strip()) for part in or_parts):
+            return False
+    return True
+
+
+def match_or_group(entity, part):
+    if part.startswith("(") and part.endswith(")"):
+        return match_filter(entity, part[1:-1])
+    return match_condition(entity, part)
+
+
+class MockPCRequestHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.mock.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, status, message):
+        self._send_json(
+            status,
+            {
+                "api_version": "3.1",
+                "code": status,
+                "message_list": [{"message": message, "reason": "ERROR"}],
+                "state": "ERROR",
+            },
+        )
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+
+        data = self.rfile.read(length)
+        if self.server.mock.accept_gzip and (
+            self.headers.get("Content-Encoding") == "gzip"
+        ):
+            try:
+                data = gzip.decompress(data)
+            except OSError:
+                raise BadRequest("Invalid gzip request body")
+
+        try:
+            body = json.loads(data.decode("utf-8") or "{}")
+        except ValueError:
+            raise BadRequest("Invalid json request body")
+
+        if not isinstance(body, dict):
+            raise BadRequest("Request body is not a json object")
+        return body
+
+    def _handle(self, method):
+        mock = self.server.mock
+        mock.record_request(method, self.path)
+
+        if mock.latency or mock.jitter:
+            time.sleep(mock.latency + random.uniform(0, mock.jitter))
+
+        if mock.auth and not self._is_authorized(mock.auth):
+            self.send_response(401)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        try:
+            self._handle_request(method)
+        except BadRequest as exp:
+            self._send_error(400, str(exp))
+
+    def _handle_request(self, method):
+        mock = self.server.mock
+        path = urlparse(self.path).path.lstrip("/")
+        body = self._read_body() if method in ["POST", "PUT", "DELETE"] else {}
+
+        if path == "api/nutanix/v3/apps/version" or path == "apps/version":
+            data = CALM_VERSION.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+
+        for root in API_ROOTS:
+            if path.startswith(root):
+                status, response = mock.route(
+                    method, path[len(root) :].split("/"), body
+                )
+                if status >= 400:
+                    self._send_error(status, response)
+                else:
+                    self._send_json(status, response)
+                return
+
+        self._send_error(404, "Unknown url {}".format(path))
+
+    def _is_authorized(self, auth):
+        expected = "Basic {}".format(
+            base64.b64encode("{}:{}".format(*auth).encode("utf-8")).decode("utf-8")
+        )
+        return self.headers.get("Authorization") == expected
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+class MockPCServer:
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        entity_counts=None,
+        latency=0,
+        jitter=0,
+        auth=None,
+        launch_polls=1,
+        runlog_polls=1,
+        certfile=None,
+        keyfile=None,
+        verbose=False,
+        accept_gzip=False,
+    ):
+        """Local stand-in for Prism Central
+
+        Args:
+            host (str): address to bind the server to
+            port (int): port to listen at (0 picks a free port)
+            entity_counts (dict): number of entities created per resource type
+                                  i.e. {"blueprints": 1000}
+            latency (float): seconds added to every response
+            jitter (float): maximum random seconds added over latency
+            auth (tuple): (username, password) required in basic auth
+            launch_polls (int): polls after which blueprint launch succeeds
+            runlog_polls (int): polls after which runbook runlog succeeds
+            certfile (str): certificate file, enables https
+            keyfile (str): private key file of the certificate
+            verbose (bool): log the requests
+            accept_gzip (bool): decompress request bodies having
+                                'Content-Encoding: gzip'. Otherwise such
+                                bodies are rejected as invalid json (400)
+        """
+        if entity_counts is None:
+            entity_counts = DEFAULT_ENTITY_COUNTS
+
+        self.latency = latency
+        self.jitter = jitter
+        self.auth = auth
+        self.launch_polls = launch_polls
+        self.runlog_polls = runlog_polls
+        self.verbose = verbose
+        self.accept_gzip = accept_gzip
+        self.store = EntityStore(entity_counts)
+
+        self._request_counts = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+        self.httpd = ThreadingHTTPServer((host, port), MockPCRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+        self.scheme = "http"
+        if certfile:
+            ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            ssl_context.load_cert_chain(certfile, keyfile)
+            self.httpd.socket = ssl_context.wrap_socket(
+                self.httpd.socket, server_side=True
+            )
+            self.scheme = "https"
+
+    @property
+    def host(self):
+        return self.httpd.server_address[0]
+
+    @property
+    def port(self):
+        return self.httpd.server_address[1]
+
+    def start(self):
+        """starts serving requests in a background thread"""
+
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, name="mock-pc-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def record_request(self, method, path):
+        path = urlparse(path).path
+        with self._lock:
+            key = (method, path)
+            self._request_counts[key] = self._request_counts.get(key, 0) + 1
+
+    def get_request_count(self, method=None, path_prefix=""):
+        """returns number of requests received, matching method and path prefix"""
+
+        path_prefix = "/" + path_prefix.lstrip("/")
+        with self._lock:
+            return sum(
+                count
+                for (_method, path), count in self._request_counts.items()
+                if (not method or _method == method.upper())
+                and path.startswith(path_prefix)
+            )
+
+    def reset_request_counts(self):
+        with self._lock:
+            self._request_counts.clear()
+
+    def route(self, method, parts, body):
+        """returns (status, response) for the request to a v3 url"""
+
+        # Provider apis proxied by calm i.e. nutanix/v1/subnets
+        if parts[:2] == ["nutanix", "v1"] and len(parts) > 2:
+            parts = ["/".join(parts[:3])] + parts[3:]
+
+        resource_type = parts[0]
+        parts = parts[1:]
+
+        if resource_type == "tasks" and len(parts) == 1 and method == "GET":
+            task = self.store.tasks.get(parts[0])
+            if not task:
+                return 404, "Task {} not found".format(parts[0])
+            return 200, task
+
+        if resource_type == "blueprints":
+            response = self._route_blueprint(method, parts, body)
+            if response:
+                return response
+
+        if resource_type == "runbooks":
+            response = self._route_runbook(method, parts, body)
+            if response:
+                return response
+
+        if not parts:
+            if method == "POST":
+                return 200, self.store.create(resource_type, body)
+            return 405, "Method not allowed"
+
+        if parts == ["list"] and method == "POST":
+            return 200, self._list(resource_type, body)
+
+        if len(parts) == 1:
+            entity_uuid = parts[0]
+            if method == "GET":
+                entity = self.store.read(resource_type, entity_uuid)
+
+            elif method == "PUT":
+                entity = self.store.update(resource_type, entity_uuid, body)
+
+            elif method == "DELETE":
+                entity = self.store.delete(resource_type, entity_uuid)
+                if entity:
+                    entity = {
+                        "status": {
+                            "state": "DELETE_PENDING",
+                            "execution_context": {
+                                "task_uuid": self.store.create_task()
+                            },
+                        }
+                    }
+            else:
+                return 405, "Method not allowed"
+
+            if entity is None:
+                return 404, "Entity {} not found".format(entity_uuid)
+            return 200, entity
+
+        return 404, "Unknown url {}/{}".format(resource_type, "/".join(parts))
+
+    def _list(self, resource_type, params, entities=None):
+        if entities is None:
+            entities = self.store.list(resource_type, params.get("filter", ""))
+        length = int(params.get("length", 20))
+        offset = int(params.get("offset", 0))
+        return {
+            "api_version": "3.1",
+            "metadata": {
+                "kind": ENTITY_KINDS.get(resource_type, resource_type.rstrip("s")),
+                "total_matches": len(entities),
+                "length": length,
+                "offset": offset,
+            },
+            "entities": entities[offset : offset + length],
+        }
+
+    def _route_blueprint(self, method, parts, body):
+        if parts == ["import_json"] and method == "POST":
+            return 200, self.store.create("blueprints", body)
+
+        if (
+            len(parts) == 2
+            and parts[1] in ["simple_launch", "launch"]
+            and method == "POST"
+        ):
+            if not self.store.read("blueprints", parts[0]):
+                return 404, "Blueprint {} not found".format(parts[0])
+
+            request_id = str(uuid.uuid4())
+            app_name = body.get("spec", {}).get("app_name") or request_id
+            self.store.pending_launches[request_id] = {
+                "polls": 0,
+                "app_name": app_name,
+                "application_uuid": None,
+            }
+            return 200, {"status": {"request_id": request_id}}
+
+        if len(parts) == 3 and parts[1] == "pending_launches" and method == "GET":
+            launch = self.store.pending_launches.get(parts[2])
+            if not launch:
+                return 404, "Launch request {} not found".format(parts[2])
+
+            launch["polls"] += 1
+            if launch["polls"] < self.launch_polls:
+                return 200, {"status": {"state": "pending"}}
+
+            if not launch["application_uuid"]:
+                app = self.store.create(
+                    "apps", {"spec": {"name": launch["app_name"], "resources": {}}}
+                )
+                launch["application_uuid"] = app["metadata"]["uuid"]
+
+            return (
+                200,
+                {
+                    "status": {
+                        "state": "success",
+                        "application_uuid": launch["application_uuid"],
+                    }
+                },
+            )
+
+        return None
+
+    def _route_runbook(self, method, parts, body):
+        if parts == ["import_json"] and method == "POST":
+            return 200, self.store.create("runbooks", body)
+
+        if len(parts) == 2 and parts[1] in ["run", "execute"] and method == "POST":
+            runbook = self.store.read("runbooks", parts[0])
+            if not runbook:
+                return 404, "Runbook {} not found".format(parts[0])
+
+            runlog_uuid = str(uuid.uuid4())
+            task_runlog_uuid = str(uuid.uuid4())
+            self.store.runlogs[runlog_uuid] = {
+                "polls": 0,
+                "runbook": runbook,
+                "task_runlog_uuid": task_runlog_uuid,
+            }
+            return 200, {"status": {"runlog_uuid": runlog_uuid}}
+
+        if len(parts) >= 2 and parts[0] == "runlogs":
+            runlog = self.store.runlogs.get(parts[1])
+            if not runlog:
+                return 404, "Runlog {} not found".format(parts[1])
+
+            # Poll on runlog status
+            if len(parts) == 2:
+                runlog["polls"] += 1
+                state = "SUCCESS" if runlog["polls"] >= self.runlog_polls else "RUNNING"
+                resources = runlog["runbook"]["status"]["resources"]
+                return (
+                    200,
+                    {
+                        "metadata": {"uuid": parts[1], "kind": "runbook_runlog"},
+                        "status": {
+                            "state": state,
+                            "runbook_json": {
+                                "resources": {"runbook": resources.get("runbook", {})}
+                            },
+                        },
+                    },
+                )
+
+            if parts[2:] == ["children", "list"]:
+                state = "SUCCESS" if runlog["polls"] >= self.runlog_polls else "RUNNING"
+                task_runlog = {
+                    "metadata": {
+                        "uuid": runlog["task_runlog_uuid"],
+                        "kind": "runbook_runlog",
+                    },
+                    "status": {"state": state, "task_reference": {"uuid": ""}},
+                }
+                return 200, self._list("runlogs", {}, entities=[task_runlog])
+
+            if len(parts) == 5 and parts[2] == "children" and parts[4] == "output":
+                return (
+                    200,
+                    {"status": {"output_list": [{"output": "", "exit_code": 0}]}},
+                )
+
+        return None
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for Prism Central")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9440)
+    parser.add_argument(
+        "--latency", type=float, default=0, help="seconds added to every response"
+    )
+    parser.add_argument("--jitter", type=float, default=0)
+    parser.add_argument(
+        "--count",
+        action="append",
+        default=[],
+        help="entity count per resource type i.e. blueprints=1000",
+    )
+    parser.add_argument("--username")
+    parser.add_argument("--password")
+    parser.add_argument("--certfile")
+    parser.add_argument("--keyfile")
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument(
+        "--accept-gzip",
+        action="store_true",
+        help="decompress gzip encoded request bodies",
+    )
+    args = parser.parse_args(args)
+
+    entity_counts = dict(DEFAULT_ENTITY_COUNTS)
+    for count in args.count:
+        resource_type, value = count.split("=", 1)
+        entity_counts[resource_type] = int(value)
+
+    auth = None
+    if args.username:
+        auth = (args.username, args.password or "")
+
+    server = MockPCServer(
+        host=args.host,
+        port=args.port,
+        entity_counts=entity_counts,
+        latency=args.latency,
+        jitter=args.jitter,
+        auth=auth,
+        certfile=args.certfile,
+        keyfile=args.keyfile,
+        verbose=args.verbose,
+        accept_gzip=args.accept_gzip,
+    )
+    print(
+        "Serving at {}://{}:{}".format(server.scheme, server.host, server.port),
+        file=sys.stderr,
+    )
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import asyncio
+import pytest
+
+from calm.dsl.api import get_async_client_handle_obj
+from calm.dsl.cli.main import get_api_client
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+
+class TestAsyncClient:
+    def test_projects_list_all(self):
+
+        client = get_api_client()
+        async_client = get_async_client_handle_obj(max_concurrency=10)
+
+        LOG.info("Invoking list_all api call on projects")
+        entities = client.project.list_all(api_limit=5)
+        async_entities = asyncio.run(async_client.project.list_all(api_limit=5))
+        async_client.close()
+
+        assert [e["metadata"]["uuid"] for e in entities] == [
+            e["metadata"]["uuid"] for e in async_entities
+        ]
+        LOG.info("Success")
+
+    def test_projects_concurrent_read(self):
+
+        client = get_api_client()
+        async_client = get_async_client_handle_obj(max_concurrency=10)
+
+        entities = client.project.list_all()
+        project_uuids = [e["metadata"]["uuid"] for e in entities]
+
+        async def read_projects():
+            return await asyncio.gather(
+                *[async_client.project.read(uuid) for uuid in project_uuids]
+            )
+
+        LOG.info("Reading {} projects concurrently".format(len(project_uuids)))
+        results = asyncio.run(read_projects())
+        async_client.close()
+
+        for (res, err), uuid in zip(results, project_uuids):
+            if err:
+                pytest.fail("[{}] - {}".format(err["code"], err["error"]))
+            assert res.json()["metadata"]["uuid"] == uuid
+        LOG.info("Success")
@@ -0,0 +1,178 @@
+import time
+import threading
+import pytest
+
+from requests import Response
+
+from calm.dsl.api.rate_limiter import RateLimiter, parse_retry_after
+from calm.dsl.api.response_cache import ResponseCache
+from calm.dsl.api.single_flight import SingleFlight
+from calm.dsl.tools import json_codec
+
+
+def get_response(body=b"{}", headers=None):
+    res = Response()
+    res.status_code = 200
+    res._content = body
+    res.headers.update(headers or {})
+    return json_codec.use_codec_json(res)
+
+
+class TestJsonCodec:
+    def test_round_trip(self):
+
+        data = {"name": "bp", "list": [1, 2.5, None, True], "nested": {"a": "ü"}}
+        assert json_codec.loads(json_codec.dumps_bytes(data)) == data
+        assert json_codec.dumps({"b": 1, "a": 2}, sort_keys=True) == '{"a":2,"b":1}'
+
+    def test_response_json_not_shared(self):
+
+        res = get_response(b'{"status": {"state": "ACTIVE"}}')
+        res.json()["status"]["state"] = "DELETED"
+        assert res.json()["status"]["state"] == "ACTIVE"
+
+        res_copy = json_codec.copy_response(res)
+        assert res_copy is not res
+        assert res_copy.json() == {"status": {"state": "ACTIVE"}}
+
+
+class TestResponseCache:
+    def test_ttl_and_validators(self):
+
+        cache = ResponseCache(ttl=0.05)
+        cache.put("a", get_response())
+        cache.put("b", get_response(headers={"ETag": "v1"}))
+
+        entry, is_fresh = cache.get("a")
+        assert entry and is_fresh
+
+        time.sleep(0.1)
+
+        # Expired entries are dropped, unless they can be revalidated
+        assert cache.get("a") == (None, False)
+        entry, is_fresh = cache.get("b")
+        assert not is_fresh
+        assert entry.get_validation_headers() == {"If-None-Match": "v1"}
+
+        cache.revalidated("b")
+        assert cache.get("b")[1]
+        assert cache.get_stats()["revalidations"] == 1
+
+    def test_lru_eviction(self):
+
+        cache = ResponseCache(max_entries=2)
+        cache.put("a", get_response())
+        cache.put("b", get_response())
+        cache.get("a")
+        cache.put("c", get_response())
+
+        assert cache.get("b") == (None, False)
+        assert cache.get("a")[0] and cache.get("c")[0]
+
+    def test_invalidate(self):
+
+        cache = ResponseCache()
+        root = "https://pc:9440/api/nutanix/v3/apps"
+        for url in [
+            root + "/app1",
+            root + "/app1/app_runlogs/run1",
+            ResponseCache.get_key(root + "/app1", {"a": 1}),
+            root + "/app2",
+        ]:
+            cache.put(url, get_response())
+
+        # Reads of parents are dropped by write to sub-resource
+        cache.invalidate(root + "/app1/actions/start")
+        assert cache.get(root + "/app1") == (None, False)
+        assert cache.get_stats()["entries"] == 2
+
+        # Reads of sub-resources are dropped by write to resource
+        cache.invalidate(root + "/app1")
+        assert cache.get(root + "/app1/app_runlogs/run1") == (None, False)
+        assert cache.get(root + "/app2")[0]
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_result(self):
+
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def func():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return len(calls)
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(single_flight.do("k", func)))
+            for _ in range(5)
+        ]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert results == [1] * 5
+        assert len(calls) == 1
+        assert single_flight.saved_calls == 4
+
+        # Later calls are made again
+        assert single_flight.do("k", func) == 2
+
+    def test_failed_call_not_shared(self):
+
+        single_flight = SingleFlight()
+
+        def func():
+            raise ValueError("failed")
+
+        with pytest.raises(ValueError):
+            single_flight.do("k", func)
+        assert single_flight.do("k", lambda: "ok") == "ok"
+
+
+class TestRateLimiter:
+    def test_acquire_rate(self):
+
+        rate_limiter = RateLimiter(max_rate=20)
+        start_time = time.monotonic()
+        for _ in range(30):
+            rate_limiter.acquire()
+
+        # Bucket allows a burst of max_rate requests, rest wait for tokens
+        assert time.monotonic() - start_time >= 0.4
+
+    def test_aimd(self):
+
+        rate_limiter = RateLimiter(max_rate=10, min_rate=2, cooldown=60)
+        rate_limiter.on_throttle()
+        assert rate_limiter.rate == 5
+
+        # Throttling responses within cooldown don't reduce rate again
+        rate_limiter.on_throttle()
+        assert rate_limiter.rate == 5
+        assert rate_limiter.throttled_count == 2
+
+        for _ in range(100):
+            rate_limiter.on_success()
+        assert rate_limiter.rate == 10
+
+    def test_retry_after(self):
+
+        assert parse_retry_after("3") == 3
+        assert parse_retry_after("invalid") is None
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+
+        rate_limiter = RateLimiter(max_rate=100, max_retry_after=0.2)
+        rate_limiter.on_throttle("10")
+        start_time = time.monotonic()
+        rate_limiter.acquire()
+        assert 0.1 <= time.monotonic() - start_time < 1
@@ -0,0 +1,294 @@
+import gzip
+import atexit
+import threading
+import json
+import time
+import pytest
+from datetime import datetime
+
+from calm.dsl.api import connection, handle
+from calm.dsl.api.handle import update_api_client
+from calm.dsl.api.connection import REQUEST
+from calm.dsl.config import get_context
+from calm.dsl.db import handler
+from calm.dsl.db.table_config import dsl_cache_database, CacheSyncTable, RolesCache
+from calm.dsl.db.table_config import AhvSubnetsCache, ProjectCache, AhvAccountSubnets
+from calm.dsl.store import Cache, Version
+from calm.dsl.tools.mock_server import MockPCServer, CALM_VERSION
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+
+@pytest.fixture
+def mock_server():
+    server = MockPCServer(entity_counts={"roles": 5}, auth=("admin", "pwd"))
+
+    # Entities were last updated long before the cache sync
+    for entity in server.store.list("roles"):
+        entity["metadata"]["last_update_time"] = str(
+            int((time.time() - 3600) * 1000000)
+        )
+
+    with server:
+        yield server
+
+
+@pytest.fixture
+def local_db(tmp_path, monkeypatch):
+    """routes local db (and cache dbs next to it) to a temporary directory"""
+
+    def reset_db_handle():
+        if handler._Database is not None:
+            atexit.unregister(handler._Database.close)
+            handler._Database.close()
+        handler._Database = None
+
+    reset_db_handle()
+    monkeypatch.setattr(
+        handler.Database,
+        "get_db_location",
+        staticmethod(lambda: str(tmp_path / "dsl.db")),
+    )
+
+    yield tmp_path
+
+    # Next get_db_handle call opens the db of init config again
+    reset_db_handle()
+
+
+@pytest.fixture
+def cache_server(mock_server, local_db, monkeypatch):
+    """routes api client and cache db to the mock server. Global client and
+    context are restored afterwards"""
+
+    monkeypatch.setattr(handle, "_API_CLIENT_HANDLE", handle._API_CLIENT_HANDLE)
+    monkeypatch.setattr(connection, "_CONNECTION", connection._CONNECTION)
+    server_config = get_context().server_config
+    for key, value in [("pc_ip", "mock-cache-test"), ("pc_port", mock_server.port)]:
+        monkeypatch.setitem(server_config, key, value)
+
+    update_api_client(
+        mock_server.host,
+        mock_server.port,
+        scheme=REQUEST.SCHEME.HTTP,
+        auth=("admin", "pwd"),
+    )
+
+    yield mock_server
+
+    AhvAccountSubnets.clear()
+
+
+def get_role_names():
+    return sorted(row.name for row in RolesCache.select())
+
+
+class TestMockCache:
+    def test_delta_sync(self, cache_server, capsys):
+
+        Cache.sync_table("role")
+        assert get_role_names() == ["roles-{}".format(i) for i in range(5)]
+
+        roles = {e["metadata"]["name"]: e for e in cache_server.store.list("roles")}
+        cache_server.store.update(
+            "roles",
+            roles["roles-1"]["metadata"]["uuid"],
+            {"spec": {"name": "roles-updated", "resources": {}}},
+        )
+        cache_server.store.delete("roles", roles["roles-2"]["metadata"]["uuid"])
+        capsys.readouterr()
+
+        Cache.sync_table("role", delta=True)
+
+        # Only the updated role is listed by delta sync
+        assert "role: 1 rows updated" in capsys.readouterr().err
+        assert get_role_names() == ["roles-0", "roles-3", "roles-4", "roles-updated"]
+
+    def test_delta_sync_without_sync_time(self, cache_server, capsys):
+
+        Cache.sync_table("role")
+        CacheSyncTable.delete().execute()
+        cache_server.store.create(
+            "roles", {"spec": {"name": "roles-new", "resources": {}}, "metadata": {}}
+        )
+        capsys.readouterr()
+
+        # Table is synced fully, as time of its last sync is unknown
+        Cache.sync_table("role", delta=True)
+
+        assert "role: 6 rows fetched" in capsys.readouterr().err
+        assert len(get_role_names()) == 6
+        assert CacheSyncTable.get_last_sync_time("role") is not None
+
+    def test_snapshot_round_trip(self, cache_server, tmp_path):
+
+        Version.sync()
+        Cache.sync_table("role")
+        rows = sorted(RolesCache.select().tuples())
+        sync_time = CacheSyncTable.get_last_sync_time("role")
+
+        snapshot_file = str(tmp_path / "cache.json.gz")
+        Cache.export_snapshot(snapshot_file)
+        Cache.clear_entities()
+        assert not RolesCache.select().count()
+
+        row_counts = Cache.import_snapshot(snapshot_file)
+
+        assert row_counts["role"] == 5
+        # DateTime columns are restored as datetime, not strings
+        assert sorted(RolesCache.select().tuples()) == rows
+        assert isinstance(RolesCache.select().first().last_update_time, datetime)
+        assert CacheSyncTable.get_last_sync_time("role") == sync_time
+        assert Version.get_version("Calm") == CALM_VERSION
+
+    def test_snapshot_version_mismatch(self, cache_server, tmp_path):
+
+        Version.sync()
+        Cache.sync_table("role")
+
+        snapshot_file = str(tmp_path / "cache.json.gz")
+        Cache.export_snapshot(snapshot_file)
+        snapshot = Cache.read_snapshot(snapshot_file)
+        snapshot["versions"]["Calm"] = "1.0.0"
+        with gzip.open(snapshot_file, "wt", encoding="utf-8") as fd:
+            json.dump(snapshot, fd)
+
+        Cache.clear_entities()
+        with pytest.raises(SystemExit):
+            Cache.import_snapshot(snapshot_file)
+
+        # Cache is left unchanged by the rejected snapshot
+        assert not RolesCache.select().count()
+
+    def test_snapshot_server_mismatch(self, cache_server, tmp_path):
+
+        Version.sync()
+        Cache.sync_table("role")
+
+        snapshot_file = str(tmp_path / "cache.json.gz")
+        Cache.export_snapshot(snapshot_file)
+        snapshot = Cache.read_snapshot(snapshot_file)
+        snapshot["server"]["host"] = "other-pc"
+        with gzip.open(snapshot_file, "wt", encoding="utf-8") as fd:
+            json.dump(snapshot, fd)
+
+        Cache.clear_entities()
+        with pytest.raises(SystemExit):
+            Cache.import_snapshot(snapshot_file)
+        assert not RolesCache.select().count()
+
+        # Snapshot of other server is imported only if forced
+        row_counts = Cache.import_snapshot(snapshot_file, force=True)
+        assert row_counts["role"] == 5
+
+    def test_sync_fetch_makes_no_db_queries(self, cache_server, monkeypatch):
+
+        Version.sync()
+        query_threads = set()
+        execute_sql = dsl_cache_database.execute_sql
+
+        def record_execute_sql(*args, **kwargs):
+            query_threads.add(threading.current_thread())
+            return execute_sql(*args, **kwargs)
+
+        monkeypatch.setattr(dsl_cache_database, "execute_sql", record_execute_sql)
+
+        # Image table fetch needs calm version (to get ahv api object)
+        Cache.sync_table(["role", "ahv_disk_image"])
+
+        assert query_threads == {threading.main_thread()}
+
+    def test_failed_sync_streaming_rows(self, cache_server, monkeypatch):
+
+        Version.sync()
+        Cache.sync_table("role")
+        fetch_rows = RolesCache.fetch_rows
+
+        def failing_fetch_rows():
+            # Rows of more batches than the sync queue holds
+            rows = list(fetch_rows())
+            for index in range(RolesCache.INSERT_BATCH_SIZE * Cache.SYNC_QUEUE_SIZE):
+                row = dict(rows[index % len(rows)])
+                row["uuid"] = row["name"] = "role-{}".format(index)
+                yield row
+            raise ValueError("listing failed")
+
+        monkeypatch.setattr(RolesCache, "fetch_rows", failing_fetch_rows)
+
+        with pytest.raises(ValueError):
+            Cache.sync_table(["role", "ahv_disk_image"])
+
+        # Rows written before the failure are rolled back
+        assert get_role_names() == ["roles-{}".format(i) for i in range(5)]
+
+    def test_account_subnets_shared(self, cache_server):
+
+        store = cache_server.store
+        account_uuids = []
+        for index in range(2):
+            account = store.create(
+                "accounts",
+                {
+                    "spec": {
+                        "name": "ntnx-{}".format(index),
+                        "resources": {"type": "nutanix_pc"},
+                    },
+                    "metadata": {},
+                },
+            )
+            account["status"]["state"] = "VERIFIED"
+            account_uuids.append(account["metadata"]["uuid"])
+
+        subnet_uuids = []
+        for account_uuid in account_uuids:
+            subnet = store.create(
+                "nutanix/v1/subnets",
+                {
+                    "spec": {
+                        "name": "subnet-{}".format(account_uuid),
+                        "resources": {"account_uuid": account_uuid},
+                    },
+                    "metadata": {},
+                },
+            )
+            subnet["status"]["cluster_reference"] = {
+                "name": "cluster-{}".format(account_uuid),
+                "uuid": account_uuid,
+            }
+            subnet_uuids.append(subnet["metadata"]["uuid"])
+
+        store.create(
+            "projects",
+            {
+                "spec": {
+                    "name": "project-ntnx",
+                    "resources": {
+                        "account_reference_list": [{"uuid": account_uuids[0]}],
+                        "subnet_reference_list": [{"uuid": subnet_uuids[0]}],
+                    },
+                },
+                "metadata": {},
+            },
+        )
+
+        Version.sync()
+        cache_server.reset_request_counts()
+        Cache.sync_table(["ahv_subnet", "project"])
+
+        # Subnets of each account are fetched once for both tables
+        assert (
+            cache_server.get_request_count(
+                "POST", "api/nutanix/v3/nutanix/v1/subnets/list"
+            )
+            == 2
+        )
+
+        subnets = {row.uuid: row for row in AhvSubnetsCache.select()}
+        assert subnets[subnet_uuids[1]].cluster == "cluster-{}".format(account_uuids[1])
+        assert subnets[subnet_uuids[1]].account_uuid == account_uuids[1]
+
+        project = ProjectCache.get(ProjectCache.name == "project-ntnx")
+        assert json.loads(project.whitelisted_subnets) == {
+            account_uuids[0]: [subnet_uuids[0]]
+        }
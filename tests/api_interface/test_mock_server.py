@@ -0,0 +1,244 @@
+import gzip
+import threading
+import pytest
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from calm.dsl.api import get_client_handle_obj
+from calm.dsl.api.connection import REQUEST, Connection
+from calm.dsl.api.response_cache import ResponseCache
+from calm.dsl.tools.mock_server import MockPCServer
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+
+@pytest.fixture(scope="module")
+def mock_server():
+    server = MockPCServer(
+        entity_counts={"blueprints": 120, "runbooks": 1}, auth=("admin", "pwd")
+    )
+    with server:
+        yield server
+
+
+@pytest.fixture
+def client(mock_server):
+    return get_client_handle_obj(
+        mock_server.host,
+        mock_server.port,
+        scheme=REQUEST.SCHEME.HTTP,
+        auth=("admin", "pwd"),
+    )
+
+
+class TestMockServer:
+    def test_list_all(self, client, mock_server):
+
+        mock_server.reset_request_counts()
+        entities = client.blueprint.list_all(api_limit=50)
+
+        assert len(entities) == 120
+        assert (
+            mock_server.get_request_count("POST", "api/nutanix/v3/blueprints/list") == 3
+        )
+
+    def test_list_filter(self, client):
+
+        res, err = client.blueprint.list(
+            {"filter": "name==blueprints-1;state!=DELETED"}
+        )
+        if err:
+            pytest.fail("[{}] - {}".format(err["code"], err["error"]))
+
+        entities = res.json()["entities"]
+        assert [e["metadata"]["name"] for e in entities] == ["blueprints-1"]
+
+    def test_crud(self, client):
+
+        payload = {"spec": {"name": "test_bp", "resources": {}}, "metadata": {}}
+        res, err = client.blueprint.create(payload)
+        if err:
+            pytest.fail("[{}] - {}".format(err["code"], err["error"]))
+        bp_uuid = res.json()["metadata"]["uuid"]
+
+        payload["spec"]["description"] = "updated"
+        res, err = client.blueprint.update(bp_uuid, payload)
+        assert res.json()["metadata"]["spec_version"] == 1
+
+        res, err = client.blueprint.delete(bp_uuid)
+        assert not err
+
+        _, err = client.blueprint.read(bp_uuid)
+        assert err["code"] == 404
+
+    def test_blueprint_launch(self, client):
+
+        bp_uuid = client.blueprint.list_all()[0]["metadata"]["uuid"]
+        res, err = client.blueprint.launch(
+            bp_uuid, {"spec": {"app_name": "test_app", "resources": {}}}
+        )
+        if err:
+            pytest.fail("[{}] - {}".format(err["code"], err["error"]))
+        request_id = res.json()["status"]["request_id"]
+
+        res, err = client.blueprint.poll_launch(bp_uuid, request_id)
+        status = res.json()["status"]
+        assert status["state"] == "success"
+
+        res, err = client.application.read(status["application_uuid"])
+        assert res.json()["metadata"]["name"] == "test_app"
+
+    def test_runbook_run(self, client):
+
+        rb_uuid = client.runbook.list_all()[0]["metadata"]["uuid"]
+        res, err = client.connection._call(
+            client.runbook.EXECUTE.format(rb_uuid),
+            verify=False,
+            request_json={},
+            method=REQUEST.METHOD.POST,
+        )
+        if err:
+            pytest.fail("[{}] - {}".format(err["code"], err["error"]))
+        runlog_uuid = res.json()["status"]["runlog_uuid"]
+
+        res, err = client.runbook.poll_action_run(runlog_uuid)
+        assert res.json()["status"]["state"] == "SUCCESS"
+
+        res, err = client.runbook.list_runlogs(runlog_uuid)
+        assert res.json()["metadata"]["total_matches"] == 1
+
+    def test_user_group_names_uuid_map(self, client, mock_server):
+
+        group_uuids = {}
+        for dn, state in [
+            ("cn=sspgroup1,ou=groups,dc=systest,dc=nutanix,dc=com", "COMPLETE"),
+            ("cn=sspgroup2,ou=groups,dc=systest,dc=nutanix,dc=com", "COMPLETE"),
+            ("cn=pending,ou=groups,dc=systest,dc=nutanix,dc=com", "PENDING"),
+        ]:
+            resources = {
+                "directory_service_user_group": {
+                    "distinguished_name": dn,
+                    "directory_service_reference": {"name": "systest"},
+                }
+            }
+            entity = mock_server.store.create(
+                "user_groups", {"spec": {"name": dn, "resources": resources}}
+            )
+            entity["status"]["state"] = state
+            group_uuids[dn] = entity["metadata"]["uuid"]
+
+        dns = list(group_uuids.keys())
+        name_uuid_map = client.group.get_names_uuid_map(dns)
+
+        assert name_uuid_map == {dn: group_uuids[dn] for dn in dns[:2]}
+
+    def test_bad_requests(self, client, mock_server):
+
+        # Clause without operator i.e. unescaped ',' of a distinguished name
+        _, err = client.blueprint.list({"filter": "name==cn=x,ou=y"}, ignore_error=True)
+        assert err["code"] == 400
+
+        url = "http://{}:{}/{}".format(
+            mock_server.host, mock_server.port, client.blueprint.LIST
+        )
+        res = requests.post(url, data=b"{invalid", auth=("admin", "pwd"))
+        assert res.status_code == 400
+
+        # gzip bodies are decompressed only by servers accepting them
+        res = requests.post(
+            url,
+            data=gzip.compress(b"{}"),
+            headers={"Content-Encoding": "gzip"},
+            auth=("admin", "pwd"),
+        )
+        assert res.status_code == 400
+
+    def test_compressed_request_fallback(self, client):
+
+        # Mock server doesn't accept gzip bodies, so request is resent uncompressed
+        client.connection.compression_threshold = 1
+        payload = {
+            "spec": {"name": "test_bp_gzip", "description": "x" * 1024},
+            "metadata": {},
+        }
+        res, err = client.blueprint.create(payload)
+        assert not err
+        assert res.json()["spec"]["description"] == payload["spec"]["description"]
+
+        # Compression is disabled for further requests of the connection
+        assert client.connection.compression_threshold == 0
+        assert client.connection.compression_stats["compressed_requests"] == 0
+
+    def test_compressed_request_server_error(self):
+
+        content_encodings = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                content_encodings.append(self.headers.get("Content-Encoding"))
+                self.rfile.read(int(self.headers["Content-Length"]))
+                self.send_response(500)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            connection = Connection(
+                "127.0.0.1",
+                server.server_address[1],
+                scheme=REQUEST.SCHEME.HTTP,
+                compression_threshold=1,
+            )
+            connection.connect()
+            _, err = connection._call(
+                "api/nutanix/v3/blueprints",
+                request_json={"spec": {"description": "x" * 1024}},
+                method=REQUEST.METHOD.POST,
+                ignore_error=True,
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        # Server may have processed the request, so it is neither retried nor
+        # resent uncompressed
+        assert err["code"] == 500
+        assert content_encodings == ["gzip"]
+        assert connection.compression_threshold == 1
+
+    def test_read_response_cache(self, client, mock_server):
+
+        payload = {"spec": {"name": "test_bp_cache", "resources": {}}, "metadata": {}}
+        res, err = client.blueprint.create(payload)
+        bp_uuid = res.json()["metadata"]["uuid"]
+
+        connection = client.connection
+        connection.response_cache = ResponseCache(ttl=60)
+        try:
+            client.blueprint.read(bp_uuid, use_cache=True)
+            mock_server.store.update(
+                "blueprints", bp_uuid, {"spec": {"name": "test_bp_cache_updated"}}
+            )
+
+            # Reads (and other GET calls) are served from cache only if caller opts in
+            res, err = client.blueprint.read(bp_uuid)
+            assert res.json()["status"]["name"] == "test_bp_cache_updated"
+
+            res, err = connection._call(
+                client.blueprint.ITEM.format(bp_uuid),
+                verify=False,
+                method=REQUEST.METHOD.GET,
+            )
+            assert res.json()["status"]["name"] == "test_bp_cache_updated"
+
+            res, err = client.blueprint.read(bp_uuid, use_cache=True)
+            assert res.json()["status"]["name"] == "test_bp_cache"
+
+        finally:
+            connection.response_cache = None